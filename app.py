@@ -9,11 +9,18 @@ Libraring: Консольная система управления библио
 Функционал:
 - Добавление новых книг с автоматической генерацией ID и статусом "в наличии".
 - Удаление книг по ID.
-- Поиск книг по названию, автору или году издания (фильтрация по одному или нескольким полям).
+- Поиск книг по названию, автору, году издания или диапазону годов (фильтрация по одному или нескольким полям).
+- Поиск книг по фрагментам слов названия и автора с ранжированием результатов.
 - Отображение списка всех книг с подробной информацией.
 - Изменение статуса книг (в наличии или выдана).
 
-Данные хранятся в JSON-файле для сохранения информации, предусмотрена обработка ошибок.
+Данные хранятся в JSON-файле для сохранения информации, предусмотрена обработка ошибок. Изменения дописываются
+в журнал рядом с файлом (data/library.json.journal), который периодически сжимается в новый снимок
+(см. USE_JOURNAL и JOURNAL_COMPACT_EVERY в settings/settings.py). Снимок записывается атомарно (временный файл,
+fsync и переименование), предыдущая версия сохраняется в data/library.json.1. Повреждённый файл не заменяется
+пустой библиотекой: приложение сообщает об ошибке при запуске. Несколько запущенных приложений могут работать
+с одним файлом (SHARED_STORAGE): изменения выполняются под блокировкой data/library.json.lock, и каждое
+приложение перед действием дочитывает изменения остальных из журнала.
 
 Приложение разработано с учетом принципов чистого кода и возможности расширения функционала.
 """
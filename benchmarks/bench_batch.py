@@ -0,0 +1,55 @@
+"""
+Бенчмарк пакетного сохранения.
+
+Сравнивает пропускную способность add_book при сохранении после каждого действия, внутри Library.batch()
+и с политикой flush_every.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_batch
+    python -m benchmarks.bench_batch 100000 2000
+"""
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from service.library import Library
+
+OPERATIONS = 100_000
+# Синхронное сохранение переписывает весь файл, поэтому измеряется на меньшем объёме
+SYNC_OPERATIONS = 2_000
+
+
+def run(operations: int, mode: str, directory: str) -> float:
+    """
+    Добавляет operations книг и возвращает пропускную способность.
+
+    Аргументы:
+        operations (int): Количество добавлений.
+        mode (str): "sync", "batch" или "flush_every".
+        directory (str): Каталог для файла библиотеки.
+
+    Возвращает:
+        float: Количество операций в секунду.
+    """
+    storage_file = str(Path(directory) / f"{mode}.json")
+    library = Library(storage_file=storage_file, flush_every=1000 if mode == "flush_every" else None)
+    start = time.perf_counter()
+    with library.batch() if mode == "batch" else nullcontext():
+        for number in range(operations):
+            library.add_book(title=f"Книга {number}", author="Автор", year=2000)
+    library.close()
+    return operations / (time.perf_counter() - start)
+
+
+def main(argv: list[str]) -> None:
+    operations = int(argv[0]) if argv else OPERATIONS
+    sync_operations = int(argv[1]) if len(argv) > 1 else SYNC_OPERATIONS
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, count in (("sync", sync_operations), ("flush_every", operations), ("batch", operations)):
+            print(f"{mode:>12}: {count:>7} операций, {run(count, mode, directory):>10.0f} оп/с")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
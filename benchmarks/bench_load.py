@@ -0,0 +1,92 @@
+"""
+Бенчмарк запуска библиотеки на большом файле.
+
+Генерирует файл на 1 000 000 книг и в отдельных процессах измеряет время запуска Library и пиковое потребление
+памяти для полного разбора json.load (прежняя реализация), потоковой загрузки, ленивого режима и двоичного файла
+с доступом через mmap. Поисковые индексы строятся при первом поиске и в измерение не входят.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load 200000
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from service.binary import json_to_binary
+from service.book import Book
+from service.library import Library
+
+SIZE = 1_000_000
+MODES = ("json.load", "stream", "lazy", "binary")
+
+
+def generate(path: str, size: int) -> None:
+    """
+    Записывает файл библиотеки из size синтетических книг, не держа их все в памяти.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        size (int): Количество книг.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for book_id in range(1, size + 1):
+            book = Book(book_id, f"Книга номер {book_id}", f"Автор {book_id % 5000}", 1900 + book_id % 125)
+            file.write(("," if book_id > 1 else "") + json.dumps(book.to_dict(), ensure_ascii=False))
+        file.write("]")
+
+
+def child(mode: str, path: str) -> None:
+    """
+    Загружает библиотеку в текущем процессе и печатает время и пиковую память в формате JSON.
+
+    Аргументы:
+        mode (str): Режим загрузки.
+        path (str): Путь к файлу.
+    """
+    start = time.perf_counter()
+    if mode == "json.load":
+        library = Library(storage_file=f"{path}.missing")
+        with open(path, "r", encoding="utf-8") as file:
+            library.books = [Book.from_dict(book) for book in json.load(file)]
+    elif mode == "binary":
+        library = Library(storage_file=f"{path}.bin", storage_format="binary")
+    else:
+        library = Library(storage_file=path, lazy=mode == "lazy")
+    size = len(library._books)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"books": size, "seconds": elapsed, "peak_mb": peak_mb}))
+
+
+def main(argv: list[str]) -> None:
+    if argv and argv[0] == "--child":
+        child(argv[1], argv[2])
+        return
+    if argv and argv[0] == "--generate":
+        generate(argv[1], int(argv[2]))
+        json_to_binary(argv[1], f"{argv[1]}.bin")
+        return
+
+    size = int(argv[0]) if argv else SIZE
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "library.json")
+        # Генерация в отдельном процессе: иначе Linux унаследует пик памяти родителя в ru_maxrss дочерних процессов
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_load", "--generate", path, str(size)], check=True)
+        print(f"Файл: {size} книг, {os.path.getsize(path) / 2 ** 20:.0f} МБ")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_load", "--child", mode, path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:>10}: {result['seconds']:>6.2f} с, пик памяти {result['peak_mb']:>6.0f} МБ")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+"""
+Бенчмарк поиска книги по идентификатору.
+
+Показывает, что время Library.find_book_by_id и Library.remove_book не зависит от размера каталога.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_lookup
+    python -m benchmarks.bench_lookup 1000 100000 5000000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from service.book import Book
+from service.library import Library
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000, 5_000_000)
+LOOKUPS = 100_000
+
+
+def make_library(size: int) -> Library:
+    """
+    Создаёт библиотеку из size синтетических книг без обращения к диску.
+
+    Аргументы:
+        size (int): Количество книг.
+
+    Возвращает:
+        Library: Заполненная библиотека.
+    """
+    library = Library(storage_file=os.path.join(tempfile.gettempdir(), "bench_lookup_missing.json"))
+    library.books = [Book(book_id=i, title=f"Книга {i}", author="Автор", year=2000) for i in range(1, size + 1)]
+    return library
+
+
+def bench(size: int) -> tuple[float, float]:
+    """
+    Измеряет среднее время поиска и удаления книги по идентификатору.
+
+    Аргументы:
+        size (int): Размер каталога.
+
+    Возвращает:
+        tuple[float, float]: Время поиска и удаления одной книги в наносекундах.
+    """
+    library = make_library(size)
+    library.save_books = lambda: None  # Измеряем только работу с памятью
+    ids = [random.randint(1, size) for _ in range(LOOKUPS)]
+
+    start = time.perf_counter_ns()
+    for book_id in ids:
+        library.find_book_by_id(book_id)
+    lookup_ns = (time.perf_counter_ns() - start) / LOOKUPS
+
+    victims = random.sample(range(1, size + 1), min(size, LOOKUPS))
+    start = time.perf_counter_ns()
+    for book_id in victims:
+        library.remove_book(book_id)
+    remove_ns = (time.perf_counter_ns() - start) / len(victims)
+    return lookup_ns, remove_ns
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(f"{'книг':>10} | {'поиск, нс':>10} | {'удаление, нс':>12}")
+    for size in sizes:
+        lookup_ns, remove_ns = bench(size)
+        print(f"{size:>10} | {lookup_ns:>10.0f} | {remove_ns:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
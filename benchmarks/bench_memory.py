@@ -0,0 +1,80 @@
+"""
+Бенчмарк памяти на одну книгу.
+
+Сравнивает каталог из объектов с __dict__ (прежнее представление Book), из объектов Book со __slots__
+и столбцовый каталог ColumnarBooks. Учитывается только сам каталог, без поисковых индексов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory 1000000
+"""
+import sys
+import tracemalloc
+
+from service.book import Book
+from service.catalogue import BookRecord, ColumnarBooks
+
+SIZE = 200_000
+
+
+class DictBook:
+    """Книга с атрибутами в __dict__, как до перехода Book на __slots__."""
+
+    def __init__(self, book_id: int, title: str, author: str, year: int, status: str = "в наличии", count: int = 1):
+        self.book_id = book_id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.status = status
+        self.count = count
+
+
+def records(size: int):
+    """
+    Генерирует записи синтетических книг. Строки создаются заново, как при разборе JSON.
+
+    Аргументы:
+        size (int): Количество книг.
+
+    Возвращает:
+        Iterator[BookRecord]: Записи книг.
+    """
+    for book_id in range(1, size + 1):
+        yield BookRecord(
+            book_id, f"Книга номер {book_id}", f"Автор {book_id % 5000}", 1900 + book_id % 125, "в наличии", 1
+        )
+
+
+def measure(build, size: int) -> float:
+    """
+    Измеряет объём памяти, занятый каталогом, в байтах на книгу.
+
+    Аргументы:
+        build (callable): Функция, строящая каталог из итератора записей.
+        size (int): Количество книг.
+
+    Возвращает:
+        float: Байт на книгу.
+    """
+    tracemalloc.start()
+    catalogue = build(records(size))
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalogue
+    return used / size
+
+
+def main(argv: list[str]) -> None:
+    size = int(argv[0]) if argv else SIZE
+    variants = {
+        "Book с __dict__": lambda items: {item.book_id: DictBook(*item) for item in items},
+        "Book со __slots__": lambda items: {item.book_id: Book(*item) for item in items},
+        "ColumnarBooks": ColumnarBooks,
+    }
+    print(f"Книг: {size}")
+    for name, build in variants.items():
+        print(f"{name:>18}: {measure(build, size):>6.0f} байт на книгу")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
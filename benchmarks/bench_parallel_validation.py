@@ -0,0 +1,71 @@
+"""
+Бенчмарк параллельной проверки столбцов.
+
+Проверяет ROWS синтетических строк (около 5% некорректных) функцией validate_rows_parallel с 1, 2, 4, ... процессами
+вплоть до числа ядер и печатает время, ускорение относительно одного процесса и эффективность на ядро. Пул
+запускается заранее, чтобы в измерение не входил старт процессов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_parallel_validation
+    python -m benchmarks.bench_parallel_validation 2000000
+"""
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.validators import VALIDATION_CHUNK_SIZE, validate_rows, validate_rows_parallel
+
+ROWS = 1_000_000
+
+
+def generate(rows: int) -> tuple[list[str], list[str], list[str]]:
+    """
+    Создаёт столбцы синтетических названий, авторов и годов.
+
+    Аргументы:
+        rows (int): Количество строк.
+
+    Возвращает:
+        tuple[list[str], list[str], list[str]]: Названия, авторы и годы.
+    """
+    rng = random.Random(0)
+    titles, authors, years = [], [], []
+    for number in range(rows):
+        broken = rng.random() < 0.05
+        titles.append("" if broken and number % 3 == 0 else f"Книга номер {number}")
+        authors.append(f"Автор{number}" if broken and number % 3 == 1 else rng.choice(("Лев Толстой", "Jane Austen")))
+        years.append("год" if broken and number % 3 == 2 else str(1800 + number % 220))
+    return titles, authors, years
+
+
+def main(argv: list[str]) -> None:
+    rows = int(argv[0]) if argv else ROWS
+    columns = generate(rows)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2 ** power for power in range(1, cores.bit_length()) if 2 ** power <= cores})
+
+    start = time.perf_counter()
+    expected = validate_rows(*columns)
+    baseline = time.perf_counter() - start
+    print(f"{rows} строк, ядер: {cores}")
+    print(f"{'процессов':>10} {'время, с':>10} {'ускорение':>10} {'на ядро':>8}")
+    for workers in counts:
+        if workers == 1:
+            elapsed = baseline
+        else:
+            chunk_size = min(VALIDATION_CHUNK_SIZE, -(-rows // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Прогрев: запуск процессов не входит в измерение
+                list(pool.map(abs, range(workers)))
+                start = time.perf_counter()
+                result = validate_rows_parallel(*columns, chunk_size=chunk_size, executor=pool)
+                elapsed = time.perf_counter() - start
+            assert result == expected
+        speedup = baseline / elapsed
+        print(f"{workers:>10} {elapsed:>10.2f} {speedup:>9.2f}x {speedup / workers:>7.0%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,170 @@
+"""
+Нагрузочный тест HTTP/JSON API библиотеки.
+
+Запускает сервер в отдельном процессе на localhost с каталогом из BOOKS книг и отправляет REQUESTS запросов
+из CONNECTIONS постоянных соединений. Смесь запросов: 80% чтения (страница списка, книга по ID, поиск по автору)
+и 20% изменений (добавление, выдача и возврат). Печатает количество запросов в секунду и перцентили задержки.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server 20000 64
+"""
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_load import generate
+
+BOOKS = 10_000
+REQUESTS = 10_000
+CONNECTIONS = 32
+
+
+def free_port() -> int:
+    """
+    Возвращает свободный порт на localhost.
+
+    Возвращает:
+        int: Номер порта.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def wait_for_server(port: int, timeout: float = 30) -> None:
+    """
+    Ждёт, пока сервер начнёт принимать соединения.
+
+    Аргументы:
+        port (int): Порт сервера.
+        timeout (float): Наибольшее время ожидания в секундах.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def make_request(rng: random.Random, books: int) -> bytes:
+    """
+    Формирует случайный запрос из смеси чтения и изменений.
+
+    Аргументы:
+        rng (random.Random): Генератор случайных чисел клиента.
+        books (int): Количество книг в каталоге.
+
+    Возвращает:
+        bytes: HTTP-запрос.
+    """
+    roll = rng.random()
+    body = b""
+    if roll < 0.3:
+        method, path = "GET", f"/books?offset={rng.randrange(books)}&limit=20"
+    elif roll < 0.6:
+        method, path = "GET", f"/books/{rng.randrange(1, books + 1)}"
+    elif roll < 0.8:
+        method, path = "GET", f"/books/find?author=%D0%90%D0%B2%D1%82%D0%BE%D1%80%20{rng.randrange(5000)}&limit=20"
+    elif roll < 0.85:
+        method, path = "POST", "/books"
+        body = json.dumps({"title": f"Новая книга {rng.randrange(10 ** 9)}", "author": "Автор", "year": 2000},
+                          ensure_ascii=False).encode("utf-8")
+    else:
+        status = "выдана" if roll < 0.925 else "в наличии"
+        method, path = "PATCH", f"/books/{rng.randrange(1, books + 1)}"
+        body = json.dumps({"status": status}, ensure_ascii=False).encode("utf-8")
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+async def client(port: int, requests: int, books: int, seed: int, latencies: list[float]) -> None:
+    """
+    Отправляет requests запросов по одному постоянному соединению, записывая задержку каждого.
+
+    Аргументы:
+        port (int): Порт сервера.
+        requests (int): Количество запросов.
+        books (int): Количество книг в каталоге.
+        seed (int): Зерно генератора запросов.
+        latencies (list[float]): Список, в который добавляются задержки в секундах.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(requests):
+        start = time.perf_counter()
+        writer.write(make_request(rng, books))
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Возвращает перцентиль отсортированного списка.
+
+    Аргументы:
+        values (list[float]): Отсортированные значения.
+        fraction (float): Доля от 0 до 1.
+
+    Возвращает:
+        float: Значение перцентиля.
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def load(port: int, requests: int, connections: int, books: int) -> None:
+    """
+    Дожидается сервера, выполняет нагрузку и печатает результат.
+
+    Аргументы:
+        port (int): Порт сервера.
+        requests (int): Общее количество запросов.
+        connections (int): Количество параллельных соединений.
+        books (int): Количество книг в каталоге.
+    """
+    await wait_for_server(port)
+    latencies: list[float] = []
+    per_client = requests // connections
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, per_client, books, seed, latencies) for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies)} запросов, {connections} соединений: {len(latencies) / elapsed:.0f} запросов/с")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}: {percentile(latencies, fraction) * 1000:.2f} мс")
+
+
+def main(argv: list[str]) -> None:
+    requests = int(argv[0]) if argv else REQUESTS
+    connections = int(argv[1]) if len(argv) > 1 else CONNECTIONS
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "library.json")
+        generate(path, BOOKS)
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "service.server", "--port", str(port), "--storage", path],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(load(port, requests, connections, BOOKS))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,328 @@
+"""
+Набор бенчмарков основных операций библиотеки на каталогах разного размера.
+
+Для каждого размера генерируется синтетический каталог: названия и авторы на кириллице, около DUPLICATE_SHARE
+строк повторяют уже существующие книги с перекосом в сторону популярных (такие строки увеличивают количество
+экземпляров). Измерения выполняются в отдельном процессе на каждый размер, поэтому пиковая память (peak RSS)
+не зависит от предыдущих размеров. Для каждой операции печатаются пропускная способность, процентили
+длительности p50 и p99 и среднее время:
+    load_books    - запуск Library на готовом файле (REPEATS раз);
+    build_index   - построение поисковых индексов при первом поиске (REPEATS раз);
+    find_book_by_id, find_books (по названию и по автору вперемешку), update_status (выдача и возврат),
+    add_book (новые книги и дубликаты популярных) - внутри batch, без записи на диск;
+    save_books    - запись полного снимка каталога (REPEATS раз).
+
+Результаты можно сохранить как базовые (--save) и сравнить с ними следующий запуск (--baseline): снижение
+пропускной способности, рост p99 или пиковой памяти больше порога (--threshold) отмечаются как регрессии,
+и процесс завершается с кодом 1. Генератор детерминирован (--seed), поэтому сравнение воспроизводимо.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --sizes 10000 100000 --save benchmarks/baseline.json
+    python -m benchmarks.bench_suite --sizes 10000 100000 --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from typing import Callable, Iterator
+
+from service.library import Library
+
+SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+# Количество вызовов каждой операции
+OPERATIONS = 10_000
+# Количество повторов долгих операций (загрузка, построение индексов, запись снимка)
+REPEATS = 3
+# Доля строк каталога, повторяющих уже существующие книги
+DUPLICATE_SHARE = 0.2
+# Допустимое ухудшение относительно базовых результатов
+THRESHOLD = 0.2
+
+ADJECTIVES = (
+    "Тихий", "Белый", "Тёмный", "Последний", "Красный", "Золотой", "Старый", "Ночной", "Далёкий", "Северный",
+    "Горький", "Вечный", "Медный", "Синий", "Пустой", "Холодный", "Бедный", "Весёлый", "Чужой", "Зимний",
+)
+NOUNS = (
+    "Дон", "сад", "берег", "город", "дом", "лес", "путь", "ветер", "огонь", "сон", "век", "мост", "остров",
+    "колокол", "парус", "песок", "снег", "день", "вечер", "рассвет", "перевал", "маяк", "порог", "бор",
+)
+PAIRS = (
+    "Война и мир", "Отцы и дети", "Преступление и наказание", "Мастер и Маргарита", "Поэт и толпа",
+    "Волки и овцы", "Слово и дело", "Море и звёзды",
+)
+FIRST_NAMES = (
+    "Лев", "Фёдор", "Анна", "Михаил", "Иван", "Марина", "Александр", "Николай", "Антон", "Борис", "Ольга",
+    "Сергей", "Евгений", "Татьяна", "Владимир", "Юрий", "Людмила", "Константин", "Дмитрий", "Вера",
+)
+LAST_NAMES = (
+    "Толстой", "Достоевский", "Ахматова", "Булгаков", "Бунин", "Цветаева", "Пушкин", "Гоголь", "Чехов",
+    "Пастернак", "Берггольц", "Есенин", "Замятин", "Токарева", "Маяковский", "Трифонов", "Улицкая", "Паустовский",
+    "Шукшин", "Панова", "Платонов", "Грин", "Каверин", "Распутин", "Астафьев",
+)
+
+
+def make_book(number: int) -> tuple[str, str, int]:
+    """
+    Детерминированно создаёт название, автора и год книги с номером number.
+
+    Аргументы:
+        number (int): Номер книги в каталоге.
+
+    Возвращает:
+        tuple[str, str, int]: Название, автор и год издания.
+    """
+    mixed = number * 2_654_435_761 % 4_294_967_296  # Мультипликативное хеширование Кнута
+    if mixed % 10 == 0:
+        title = PAIRS[mixed // 10 % len(PAIRS)]
+    else:
+        title = f"{ADJECTIVES[mixed % len(ADJECTIVES)]} {NOUNS[mixed // 20 % len(NOUNS)]}"
+        if mixed % 3 == 0:
+            title += f". Том {mixed // 7 % 12 + 1}"
+    author = f"{FIRST_NAMES[mixed // 480 % len(FIRST_NAMES)]} {LAST_NAMES[mixed // 9600 % len(LAST_NAMES)]}"
+    return title, author, 1800 + mixed // 240_000 % 225
+
+
+def popular(rng: random.Random, size: int) -> int:
+    """
+    Выбирает номер книги с перекосом в сторону меньших номеров (популярных книг).
+
+    Аргументы:
+        rng (random.Random): Генератор случайных чисел.
+        size (int): Количество книг.
+
+    Возвращает:
+        int: Номер книги от 0 до size - 1.
+    """
+    return int(size * rng.random() ** 3)
+
+
+def generate(path: str, size: int, seed: int) -> None:
+    """
+    Записывает файл библиотеки из size строк каталога, часть которых - дубликаты популярных книг.
+
+    Дубликаты не создают новых записей, а увеличивают количество экземпляров, как add_book. Записи
+    сериализуются по одной, в памяти хранится только массив количеств.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        size (int): Количество строк каталога.
+        seed (int): Начальное значение генератора.
+    """
+    rng = random.Random(seed)
+    unique = size - int(size * DUPLICATE_SHARE)
+    counts = array("I", [1]) * unique
+    for _ in range(size - unique):
+        counts[popular(rng, unique)] += 1
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for number in range(unique):
+            title, author, year = make_book(number)
+            record = {"id": number + 1, "title": title, "author": author, "year": year, "status": "в наличии",
+                      "count": counts[number]}
+            file.write(("," if number else "") + json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        file.write("]")
+
+
+def measure(calls: Iterator[Callable[[], object]]) -> dict[str, float]:
+    """
+    Выполняет вызовы по одному и возвращает сводку длительностей.
+
+    Аргументы:
+        calls (Iterator[Callable[[], object]]): Измеряемые вызовы.
+
+    Возвращает:
+        dict[str, float]: Количество вызовов, вызовов в секунду, p50, p99 и среднее в микросекундах.
+    """
+    samples = []
+    for call in calls:
+        start = time.perf_counter_ns()
+        call()
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "ops_per_s": len(samples) / (total / 1e9) if total else 0.0,
+        "p50_us": samples[len(samples) // 2] / 1e3,
+        "p99_us": samples[min(len(samples) - 1, len(samples) * 99 // 100)] / 1e3,
+        "mean_us": total / len(samples) / 1e3,
+    }
+
+
+def child(path: str, operations: int, seed: int) -> None:
+    """
+    Измеряет операции библиотеки на файле path в текущем процессе и печатает результат в формате JSON.
+
+    Аргументы:
+        path (str): Путь к файлу библиотеки.
+        operations (int): Количество вызовов каждой операции.
+        seed (int): Начальное значение генератора запросов.
+    """
+    rng = random.Random(seed + 1)
+    results = {}
+    libraries = []
+
+    def loads() -> Iterator[Callable[[], object]]:
+        for _ in range(REPEATS):
+            libraries.clear()  # Предыдущая библиотека освобождается вне измерения
+            yield lambda: libraries.append(Library(storage_file=path))
+
+    results["load_books"] = measure(loads())
+    library = libraries[0]
+    size = library.count_books()
+
+    def index_builds() -> Iterator[Callable[[], object]]:
+        for _ in range(REPEATS):
+            library._set_catalogue(library._books)  # Сбрасывает построенные индексы
+            yield lambda: library.find_books(title="Война и мир")
+
+    results["build_index"] = measure(index_builds())
+
+    ids = [rng.randint(1, size) for _ in range(operations)]
+    results["find_book_by_id"] = measure(lambda book_id=book_id: library.find_book_by_id(book_id) for book_id in ids)
+
+    queries = []
+    for number in range(operations):
+        title, author, _ = make_book(popular(rng, size))
+        queries.append({"title": title} if number % 2 else {"author": author})
+    results["find_books"] = measure(lambda query=query: library.find_books(**query) for query in queries)
+
+    with library.batch():
+        def circulate(book_id: int) -> None:
+            if library.update_status(book_id, "выдана"):
+                library.update_status(book_id, "в наличии")
+
+        results["update_status"] = measure(lambda book_id=book_id: circulate(book_id) for book_id in ids)
+        new_books = [make_book(popular(rng, size) if number % 5 == 0 else size + number)
+                     for number in range(operations)]
+        results["add_book"] = measure(
+            lambda book=book: library.add_book(title=book[0], author=book[1], year=book[2]) for book in new_books
+        )
+    results["save_books"] = measure(library.compact for _ in range(REPEATS))
+    library.close()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"books": size, "peak_mb": peak_mb, "operations": results}))
+
+
+def run(size: int, operations: int, seed: int) -> dict:
+    """
+    Генерирует каталог и измеряет операции в отдельных процессах.
+
+    Аргументы:
+        size (int): Количество строк каталога.
+        operations (int): Количество вызовов каждой операции.
+        seed (int): Начальное значение генератора.
+
+    Возвращает:
+        dict: Количество книг, пиковая память в МБ и сводки по операциям.
+    """
+    module = [sys.executable, "-m", "benchmarks.bench_suite"]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "library.json")
+        # Генерация в отдельном процессе: иначе Linux унаследует пик памяти родителя в ru_maxrss дочернего процесса
+        subprocess.run([*module, "--generate", path, str(size), str(seed)], check=True)
+        output = subprocess.run(
+            [*module, "--child", path, str(operations), str(seed)], check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Сравнивает результаты с базовыми и возвращает описания регрессий.
+
+    Аргументы:
+        results (dict): Текущие результаты по размерам.
+        baseline (dict): Базовые результаты по размерам.
+        threshold (float): Допустимое ухудшение, например 0.2 - на 20%.
+
+    Возвращает:
+        list[str]: Описания регрессий (пустой список, если их нет).
+    """
+    regressions = []
+    for size, current in results.items():
+        previous = baseline.get(size)
+        if previous is None:
+            continue
+        if current["peak_mb"] > previous["peak_mb"] * (1 + threshold):
+            regressions.append(f"{size}: пиковая память {previous['peak_mb']:.0f} -> {current['peak_mb']:.0f} МБ")
+        for name, summary in current["operations"].items():
+            old = previous["operations"].get(name)
+            if old is None:
+                continue
+            if summary["ops_per_s"] < old["ops_per_s"] * (1 - threshold):
+                regressions.append(
+                    f"{size} {name}: {old['ops_per_s']:.0f} -> {summary['ops_per_s']:.0f} вызовов/с"
+                )
+            if summary["calls"] > 1 and summary["p99_us"] > old["p99_us"] * (1 + threshold):
+                regressions.append(f"{size} {name}: p99 {old['p99_us']:.1f} -> {summary['p99_us']:.1f} мкс")
+    return regressions
+
+
+def report(size: str, result: dict) -> None:
+    """
+    Печатает результаты одного размера.
+
+    Аргументы:
+        size (str): Количество строк каталога.
+        result (dict): Результаты размера.
+    """
+    print(f"\n{size} строк каталога, {result['books']} книг, пик памяти {result['peak_mb']:.0f} МБ")
+    print(f"{'операция':>16} {'вызовов/с':>12} {'p50, мкс':>10} {'p99, мкс':>10} {'среднее, мкс':>13}")
+    for name, summary in result["operations"].items():
+        print(f"{name:>16} {summary['ops_per_s']:>12.1f} {summary['p50_us']:>10.1f} {summary['p99_us']:>10.1f} "
+              f"{summary['mean_us']:>13.1f}")
+
+
+def main(argv: list[str]) -> None:
+    if argv and argv[0] == "--generate":
+        generate(argv[1], int(argv[2]), int(argv[3]))
+        return
+    if argv and argv[0] == "--child":
+        child(argv[1], int(argv[2]), int(argv[3]))
+        return
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_suite", description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="размеры каталога")
+    parser.add_argument("--operations", type=int, default=OPERATIONS, help="количество вызовов каждой операции")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генератора")
+    parser.add_argument("--save", help="сохранить результаты как базовые в файл JSON")
+    parser.add_argument("--baseline", help="сравнить результаты с базовыми из файла JSON")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="допустимое ухудшение (0.2 = 20%%)")
+    arguments = parser.parse_args(argv)
+
+    results = {}
+    for size in arguments.sizes:
+        results[str(size)] = run(size, arguments.operations, arguments.seed)
+        report(str(size), results[str(size)])
+
+    if arguments.save:
+        meta = {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+                "operations": arguments.operations, "seed": arguments.seed}
+        with open(arguments.save, "w", encoding="utf-8") as file:
+            json.dump({"meta": meta, "results": results}, file, ensure_ascii=False, indent=2)
+        print(f"\nБазовые результаты сохранены в {arguments.save}.")
+    if arguments.baseline:
+        with open(arguments.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, arguments.threshold)
+        if not regressions:
+            print(f"\nРегрессий относительно {arguments.baseline} нет (порог {arguments.threshold:.0%}).")
+            return
+        print(f"\nРегрессии относительно {arguments.baseline} (порог {arguments.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,140 @@
+"""
+Микробенчмарк валидаторов.
+
+Сравнивает прежнюю реализацию (посимвольный генератор в validate_author, разбор года через исключения) с текущей
+на ROWS синтетических строк: имена на кириллице и латинице, около 5% некорректных значений. Измеряются проверка
+по одному значению и пакетная проверка validate_rows; результаты сверяются.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_validators
+    python -m benchmarks.bench_validators 200000
+"""
+import random
+import sys
+import time
+from typing import Callable
+
+from utils.validators import validate_author, validate_rows, validate_title, validate_year
+
+ROWS = 1_000_000
+CYRILLIC = ("Лев Толстой", "Фёдор Достоевский", "Анна Ахматова", "Михаил Булгаков", "Иван Бунин")
+LATIN = ("Jane Austen", "Mark Twain", "Virginia Woolf", "George Orwell", "Leo Tolstoy")
+
+
+def legacy_validate_author(author: str) -> str:
+    """Прежняя реализация validate_author."""
+    if not author:
+        raise ValueError("Имя автора не может быть пустым.")
+    if len(author) > 50:
+        raise ValueError("Имя автора не должно превышать 50 символов.")
+    if not all(char.isalpha() or char.isspace() for char in author):
+        raise ValueError("Имя автора должно содержать только буквы и пробелы.")
+    return author
+
+
+def legacy_validate_year(year: str) -> int:
+    """Прежняя реализация validate_year."""
+    if not year:
+        raise ValueError("Год издания не может быть пустым.")
+    try:
+        year = int(year)
+    except ValueError:
+        raise ValueError("Год издания должен быть числом.")
+    if not 0 < year <= 2024:
+        raise ValueError("Год издания должен быть в пределах от 0 до текущего года.")
+    return year
+
+
+def legacy_validate_rows(titles: list[str], authors: list[str], years: list[str]) -> list[list[str]]:
+    """Пакетная проверка поверх прежних валидаторов: вызов и перехват исключения на каждое значение."""
+    rows_errors = []
+    for row in zip(titles, authors, years):
+        errors = []
+        for validator, value in zip((validate_title, legacy_validate_author, legacy_validate_year), row):
+            try:
+                validator(value)
+            except ValueError as e:
+                errors.append(str(e))
+        rows_errors.append(errors)
+    return rows_errors
+
+
+def generate(rows: int) -> tuple[list[str], list[str], list[str]]:
+    """
+    Создаёт столбцы синтетических названий, авторов и годов.
+
+    Аргументы:
+        rows (int): Количество строк.
+
+    Возвращает:
+        tuple[list[str], list[str], list[str]]: Названия, авторы и годы.
+    """
+    rng = random.Random(0)
+    titles, authors, years = [], [], []
+    for number in range(rows):
+        author = rng.choice(CYRILLIC if number % 2 else LATIN)
+        year = str(1800 + number % 220)
+        if rng.random() < 0.05:
+            author, year = (f"{author} 2", year) if number % 2 else (author, f"{year}г")
+        titles.append(f"Книга номер {number}")
+        authors.append(author)
+        years.append(year)
+    return titles, authors, years
+
+
+def measure(func: Callable[[], object]) -> tuple[float, object]:
+    """
+    Выполняет функцию и возвращает время выполнения и результат.
+
+    Аргументы:
+        func (Callable[[], object]): Измеряемая функция.
+
+    Возвращает:
+        tuple[float, object]: Время в секундах и результат.
+    """
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def each(validator: Callable, values: list[str]) -> list[bool]:
+    """
+    Проверяет значения по одному.
+
+    Аргументы:
+        validator (Callable): Валидатор.
+        values (list[str]): Значения.
+
+    Возвращает:
+        list[bool]: Корректно ли каждое значение.
+    """
+    results = []
+    for value in values:
+        try:
+            validator(value)
+            results.append(True)
+        except ValueError:
+            results.append(False)
+    return results
+
+
+def main(argv: list[str]) -> None:
+    rows = int(argv[0]) if argv else ROWS
+    titles, authors, years = generate(rows)
+    cases = (
+        ("validate_author", lambda: each(legacy_validate_author, authors), lambda: each(validate_author, authors)),
+        ("validate_year", lambda: each(legacy_validate_year, years), lambda: each(validate_year, years)),
+        ("validate_rows", lambda: legacy_validate_rows(titles, authors, years),
+         lambda: validate_rows(titles, authors, years)),
+    )
+    print(f"{rows} строк")
+    print(f"{'проверка':>16} {'прежняя, с':>11} {'текущая, с':>11} {'ускорение':>10}")
+    for name, legacy, current in cases:
+        legacy_time, legacy_result = measure(legacy)
+        current_time, current_result = measure(current)
+        assert legacy_result == current_result, name
+        print(f"{name:>16} {legacy_time:>11.2f} {current_time:>11.2f} {legacy_time / current_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
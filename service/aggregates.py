@@ -0,0 +1,199 @@
+import heapq
+import threading
+from typing import Container
+
+from service.book import Book
+from service.catalogue import BookRecord
+from settings.settings import STATUSES
+
+
+class Aggregates:
+    """
+    Класс, представляющий сводные показатели каталога, которые обновляются при каждом изменении, а не подсчитываются
+    обходом книг.
+
+    Атрибуты:
+        books (int): Количество книг (записей каталога).
+        copies (int): Количество экземпляров в наличии (сумма количеств книг).
+        issued (int): Количество выданных и ещё не возвращённых экземпляров книг, учтённых в показателях.
+        statuses (dict[str, int]): Статус -> количество книг с этим статусом (все статусы из STATUSES).
+        authors (dict[str, int]): Автор -> количество его книг.
+        years (dict[int, int]): Год издания -> количество книг.
+        _outstanding (dict[int, int]): ID книги -> количество её выданных и ещё не возвращённых экземпляров.
+        _lock (threading.Lock): Блокировка показателей: выдача и возврат разных книг выполняются параллельно.
+
+    Методы:
+        reset: Обнуляет показатели каталога, сохраняя выданные экземпляры каждой книги.
+        add: Учитывает книгу, добавленную в каталог.
+        remove: Исключает книгу из показателей каталога.
+        change: Учитывает изменение количества и статуса книги.
+        issue: Учитывает выдачу экземпляра.
+        give_back: Учитывает возврат экземпляра.
+        forget: Забывает выданные экземпляры удалённой книги.
+        retain: Забывает выданные экземпляры книг, которых нет в каталоге.
+        summary: Возвращает основные показатели.
+        decades: Возвращает количество книг по десятилетиям.
+        top_authors: Возвращает авторов с наибольшим количеством книг.
+    """
+
+    def __init__(self, outstanding: dict[int, int] | None = None):
+        """
+        Инициализирует пустые показатели.
+
+        Аргументы:
+            outstanding (dict[int, int] | None): Уже выданные экземпляры каждой книги (например, по журналу выдач).
+                Учитываются в issued, когда книга добавляется в показатели.
+        """
+        self._outstanding: dict[int, int] = dict(outstanding or {})
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Обнуляет показатели каталога, сохраняя выданные экземпляры каждой книги."""
+        self.books = 0
+        self.copies = 0
+        self.issued = 0
+        self.statuses: dict[str, int] = dict.fromkeys(sorted(STATUSES), 0)
+        self.authors: dict[str, int] = {}
+        self.years: dict[int, int] = {}
+
+    def add(self, book: Book | BookRecord) -> None:
+        """
+        Учитывает книгу, добавленную в каталог.
+
+        Аргументы:
+            book (Book | BookRecord): Добавленная книга.
+        """
+        with self._lock:
+            self.books += 1
+            self.copies += book.count
+            self.statuses[book.status] = self.statuses.get(book.status, 0) + 1
+            self.authors[book.author] = self.authors.get(book.author, 0) + 1
+            self.years[book.year] = self.years.get(book.year, 0) + 1
+            self.issued += self._outstanding.get(book.book_id, 0)
+
+    def remove(self, book: Book | BookRecord) -> None:
+        """
+        Исключает книгу из показателей каталога: при удалении или перед изменением её полей.
+
+        Аргументы:
+            book (Book | BookRecord): Книга с теми значениями полей, с которыми она была учтена.
+        """
+        with self._lock:
+            self.books -= 1
+            self.copies -= book.count
+            self.issued -= self._outstanding.get(book.book_id, 0)
+            self.statuses[book.status] -= 1
+            for counts, key in ((self.authors, book.author), (self.years, book.year)):
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+
+    def change(self, status_before: str, status_after: str, copies: int) -> None:
+        """
+        Учитывает изменение количества экземпляров и статуса книги.
+
+        Аргументы:
+            status_before (str): Статус до изменения.
+            status_after (str): Статус после изменения.
+            copies (int): Изменение количества экземпляров в наличии.
+        """
+        with self._lock:
+            self.copies += copies
+            if status_before != status_after:
+                self.statuses[status_before] -= 1
+                self.statuses[status_after] = self.statuses.get(status_after, 0) + 1
+
+    def issue(self, book_id: int) -> None:
+        """
+        Учитывает выдачу экземпляра книги.
+
+        Аргументы:
+            book_id (int): ID книги.
+        """
+        with self._lock:
+            self._outstanding[book_id] = self._outstanding.get(book_id, 0) + 1
+            self.issued += 1
+
+    def give_back(self, book_id: int) -> None:
+        """
+        Учитывает возврат экземпляра книги. Возврат сверх выданного считается поступлением нового экземпляра.
+
+        Аргументы:
+            book_id (int): ID книги.
+        """
+        with self._lock:
+            outstanding = self._outstanding.get(book_id, 0)
+            if not outstanding:
+                return
+            if outstanding == 1:
+                del self._outstanding[book_id]
+            else:
+                self._outstanding[book_id] = outstanding - 1
+            self.issued -= 1
+
+    def forget(self, book_id: int) -> None:
+        """
+        Забывает выданные экземпляры удалённой книги. Из issued они исключаются вызовом remove.
+
+        Аргументы:
+            book_id (int): ID книги.
+        """
+        with self._lock:
+            self._outstanding.pop(book_id, None)
+
+    def retain(self, book_ids: Container[int]) -> None:
+        """
+        Забывает выданные экземпляры книг, которых нет в каталоге (например, восстановленные по журналу выдач
+        для книг, удалённых до перезапуска).
+
+        Аргументы:
+            book_ids (Container[int]): ID книг каталога.
+        """
+        with self._lock:
+            for book_id in [book_id for book_id in self._outstanding if book_id not in book_ids]:
+                del self._outstanding[book_id]
+
+    def summary(self) -> dict:
+        """
+        Возвращает основные показатели за O(1).
+
+        Возвращает:
+            dict: Количество книг ("books"), экземпляров в наличии ("available"), выданных экземпляров ("issued"),
+                всех экземпляров ("copies"), книг по статусам ("statuses") и количество авторов ("authors").
+        """
+        with self._lock:
+            return {
+                "books": self.books,
+                "available": self.copies,
+                "issued": self.issued,
+                "copies": self.copies + self.issued,
+                "statuses": dict(self.statuses),
+                "authors": len(self.authors),
+            }
+
+    def decades(self) -> dict[int, int]:
+        """
+        Возвращает количество книг по десятилетиям. Обходит только различные годы, а не книги.
+
+        Возвращает:
+            dict[int, int]: Первый год десятилетия -> количество книг, по возрастанию десятилетия.
+        """
+        with self._lock:
+            decades: dict[int, int] = {}
+            for year in sorted(self.years):
+                decades[year // 10 * 10] = decades.get(year // 10 * 10, 0) + self.years[year]
+            return decades
+
+    def top_authors(self, n: int) -> list[tuple[str, int]]:
+        """
+        Возвращает авторов с наибольшим количеством книг, выбирая их кучей по счётчикам авторов.
+
+        Аргументы:
+            n (int): Количество авторов.
+
+        Возвращает:
+            list[tuple[str, int]]: Автор и количество книг по убыванию количества (при равенстве - по имени).
+        """
+        with self._lock:
+            return heapq.nsmallest(n, self.authors.items(), key=lambda item: (-item[1], item[0]))
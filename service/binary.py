@@ -0,0 +1,398 @@
+"""
+Двоичный формат хранения каталога с произвольным доступом через mmap.
+
+Структура файла:
+    заголовок (HEADER) - сигнатура, версия, количество записей, смещения таблицы статусов, записей и кучи строк;
+    таблица статусов - JSON-список статусов, индекс в списке является кодом статуса;
+    записи (RECORD) фиксированной длины, упорядоченные по ID;
+    куча строк - названия и авторы в UTF-8, на которые ссылаются записи.
+
+Запуск конвертера из корня проекта:
+    python -m service.binary to-binary data/library.json data/library.bin
+    python -m service.binary to-json data/library.bin data/library.json
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_left
+from operator import itemgetter
+from typing import BinaryIO, Iterable, Iterator
+
+from service.book import Book
+from service.catalogue import BookRecord, Catalogue
+from service.storage import JsonStorage, Storage, write_atomically
+from settings.settings import STATUSES
+
+MAGIC = b"LIBR"
+VERSION = 1
+# Сигнатура, версия, количество записей, смещение таблицы статусов, её длина, смещение записей, смещение кучи
+HEADER = struct.Struct("<4sHxxQQQQQ")
+# ID, год, количество, код статуса, смещение и длина названия, смещение и длина автора (смещения - от начала кучи)
+RECORD = struct.Struct("<qiibxxxQIQI")
+_ID = struct.Struct("<q")
+
+
+def write_binary(path: str, records: Iterable[Book | BookRecord], backups: int = 0) -> int:
+    """
+    Атомарно записывает каталог в двоичный файл.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        records (Iterable[Book | BookRecord]): Книги или их записи в любом порядке.
+        backups (int): Количество хранимых резервных копий прежней версии (по умолчанию 0).
+
+    Возвращает:
+        int: Размер записанного файла в байтах.
+    """
+    rows = sorted(
+        (BookRecord(book.book_id, book.title, book.author, book.year, book.status, book.count) for book in records),
+        key=lambda record: record.book_id,
+    )
+    statuses = sorted(STATUSES | {record.status for record in rows})
+    codes = {status: code for code, status in enumerate(statuses)}
+    status_table = json.dumps(statuses, ensure_ascii=False).encode("utf-8")
+    statuses_offset = HEADER.size
+    records_offset = statuses_offset + len(status_table)
+    heap_offset = records_offset + RECORD.size * len(rows)
+
+    def write(file: BinaryIO) -> None:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, len(rows), statuses_offset, len(status_table), records_offset, heap_offset
+        ))
+        file.write(status_table)
+        # Куча строк собирается во временном файле, чтобы не держать её в памяти целиком
+        with tempfile.TemporaryFile() as heap:
+            position = 0
+            for record in rows:
+                title, author = record.title.encode("utf-8"), record.author.encode("utf-8")
+                file.write(RECORD.pack(
+                    record.book_id, record.year, record.count, codes[record.status],
+                    position, len(title), position + len(title), len(author),
+                ))
+                heap.write(title)
+                heap.write(author)
+                position += len(title) + len(author)
+            heap.seek(0)
+            while chunk := heap.read(1 << 20):
+                file.write(chunk)
+
+    return write_atomically(path, write, binary=True, backups=backups)
+
+
+class MappedBooks(Catalogue):
+    """
+    Класс, представляющий каталог, отображённый в память из двоичного файла.
+
+    Открытие файла не зависит от размера каталога: записи читаются с диска только при обращении. Книга по ID
+    находится сразу по смещению (ID - первый ID), а если в нумерации есть пропуски - бинарным поиском по записям.
+    Прочитанные, изменённые и новые книги хранятся в памяти как объекты Book и попадают в файл при следующем
+    сохранении.
+
+    Атрибуты:
+        path (str): Путь к двоичному файлу.
+        _cache (dict[int, Book]): Прочитанные из файла и изменённые книги.
+        _extra (dict[int, None]): ID новых книг, которых ещё нет в файле, в порядке добавления.
+        _deleted (set[int]): ID удалённых книг, которые ещё есть в файле.
+
+    Методы:
+        close: Закрывает отображение файла.
+        records: Возвращает записи всех книг в порядке добавления.
+        max_id: Возвращает наибольший ID, когда-либо записанный в каталог.
+    """
+
+    def __init__(self, path: str, cache: dict[int, Book] | None = None):
+        """
+        Открывает двоичный файл каталога.
+
+        Аргументы:
+            path (str): Путь к файлу.
+            cache (dict[int, Book] | None): Уже созданные объекты книг, которые следует переиспользовать.
+
+        Исключения:
+            ValueError: Если файл не является файлом каталога поддерживаемой версии.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._size, statuses_offset, statuses_length, self._records_offset, self._heap_offset = (
+            HEADER.unpack_from(self._map, 0)
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Файл {path} не является двоичным файлом библиотеки версии {VERSION}.")
+        self._statuses: list[str] = json.loads(self._map[statuses_offset:statuses_offset + statuses_length])
+        self._first_id = self._id_at(0) if self._size else 0
+        self._cache: dict[int, Book] = {}
+        self._extra: dict[int, None] = {}
+        self._deleted: set[int] = set()
+        for book_id, book in (cache or {}).items():
+            if self._slot(book_id) is not None:
+                self._cache[book_id] = book
+
+    def close(self) -> None:
+        """Закрывает отображение файла."""
+        self._map.close()
+        self._file.close()
+
+    def _id_at(self, slot: int) -> int:
+        """
+        Читает ID записи по её номеру.
+
+        Аргументы:
+            slot (int): Номер записи.
+
+        Возвращает:
+            int: ID книги.
+        """
+        return _ID.unpack_from(self._map, self._records_offset + slot * RECORD.size)[0]
+
+    def _slot(self, book_id: int) -> int | None:
+        """
+        Находит номер записи по ID: сначала по смещению, затем бинарным поиском.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            int | None: Номер записи или None, если книги нет в файле.
+        """
+        slot = book_id - self._first_id
+        if 0 <= slot < self._size and self._id_at(slot) == book_id:
+            return slot
+        slot = bisect_left(range(self._size), book_id, key=self._id_at)
+        if slot < self._size and self._id_at(slot) == book_id:
+            return slot
+        return None
+
+    def _read(self, slot: int) -> BookRecord:
+        """
+        Читает запись книги из файла.
+
+        Аргументы:
+            slot (int): Номер записи.
+
+        Возвращает:
+            BookRecord: Запись книги.
+        """
+        book_id, year, count, code, title_offset, title_length, author_offset, author_length = RECORD.unpack_from(
+            self._map, self._records_offset + slot * RECORD.size
+        )
+        title_offset += self._heap_offset
+        author_offset += self._heap_offset
+        return BookRecord(
+            book_id,
+            self._map[title_offset:title_offset + title_length].decode("utf-8"),
+            self._map[author_offset:author_offset + author_length].decode("utf-8"),
+            year,
+            self._statuses[code],
+            count,
+        )
+
+    def __getitem__(self, book_id: int) -> Book:
+        book = self._cache.get(book_id)
+        if book is not None:
+            return book
+        slot = self._slot(book_id) if book_id not in self._deleted else None
+        if slot is None:
+            raise KeyError(book_id)
+        # setdefault: параллельные читатели должны получить один и тот же объект книги
+        return self._cache.setdefault(book_id, self._read(slot).to_book())
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        if book_id not in self._cache and self._slot(book_id) is None:
+            self._extra[book_id] = None
+        self._deleted.discard(book_id)
+        self._cache[book_id] = book
+
+    def __delitem__(self, book_id: int) -> None:
+        if book_id in self._extra:
+            del self._extra[book_id]
+        elif book_id not in self._deleted and self._slot(book_id) is not None:
+            self._deleted.add(book_id)
+        else:
+            raise KeyError(book_id)
+        self._cache.pop(book_id, None)
+
+    def __contains__(self, book_id: object) -> bool:
+        if book_id in self._extra:
+            return True
+        return isinstance(book_id, int) and book_id not in self._deleted and self._slot(book_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        for slot in range(self._size):
+            book_id = self._id_at(slot)
+            if book_id not in self._deleted:
+                yield book_id
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return self._size - len(self._deleted) + len(self._extra)
+
+    def records(self) -> Iterator[Book | BookRecord]:
+        """
+        Возвращает все книги в порядке добавления; непрочитанные книги не превращаются в объекты Book.
+
+        Возвращает:
+            Iterator[Book | BookRecord]: Книги из памяти или записи из файла.
+        """
+        for slot in range(self._size):
+            book_id = self._id_at(slot)
+            if book_id in self._deleted:
+                continue
+            book = self._cache.get(book_id)
+            yield book if book is not None else self._read(slot)
+        for book_id in self._extra:
+            yield self._cache[book_id]
+
+    def max_id(self) -> int:
+        """
+        Возвращает наибольший ID, когда-либо записанный в каталог, без чтения всех записей.
+
+        Возвращает:
+            int: Наибольший ID или 0 для пустого каталога.
+        """
+        last = self._id_at(self._size - 1) if self._size else 0
+        return max(last, next(reversed(self._extra), 0))
+
+    @property
+    def cache(self) -> dict[int, Book]:
+        """Созданные объекты книг, которые можно передать новому отображению после перезаписи файла."""
+        return self._cache
+
+
+class BinaryStorage(Storage):
+    """
+    Класс, представляющий хранилище книг в двоичном файле с доступом через mmap.
+
+    Атрибуты:
+        path (str): Путь к двоичному файлу.
+        backups (int): Количество хранимых резервных копий.
+
+    Методы:
+        open: Отображает файл в память.
+        catalogue: Отображает файл в память при загрузке библиотеки.
+        load: Последовательно читает записи книг из файла.
+        save: Атомарно записывает каталог в файл.
+        append: Применяет изменения, перезаписывая файл.
+    """
+
+    def __init__(self, path: str, backups: int = 0):
+        """
+        Инициализирует хранилище.
+
+        Аргументы:
+            path (str): Путь к двоичному файлу.
+            backups (int): Количество хранимых резервных копий (по умолчанию 0).
+        """
+        self.path = path
+        self.backups = backups
+
+    def open(self, cache: dict[int, Book] | None = None) -> MappedBooks:
+        """
+        Отображает файл в память, при отсутствии файла создаёт пустой.
+
+        Аргументы:
+            cache (dict[int, Book] | None): Уже созданные объекты книг, которые следует переиспользовать.
+
+        Возвращает:
+            MappedBooks: Каталог, отображённый в память.
+        """
+        if not os.path.exists(self.path):
+            write_binary(self.path, ())
+        return MappedBooks(self.path, cache)
+
+    def catalogue(self) -> MappedBooks:
+        """
+        Отображает файл в память при загрузке библиотеки.
+
+        Возвращает:
+            MappedBooks: Каталог, отображённый в память.
+        """
+        return self.open()
+
+    def load(self) -> Iterator[dict]:
+        """
+        Последовательно читает записи книг из файла, отображённого в память, без создания объектов Book.
+
+        Возвращает:
+            Iterator[dict]: Записи книг в порядке ID.
+        """
+        books = self.open()
+        try:
+            for record in books.records():
+                yield record.to_dict()
+        finally:
+            books.close()
+
+    def save(self, records: Iterable[dict]) -> None:
+        """
+        Атомарно записывает каталог в файл.
+
+        Аргументы:
+            records (Iterable[dict]): Записи всех книг в формате Book.to_dict.
+        """
+        self.bytes_written += write_binary(self.path, map(Book.from_dict, records), backups=self.backups)
+
+    def append(self, changes: dict[int, dict | None]) -> None:
+        """
+        Применяет изменения, перезаписывая файл: записи фиксированной длины упорядочены по ID, поэтому дописать их
+        в конец нельзя. Библиотека этим не пользуется (journal = False) и сохраняет каталог через save.
+
+        Аргументы:
+            changes (dict[int, dict | None]): ID книги -> новая запись книги или None, если книга удалена.
+        """
+        if not changes:
+            return
+        changes = dict(changes)
+
+        def merged() -> Iterator[dict]:
+            for record in self.load():
+                if record["id"] in changes:
+                    record = changes.pop(record["id"])
+                    if record is None:
+                        continue
+                yield record
+            yield from sorted((record for record in changes.values() if record is not None), key=itemgetter("id"))
+
+        self.save(merged())
+
+
+def json_to_binary(json_path: str, binary_path: str) -> None:
+    """
+    Преобразует JSON-файл библиотеки (с учётом журнала) в двоичный формат.
+
+    Аргументы:
+        json_path (str): Путь к JSON-файлу.
+        binary_path (str): Путь к создаваемому двоичному файлу.
+    """
+    write_binary(binary_path, map(Book.from_dict, JsonStorage(json_path).load()))
+
+
+def binary_to_json(binary_path: str, json_path: str) -> None:
+    """
+    Преобразует двоичный файл библиотеки в JSON-формат.
+
+    Аргументы:
+        binary_path (str): Путь к двоичному файлу.
+        json_path (str): Путь к создаваемому JSON-файлу.
+    """
+    books = MappedBooks(binary_path)
+    try:
+        JsonStorage(json_path).save(book.to_dict() for book in books.records())
+    finally:
+        books.close()
+
+
+def main(argv: list[str]) -> None:
+    commands = {"to-binary": json_to_binary, "to-json": binary_to_json}
+    if len(argv) != 3 or argv[0] not in commands:
+        print("Использование: python -m service.binary {to-binary|to-json} <источник> <результат>")
+        sys.exit(2)
+    commands[argv[0]](argv[1], argv[2])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -11,6 +11,8 @@ class Book:
         count (int): Количество экземпляров книги (по умолчанию 1).
     """
 
+    __slots__ = ("book_id", "title", "author", "year", "status", "count")
+
     def __init__(self, book_id: int, title: str, author: str, year: int, status: str = "в наличии", count: int = 1):
         """
         Инициализирует объект книги.
@@ -0,0 +1,243 @@
+"""
+Массовый импорт и экспорт книг в форматах CSV и JSON Lines.
+
+Импорт читает файл потоково, проверяет строки валидаторами пакетами по batch_size (при workers > 1 - параллельно
+в пуле процессов), добавляет корректные книги одним вызовом Library.add_books на пакет и сохраняет библиотеку
+один раз в конце. Дубликаты находятся по индексу названия, автора и года и увеличивают количество существующей
+книги. Некорректные строки не прерывают импорт, а попадают в отчёт с номером строки и причиной.
+
+Экспорт записывает книги по одной, не строя полный список в памяти.
+
+Формат определяется по расширению файла (.csv, .jsonl, .ndjson) или задаётся явно. CSV-файл должен содержать
+заголовок со столбцами title, author и year (остальные столбцы игнорируются), строка JSON Lines - объект с теми же
+полями.
+
+Запуск из корня проекта:
+    python -m service.bulk import books.csv
+    python -m service.bulk export books.jsonl --storage data/library.json
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from typing import IO, Iterator, NamedTuple
+
+from service.library import Library
+from settings.settings import SHARED_STORAGE, SNAPSHOT_BACKUPS, USE_JOURNAL
+from utils.validators import VALIDATION_CHUNK_SIZE, validate_rows, validate_rows_parallel
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+FIELDS = ("title", "author", "year")
+# Количество строк, проверяемых и добавляемых за один раз
+IMPORT_BATCH_SIZE = 1000
+# Количество ошибок, сохраняемых в отчёте; остальные только подсчитываются
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportReport(NamedTuple):
+    """
+    Класс, представляющий итог импорта.
+
+    Атрибуты:
+        added (int): Количество новых книг.
+        merged (int): Количество строк, увеличивших количество уже существующих книг.
+        rejected (int): Количество отклонённых строк.
+        errors (list[tuple[int, str]]): Номер строки и причина для первых MAX_REPORTED_ERRORS отклонённых строк.
+    """
+
+    added: int
+    merged: int
+    rejected: int
+    errors: list[tuple[int, str]]
+
+
+def detect_format(path: str, file_format: str | None = None) -> str:
+    """
+    Определяет формат файла по явному указанию или расширению.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        file_format (str | None): Явно заданный формат ("csv" или "jsonl").
+
+    Возвращает:
+        str: "csv" или "jsonl".
+
+    Исключения:
+        ValueError: Если формат не поддерживается или не определяется по расширению.
+    """
+    if file_format is None:
+        file_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format not in FORMATS.values():
+        raise ValueError(f"Неизвестный формат файла {path}. Поддерживаются CSV и JSON Lines.")
+    return file_format
+
+
+def read_rows(file: IO[str], file_format: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Последовательно читает строки файла.
+
+    Аргументы:
+        file (IO[str]): Открытый текстовый файл.
+        file_format (str): "csv" или "jsonl".
+
+    Возвращает:
+        Iterator[tuple[int, dict | None, str | None]]: Номер строки, её поля и описание ошибки разбора (или None).
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        missing = set(FIELDS) - set(reader.fieldnames or ())
+        if missing:
+            yield 1, None, f"В заголовке нет столбцов: {', '.join(sorted(missing))}."
+            return
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, None, f"Некорректный JSON: {e}."
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Строка должна быть JSON-объектом."
+            continue
+        yield number, row, None
+
+
+def import_books(
+        library: Library,
+        path: str,
+        file_format: str | None = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        workers: int = 1,
+) -> ImportReport:
+    """
+    Импортирует книги из файла CSV или JSON Lines с одним сохранением в конце.
+
+    Аргументы:
+        library (Library): Библиотека, в которую добавляются книги.
+        path (str): Путь к файлу.
+        file_format (str | None): "csv" или "jsonl" (по умолчанию определяется по расширению).
+        batch_size (int): Количество строк, проверяемых и добавляемых за один раз.
+        workers (int): Количество процессов для проверки строк (по умолчанию 1 - в текущем процессе). При
+            workers > 1 пакет содержит не меньше VALIDATION_CHUNK_SIZE строк на процесс.
+
+    Возвращает:
+        ImportReport: Итог импорта.
+
+    Исключения:
+        ValueError: Если формат файла не поддерживается.
+    """
+    file_format = detect_format(path, file_format)
+    if workers > 1:
+        batch_size = max(batch_size, VALIDATION_CHUNK_SIZE * workers)
+    added = merged = rejected = 0
+    errors: list[tuple[int, str]] = []
+
+    def reject(number: int, error: str) -> None:
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append((number, error))
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+    with pool, open(path, "r", encoding="utf-8-sig", newline="") as file, library.batch():
+        rows = read_rows(file, file_format)
+        while batch := list(islice(rows, batch_size)):
+            numbers, titles, authors, years = [], [], [], []
+            for number, row, error in batch:
+                if error is not None:
+                    reject(number, error)
+                    continue
+                numbers.append(number)
+                title, author, year = (str(row.get(field) or "").strip() for field in FIELDS)
+                titles.append(title)
+                authors.append(author)
+                years.append(year)
+            if workers > 1:
+                rows_errors = validate_rows_parallel(titles, authors, years, executor=pool)
+            else:
+                rows_errors = validate_rows(titles, authors, years)
+
+            valid = []
+            for number, title, author, year, row_errors in zip(numbers, titles, authors, years, rows_errors):
+                if row_errors:
+                    reject(number, " ".join(row_errors))
+                else:
+                    valid.append((title, author, int(year)))
+            if valid:
+                batch_added, batch_merged = library.add_books(valid)
+                added += batch_added
+                merged += batch_merged
+    return ImportReport(added, merged, rejected, errors)
+
+
+def export_books(library: Library, path: str, file_format: str | None = None) -> int:
+    """
+    Потоково экспортирует все книги в файл CSV или JSON Lines.
+
+    Аргументы:
+        library (Library): Экспортируемая библиотека.
+        path (str): Путь к создаваемому файлу.
+        file_format (str | None): "csv" или "jsonl" (по умолчанию определяется по расширению).
+
+    Возвращает:
+        int: Количество записанных книг.
+
+    Исключения:
+        ValueError: Если формат файла не поддерживается.
+    """
+    file_format = detect_format(path, file_format)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=("id", "title", "author", "year", "status", "count"))
+            writer.writeheader()
+            for count, record in enumerate(library.records(), start=1):
+                writer.writerow(record)
+        else:
+            for count, record in enumerate(library.records(), start=1):
+                file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return count
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="python -m service.bulk", description="Массовый импорт и экспорт книг.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("path", help="файл CSV или JSON Lines")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="формат файла (по умолчанию по расширению)")
+    parser.add_argument("--storage", default="data/library.json", help="путь к файлу библиотеки")
+    parser.add_argument("--workers", type=int, default=1, help="количество процессов для проверки строк")
+    arguments = parser.parse_args(argv)
+
+    library = Library(
+        storage_file=arguments.storage, journal=USE_JOURNAL, backups=SNAPSHOT_BACKUPS, shared=SHARED_STORAGE
+    )
+    try:
+        if arguments.command == "export":
+            count = export_books(library, arguments.path, arguments.format)
+            print(f"Экспортировано книг: {count}.")
+            return
+        report = import_books(library, arguments.path, arguments.format, workers=arguments.workers)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+    finally:
+        library.close()
+
+    print(f"Добавлено книг: {report.added}, добавлено экземпляров существующих: {report.merged}, "
+          f"отклонено строк: {report.rejected}.")
+    for number, error in report.errors:
+        print(f"Строка {number}: {error}")
+    if report.rejected > len(report.errors):
+        print(f"... и ещё {report.rejected - len(report.errors)} отклонённых строк.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
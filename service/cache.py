@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+
+class QueryCache:
+    """
+    Класс, представляющий LRU-кэш результатов поиска (ID найденных книг) с инвалидацией по поколению каталога.
+
+    Каждый результат запоминается вместе с поколением, в котором он получен. Любое изменение состава каталога или
+    индексированных полей увеличивает поколение (invalidate), после чего все ранее сохранённые результаты считаются
+    устаревшими и вытесняются при следующем обращении к ним или по LRU. Хранятся ID, а не объекты книг, поэтому
+    изменение количества и статуса книги не делает результат устаревшим: книги берутся из каталога при каждом
+    обращении.
+
+    Атрибуты:
+        capacity (int): Наибольшее количество сохранённых результатов (0 - кэш выключен).
+        max_result (int): Наибольшее количество ID в сохраняемом результате; большие результаты не кэшируются.
+        generation (int): Текущее поколение каталога.
+        hits (int): Количество запросов, результат которых взят из кэша.
+        misses (int): Количество запросов, выполненных по индексу.
+        _entries (OrderedDict[Hashable, tuple[int, tuple[int, ...]]]): Ключ запроса -> поколение и ID книг,
+            от давно использованных к недавно использованным.
+        _lock (threading.Lock): Блокировка кэша: поиск выполняется параллельно несколькими читателями.
+
+    Методы:
+        get: Возвращает сохранённый результат текущего поколения.
+        put: Сохраняет результат для текущего поколения.
+        invalidate: Делает устаревшими все сохранённые результаты.
+        stats: Возвращает счётчики кэша.
+    """
+
+    def __init__(self, capacity: int, max_result: int = 10_000):
+        """
+        Инициализирует пустой кэш.
+
+        Аргументы:
+            capacity (int): Наибольшее количество сохранённых результатов (0 - кэш выключен).
+            max_result (int): Наибольшее количество ID в сохраняемом результате.
+        """
+        self.capacity = capacity
+        self.max_result = max_result
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[int, tuple[int, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[int, ...] | None:
+        """
+        Возвращает сохранённый результат, если он получен в текущем поколении.
+
+        Аргументы:
+            key (Hashable): Нормализованный ключ запроса.
+
+        Возвращает:
+            tuple[int, ...] | None: ID найденных книг или None, если результата нет или он устарел.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self.generation:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, book_ids: tuple[int, ...]) -> None:
+        """
+        Сохраняет результат для текущего поколения, вытесняя давно не использованный при переполнении.
+
+        Аргументы:
+            key (Hashable): Нормализованный ключ запроса.
+            book_ids (tuple[int, ...]): ID найденных книг.
+        """
+        if not self.capacity or len(book_ids) > self.max_result:
+            return
+        with self._lock:
+            self._entries[key] = (self.generation, book_ids)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """
+        Делает устаревшими все сохранённые результаты. Вызывается при изменении каталога под блокировкой записи.
+        """
+        self.generation += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Возвращает счётчики кэша.
+
+        Возвращает:
+            dict[str, int]: Количество сохранённых результатов, вместимость, попадания, промахи и поколение.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "generation": self.generation,
+            }
@@ -0,0 +1,440 @@
+import sys
+import threading
+from abc import abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator, NamedTuple
+
+from service.book import Book
+from settings.settings import STATUSES
+
+
+class BookRecord(NamedTuple):
+    """
+    Компактная неизменяемая запись книги, из которой по требованию создаётся объект Book.
+
+    Атрибуты совпадают с атрибутами Book, поэтому запись можно индексировать и сохранять так же, как книгу.
+    """
+
+    book_id: int
+    title: str
+    author: str
+    year: int
+    status: str
+    count: int
+
+    @staticmethod
+    def from_dict(data: dict) -> "BookRecord":
+        """
+        Создаёт запись из словаря в формате Book.to_dict.
+
+        Аргументы:
+            data (dict): Словарь с данными книги.
+
+        Возвращает:
+            BookRecord: Новая запись.
+        """
+        return BookRecord(data["id"], data["title"], data["author"], data["year"], data["status"], data["count"])
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает представление записи в виде словаря в формате Book.to_dict.
+
+        Возвращает:
+            dict: Словарь с данными книги.
+        """
+        return {
+            "id": self.book_id,
+            "title": self.title,
+            "author": self.author,
+            "year": self.year,
+            "status": self.status,
+            "count": self.count,
+        }
+
+    def to_book(self) -> Book:
+        """
+        Создаёт объект книги из записи.
+
+        Возвращает:
+            Book: Новый объект книги.
+        """
+        return Book(self.book_id, self.title, self.author, self.year, self.status, self.count)
+
+
+class Catalogue(MutableMapping):
+    """
+    Базовый класс каталогов, хранящих книги в компактном виде и создающих объекты Book по требованию.
+
+    Методы:
+        records: Возвращает все книги в порядке добавления без создания новых объектов Book.
+        max_id: Возвращает наибольший ID в каталоге.
+        get_many: Возвращает книги по списку ID.
+    """
+
+    def max_id(self) -> int:
+        """
+        Возвращает наибольший ID в каталоге.
+
+        Возвращает:
+            int: Наибольший ID или 0 для пустого каталога.
+        """
+        return max(self, default=0)
+
+    def get_many(self, book_ids: Iterable[int]) -> list[Book]:
+        """
+        Возвращает книги по списку ID. Каталоги во внешнем хранилище загружают их одним запросом.
+
+        Аргументы:
+            book_ids (Iterable[int]): ID книг.
+
+        Возвращает:
+            list[Book]: Книги в порядке ID.
+
+        Исключения:
+            KeyError: Если книги с одним из ID нет в каталоге.
+        """
+        return [self[book_id] for book_id in book_ids]
+
+    @abstractmethod
+    def records(self) -> Iterable[Book | BookRecord]:
+        """
+        Возвращает все книги в порядке добавления без создания новых объектов Book.
+
+        Возвращает:
+            Iterable[Book | BookRecord]: Книги или их компактные записи.
+        """
+
+
+class LazyBooks(Catalogue):
+    """
+    Класс, представляющий каталог, который создаёт объекты Book только при обращении к ним.
+
+    После первого обращения книга хранится как объект Book, поэтому её изменения не теряются. Создание объекта
+    выполняется под блокировкой, чтобы параллельные читатели получили один и тот же объект.
+
+    Атрибуты:
+        _items (dict[int, Book | BookRecord]): ID книги -> созданная книга или ещё не использованная запись.
+        _materialize_lock (threading.Lock): Блокировка создания объектов Book.
+
+    Методы:
+        records: Возвращает книги и записи без создания новых объектов Book.
+    """
+
+    def __init__(self, records: Iterable[Book | BookRecord] = ()):
+        """
+        Инициализирует каталог.
+
+        Аргументы:
+            records (Iterable[Book | BookRecord]): Книги или их записи в порядке добавления.
+        """
+        self._items: dict[int, Book | BookRecord] = {record.book_id: record for record in records}
+        self._materialize_lock = threading.Lock()
+
+    def __getitem__(self, book_id: int) -> Book:
+        item = self._items[book_id]
+        if isinstance(item, BookRecord):
+            with self._materialize_lock:
+                item = self._items[book_id]
+                if isinstance(item, BookRecord):
+                    item = self._items[book_id] = item.to_book()
+        return item
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        self._items[book_id] = book
+
+    def __delitem__(self, book_id: int) -> None:
+        del self._items[book_id]
+
+    def __contains__(self, book_id: object) -> bool:
+        return book_id in self._items
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def records(self) -> Iterable[Book | BookRecord]:
+        """
+        Возвращает книги и записи в порядке добавления без создания новых объектов Book.
+
+        Возвращает:
+            Iterable[Book | BookRecord]: Созданные книги и ещё не использованные записи.
+        """
+        return self._items.values()
+
+
+class BookView(Book):
+    """
+    Класс, представляющий книгу, данные которой хранятся в столбцах ColumnarBooks.
+
+    Чтение и изменение атрибутов обращаются напрямую к столбцам, поэтому изменения количества и статуса сразу
+    видны в каталоге. Два представления одной книги равны.
+    """
+
+    __slots__ = ("_store", "_id")
+
+    def __init__(self, store: "ColumnarBooks", book_id: int):
+        """
+        Инициализирует представление книги.
+
+        Аргументы:
+            store (ColumnarBooks): Каталог, в котором хранится книга.
+            book_id (int): Уникальный идентификатор книги.
+        """
+        self._store = store
+        self._id = book_id
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BookView):
+            return self._store is other._store and self._id == other._id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._id))
+
+    @property
+    def book_id(self) -> int:
+        return self._id
+
+    @property
+    def title(self) -> str:
+        return self._store.titles[self._store.row(self._id)]
+
+    @property
+    def author(self) -> str:
+        return self._store.authors[self._store.row(self._id)]
+
+    @property
+    def year(self) -> int:
+        return self._store.years[self._store.row(self._id)]
+
+    @property
+    def status(self) -> str:
+        return self._store.status_names[self._store.statuses[self._store.row(self._id)]]
+
+    @status.setter
+    def status(self, status: str) -> None:
+        self._store.statuses[self._store.row(self._id)] = self._store.status_code(status)
+
+    @property
+    def count(self) -> int:
+        return self._store.counts[self._store.row(self._id)]
+
+    @count.setter
+    def count(self, count: int) -> None:
+        self._store.counts[self._store.row(self._id)] = count
+
+
+class ColumnarBooks(Catalogue):
+    """
+    Класс, представляющий каталог в виде параллельных столбцов вместо миллионов объектов Book.
+
+    ID, год и количество хранятся в массивах array, статус - однобайтовым кодом, имена авторов интернируются.
+    Строки упорядочены по ID (новые ID всегда больше существующих), поэтому поиск строки выполняется бинарным
+    поиском без отдельного словаря. Удалённые строки помечаются и вычищаются, когда их становится больше половины.
+    По ID возвращается BookView, который создаётся при обращении.
+
+    Атрибуты:
+        ids (array): ID книг по возрастанию.
+        titles (list[str | None]): Названия книг.
+        authors (list[str | None]): Интернированные имена авторов.
+        years (array): Годы издания.
+        counts (array): Количество экземпляров.
+        statuses (array): Коды статусов (-1 - строка удалена).
+        status_names (list[str]): Код статуса -> статус.
+        _deleted (int): Количество удалённых строк.
+
+    Методы:
+        row: Находит номер строки книги по ID.
+        status_code: Возвращает код статуса, регистрируя новый статус при необходимости.
+        records: Возвращает записи всех книг в порядке добавления.
+    """
+
+    DELETED = -1
+
+    def __init__(self, records: Iterable[Book | BookRecord] = ()):
+        """
+        Инициализирует каталог.
+
+        Аргументы:
+            records (Iterable[Book | BookRecord]): Книги или их записи в порядке добавления.
+        """
+        self.ids = array("q")
+        self.titles: list[str | None] = []
+        self.authors: list[str | None] = []
+        self.years = array("i")
+        self.counts = array("i")
+        self.statuses = array("b")
+        self.status_names: list[str] = sorted(STATUSES)
+        self._status_codes: dict[str, int] = {status: code for code, status in enumerate(self.status_names)}
+        self._deleted = 0
+        for record in records:
+            self._put(record)
+
+    def status_code(self, status: str) -> int:
+        """
+        Возвращает код статуса, регистрируя новый статус при необходимости.
+
+        Аргументы:
+            status (str): Статус книги.
+
+        Возвращает:
+            int: Код статуса.
+        """
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self.status_names)
+            self.status_names.append(status)
+        return code
+
+    def _find(self, book_id: int) -> int:
+        """
+        Находит позицию, на которой ID стоит или должен стоять.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            int: Номер строки.
+        """
+        if self.ids and self.ids[-1] < book_id:
+            return len(self.ids)
+        return bisect_left(self.ids, book_id)
+
+    def row(self, book_id: int) -> int:
+        """
+        Находит номер строки книги по ID.
+
+        Аргументы:
+            book_id (int): ID книги.
+
+        Возвращает:
+            int: Номер строки.
+
+        Исключения:
+            KeyError: Если книги нет в каталоге.
+        """
+        position = self._find(book_id)
+        if position == len(self.ids) or self.ids[position] != book_id or self.statuses[position] == self.DELETED:
+            raise KeyError(book_id)
+        return position
+
+    def _put(self, book: Book | BookRecord) -> None:
+        """
+        Записывает книгу в столбцы, заменяя существующую строку с тем же ID.
+
+        Аргументы:
+            book (Book | BookRecord): Книга или её запись.
+        """
+        position = self._find(book.book_id)
+        values = (
+            sys.intern(book.author), book.year, book.count, self.status_code(book.status)
+        )
+        if position < len(self.ids) and self.ids[position] == book.book_id:
+            if self.statuses[position] == self.DELETED:
+                self._deleted -= 1
+            self.titles[position] = book.title
+            self.authors[position], self.years[position], self.counts[position], self.statuses[position] = values
+            return
+        author, year, count, status = values
+        if position == len(self.ids):
+            self.ids.append(book.book_id)
+            self.titles.append(book.title)
+            self.authors.append(author)
+            self.years.append(year)
+            self.counts.append(count)
+            self.statuses.append(status)
+        else:
+            # Редкий случай: ID меньше уже существующих (например, после ручного редактирования файла)
+            self.ids.insert(position, book.book_id)
+            self.titles.insert(position, book.title)
+            self.authors.insert(position, author)
+            self.years.insert(position, year)
+            self.counts.insert(position, count)
+            self.statuses.insert(position, status)
+
+    def _vacuum(self) -> None:
+        """
+        Удаляет помеченные строки из всех столбцов.
+        """
+        live = [position for position, code in enumerate(self.statuses) if code != self.DELETED]
+        self.ids = array("q", (self.ids[position] for position in live))
+        self.titles = [self.titles[position] for position in live]
+        self.authors = [self.authors[position] for position in live]
+        self.years = array("i", (self.years[position] for position in live))
+        self.counts = array("i", (self.counts[position] for position in live))
+        self.statuses = array("b", (self.statuses[position] for position in live))
+        self._deleted = 0
+
+    def __getitem__(self, book_id: int) -> BookView:
+        self.row(book_id)
+        return BookView(self, book_id)
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        if isinstance(book, BookView) and book._store is self:
+            return
+        self._put(book)
+
+    def __delitem__(self, book_id: int) -> None:
+        position = self.row(book_id)
+        self.statuses[position] = self.DELETED
+        self.titles[position] = self.authors[position] = None
+        self._deleted += 1
+        if self._deleted * 2 > len(self.ids):
+            self._vacuum()
+
+    def __contains__(self, book_id: object) -> bool:
+        try:
+            self.row(book_id)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[int]:
+        for book_id, code in zip(self.ids, self.statuses):
+            if code != self.DELETED:
+                yield book_id
+
+    def __len__(self) -> int:
+        return len(self.ids) - self._deleted
+
+    def pop(self, book_id: int, *default) -> Book:
+        """
+        Удаляет книгу и возвращает её копию в виде обычного объекта Book.
+
+        Аргументы:
+            book_id (int): ID книги.
+            default: Значение, возвращаемое при отсутствии книги.
+
+        Возвращает:
+            Book: Удалённая книга.
+        """
+        try:
+            position = self.row(book_id)
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        book = Book(
+            book_id, self.titles[position], self.authors[position], self.years[position],
+            self.status_names[self.statuses[position]], self.counts[position],
+        )
+        del self[book_id]
+        return book
+
+    def records(self) -> Iterator[BookRecord]:
+        """
+        Возвращает записи всех книг в порядке добавления, не создавая объекты Book.
+
+        Возвращает:
+            Iterator[BookRecord]: Записи книг.
+        """
+        names = self.status_names
+        for book_id, title, author, year, count, code in zip(
+                self.ids, self.titles, self.authors, self.years, self.counts, self.statuses
+        ):
+            if code != self.DELETED:
+                yield BookRecord(book_id, title, author, year, names[code], count)
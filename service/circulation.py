@@ -0,0 +1,337 @@
+"""
+Журнал выдач и возвратов книг.
+
+События только дописываются: в памяти они хранятся в параллельных массивах array (время, ID книги, вид события),
+на диске - записями фиксированного размера EVENT.size байт. Время событий не убывает, поэтому события за период
+находятся двоичным поиском по массиву времени, а история книги - по индексу позиций её событий. Количество выдач
+каждой книги поддерживается при записи, поэтому самые востребованные книги за всё время выбираются кучей без
+обхода журнала; за период обходятся только события этого периода.
+
+Один файл могут вести несколько процессов: перед записью и по refresh журнал дочитывает чужие события, дописанные
+после уже прочитанных. При совместном доступе библиотека делает это под блокировкой файла библиотеки, поэтому
+время событий в файле не убывает.
+"""
+import heapq
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Callable, NamedTuple
+
+# Запись файла журнала: время (секунды с начала эпохи), ID книги, вид события
+EVENT = struct.Struct("<dqB")
+ISSUE = "выдача"
+RETURN = "возврат"
+KINDS = (ISSUE, RETURN)
+
+
+class CirculationEvent(NamedTuple):
+    """
+    Класс, представляющий событие выдачи или возврата книги.
+
+    Атрибуты:
+        time (float): Время события в секундах с начала эпохи.
+        book_id (int): ID книги.
+        kind (str): ISSUE или RETURN.
+    """
+
+    time: float
+    book_id: int
+    kind: str
+
+
+class CirculationLog:
+    """
+    Класс, представляющий журнал выдач и возвратов с индексами по книге и по времени.
+
+    Атрибуты:
+        path (str | None): Файл журнала (None - журнал только в памяти).
+        _times (array): Время событий в порядке записи (не убывает).
+        _book_ids (array): ID книг событий.
+        _kinds (array): Номера видов событий в KINDS.
+        _positions (dict[int, array]): ID книги -> позиции её событий в журнале.
+        _issues (dict[int, int]): ID книги -> количество её выдач за всё время.
+        _clock (Callable[[], float]): Источник текущего времени.
+        _offset (int): Длина прочитанной или записанной этим процессом части файла в байтах.
+        _file (BinaryIO | None): Файл журнала, открытый для дописывания.
+        _lock (threading.Lock): Блокировка журнала: события записываются из нескольких потоков.
+
+    Методы:
+        record: Записывает событие.
+        refresh: Дочитывает события, записанные другими процессами.
+        history: Возвращает события книги.
+        events: Возвращает события за период.
+        count: Возвращает количество событий вида за период.
+        most_borrowed: Возвращает книги с наибольшим количеством выдач.
+        outstanding: Возвращает количество выданных и не возвращённых экземпляров каждой книги.
+        max_book_id: Возвращает наибольший ID книги в журнале.
+        close: Закрывает файл журнала.
+    """
+
+    def __init__(self, path: str | None = None, clock: Callable[[], float] = time.time):
+        """
+        Инициализирует журнал и загружает события из файла, если он есть.
+
+        Неполная последняя запись не читается: её может дописывать другой процесс. Оставшуюся от прерванной записи
+        неполную запись обрезает record.
+
+        Аргументы:
+            path (str | None): Файл журнала (None - журнал только в памяти).
+            clock (Callable[[], float]): Источник текущего времени (по умолчанию time.time).
+        """
+        self.path = path
+        self._times = array("d")
+        self._book_ids = array("q")
+        self._kinds = array("B")
+        self._positions: dict[int, array] = {}
+        self._issues: dict[int, int] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._file = None
+        if path is None:
+            return
+        self._read_tail()
+        self._file = open(path, "ab", buffering=0)
+
+    def __len__(self) -> int:
+        """Возвращает количество событий в журнале."""
+        return len(self._times)
+
+    def _read_tail(self) -> list[CirculationEvent]:
+        """
+        Читает полные записи файла после уже прочитанной части. Вызывается под блокировкой журнала.
+
+        Возвращает:
+            list[CirculationEvent]: Прочитанные события.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return []
+        complete = (size - self._offset) - (size - self._offset) % EVENT.size
+        if complete <= 0:
+            return []
+        with open(self.path, "rb") as file:
+            file.seek(self._offset)
+            data = file.read(complete)
+        self._offset += len(data)
+        return [
+            CirculationEvent(self._add(event_time, book_id, kind), book_id, KINDS[kind])
+            for event_time, book_id, kind in EVENT.iter_unpack(data)
+        ]
+
+    def _add(self, event_time: float, book_id: int, kind: int) -> float:
+        """
+        Добавляет событие в массивы и индексы. Время, меньшее времени последнего события, заменяется им, чтобы
+        массив времени оставался упорядоченным для двоичного поиска.
+
+        Аргументы:
+            event_time (float): Время события.
+            book_id (int): ID книги.
+            kind (int): Номер вида события в KINDS.
+
+        Возвращает:
+            float: Время, с которым событие добавлено.
+        """
+        if self._times and event_time < self._times[-1]:
+            event_time = self._times[-1]
+        position = len(self._times)
+        self._times.append(event_time)
+        self._book_ids.append(book_id)
+        self._kinds.append(kind)
+        positions = self._positions.get(book_id)
+        if positions is None:
+            positions = self._positions[book_id] = array("I")
+        positions.append(position)
+        if kind == 0:
+            self._issues[book_id] = self._issues.get(book_id, 0) + 1
+        return event_time
+
+    def record(self, book_id: int, kind: str) -> CirculationEvent:
+        """
+        Записывает событие с текущим временем и дописывает его в файл одной операцией записи.
+
+        Перед записью дочитываются события других процессов, а неполная запись в конце файла (прерванная запись)
+        обрезается; при совместном доступе библиотека вызывает record под блокировкой файла. Если часы отстали
+        от последнего события, используется время последнего события, чтобы время в журнале не убывало.
+
+        Аргументы:
+            book_id (int): ID книги.
+            kind (str): ISSUE или RETURN.
+
+        Возвращает:
+            CirculationEvent: Записанное событие.
+
+        Исключения:
+            ValueError: Если вид события неизвестен.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Неизвестный вид события: {kind}. Допустимые значения: {', '.join(KINDS)}.")
+        code = KINDS.index(kind)
+        with self._lock:
+            if self._file is not None:
+                self._read_tail()
+                if os.fstat(self._file.fileno()).st_size > self._offset:
+                    self._file.truncate(self._offset)
+            event_time = self._clock()
+            if self._times and event_time < self._times[-1]:
+                event_time = self._times[-1]
+            if self._file is not None:
+                self._file.write(EVENT.pack(event_time, book_id, code))
+                self._offset += EVENT.size
+            self._add(event_time, book_id, code)
+        return CirculationEvent(event_time, book_id, kind)
+
+    def refresh(self) -> list[CirculationEvent]:
+        """
+        Дочитывает события, дописанные в файл другими процессами. Без новых событий стоит одного вызова stat.
+
+        Возвращает:
+            list[CirculationEvent]: Новые события в порядке записи.
+        """
+        with self._lock:
+            return self._read_tail() if self.path is not None else []
+
+    def _event(self, position: int) -> CirculationEvent:
+        """
+        Возвращает событие по позиции в журнале.
+
+        Аргументы:
+            position (int): Позиция события.
+
+        Возвращает:
+            CirculationEvent: Событие.
+        """
+        return CirculationEvent(self._times[position], self._book_ids[position], KINDS[self._kinds[position]])
+
+    def _window(self, since: float | None, until: float | None) -> range:
+        """
+        Возвращает позиции событий за период двоичным поиском по времени.
+
+        Аргументы:
+            since (float | None): Начало периода включительно (None - с начала журнала).
+            until (float | None): Конец периода включительно (None - до конца журнала).
+
+        Возвращает:
+            range: Позиции событий периода.
+        """
+        start = 0 if since is None else bisect_left(self._times, since)
+        end = len(self._times) if until is None else bisect_right(self._times, until)
+        return range(start, end)
+
+    def history(self, book_id: int, since: float | None = None, until: float | None = None) -> list[CirculationEvent]:
+        """
+        Возвращает события книги за период в порядке времени, не обходя события других книг.
+
+        Аргументы:
+            book_id (int): ID книги.
+            since (float | None): Начало периода включительно (None - с начала журнала).
+            until (float | None): Конец периода включительно (None - до конца журнала).
+
+        Возвращает:
+            list[CirculationEvent]: События книги.
+        """
+        with self._lock:
+            positions = self._positions.get(book_id, ())
+            start = 0 if since is None else bisect_left(positions, since, key=self._times.__getitem__)
+            end = len(positions) if until is None else bisect_right(positions, until, key=self._times.__getitem__)
+            return [self._event(position) for position in positions[start:end]]
+
+    def events(self, since: float | None = None, until: float | None = None) -> list[CirculationEvent]:
+        """
+        Возвращает события за период в порядке времени.
+
+        Аргументы:
+            since (float | None): Начало периода включительно (None - с начала журнала).
+            until (float | None): Конец периода включительно (None - до конца журнала).
+
+        Возвращает:
+            list[CirculationEvent]: События периода.
+        """
+        with self._lock:
+            return [self._event(position) for position in self._window(since, until)]
+
+    def count(self, kind: str = ISSUE, since: float | None = None, until: float | None = None) -> int:
+        """
+        Возвращает количество событий вида за период, например выдач за последние 30 дней.
+
+        Аргументы:
+            kind (str): ISSUE (по умолчанию) или RETURN.
+            since (float | None): Начало периода включительно (None - с начала журнала).
+            until (float | None): Конец периода включительно (None - до конца журнала).
+
+        Возвращает:
+            int: Количество событий.
+        """
+        code = KINDS.index(kind)
+        with self._lock:
+            window = self._window(since, until)
+            return self._kinds[window.start:window.stop].count(code)
+
+    def most_borrowed(self, n: int, since: float | None = None, until: float | None = None) -> list[tuple[int, int]]:
+        """
+        Возвращает книги с наибольшим количеством выдач.
+
+        За всё время используется счётчик выдач, поддерживаемый при записи; за период подсчитываются только
+        события периода. Первые n выбираются кучей (heapq), без сортировки всех книг.
+
+        Аргументы:
+            n (int): Количество книг.
+            since (float | None): Начало периода включительно (None - с начала журнала).
+            until (float | None): Конец периода включительно (None - до конца журнала).
+
+        Возвращает:
+            list[tuple[int, int]]: ID книги и количество выдач, по убыванию количества (при равенстве - по ID).
+        """
+        with self._lock:
+            if since is None and until is None:
+                issues = self._issues
+            else:
+                window = self._window(since, until)
+                issues = Counter(
+                    book_id for book_id, kind in zip(self._book_ids[window.start:window.stop],
+                                                     self._kinds[window.start:window.stop]) if kind == 0
+                )
+            return heapq.nsmallest(n, issues.items(), key=lambda item: (-item[1], item[0]))
+
+    def outstanding(self) -> dict[int, int]:
+        """
+        Возвращает количество выданных и не возвращённых экземпляров каждой книги, проходя её события по порядку.
+        Возврат сверх выданного считается поступлением нового экземпляра и не уменьшает количество ниже нуля.
+
+        Возвращает:
+            dict[int, int]: ID книги -> количество экземпляров (только книги, у которых оно больше нуля).
+        """
+        with self._lock:
+            outstanding = {}
+            for book_id, positions in self._positions.items():
+                count = 0
+                for position in positions:
+                    if self._kinds[position] == 0:
+                        count += 1
+                    elif count:
+                        count -= 1
+                if count:
+                    outstanding[book_id] = count
+            return outstanding
+
+    def max_book_id(self) -> int:
+        """
+        Возвращает наибольший ID книги, встречающийся в журнале, в том числе уже удалённой из каталога.
+
+        Возвращает:
+            int: Наибольший ID или 0 для пустого журнала.
+        """
+        with self._lock:
+            return max(self._positions, default=0)
+
+    def close(self) -> None:
+        """Закрывает файл журнала."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
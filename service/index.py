@@ -0,0 +1,286 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+
+from service.book import Book
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит строку к виду, в котором она хранится в индексах (без учёта регистра).
+
+    Аргументы:
+        text (str): Исходная строка.
+
+    Возвращает:
+        str: Нормализованная строка.
+    """
+    return text.casefold()
+
+
+class BookIndex:
+    """
+    Класс, представляющий индексы каталога для быстрого поиска книг.
+
+    Множества ID хранятся в словарях со значениями None: это сохраняет порядок добавления книг и позволяет
+    удалять элементы за O(1).
+
+    Атрибуты:
+        _keys (dict[tuple[str, str, int], int]): Составной индекс (название, автор, год) -> ID книги.
+        _titles (dict[str, dict[int, None]]): Индекс нормализованное название -> ID книг.
+        _authors (dict[str, dict[int, None]]): Индекс нормализованный автор -> ID книг.
+        _years (dict[int, dict[int, None]]): Индекс год -> ID книг.
+        _sorted_years (list[int]): Отсортированный список годов, встречающихся в каталоге.
+        _sorted_keys (dict[str, list[str]]): Отсортированные списки различных нормализованных названий ("title")
+            и авторов ("author"). Строятся при первой сортировке по полю и далее поддерживаются при add и remove.
+
+    Методы:
+        add: Добавляет книгу в индексы.
+        remove: Удаляет книгу из индексов.
+        clear: Очищает все индексы.
+        find_key: Находит ID книги по точному совпадению названия, автора и года.
+        find: Находит ID книг по любому сочетанию названия, автора, года и диапазона годов.
+        find_year_range: Находит ID книг, изданных в заданном диапазоне годов.
+        sorted_ids: Возвращает страницу ID книг, упорядоченных по названию, автору или году.
+    """
+
+    def __init__(self):
+        """Инициализирует пустые индексы."""
+        self._keys: dict[tuple[str, str, int], int] = {}
+        self._titles: dict[str, dict[int, None]] = {}
+        self._authors: dict[str, dict[int, None]] = {}
+        self._years: dict[int, dict[int, None]] = {}
+        self._sorted_years: list[int] = []
+        self._sorted_keys: dict[str, list[str]] = {}
+
+    @staticmethod
+    def make_key(title: str, author: str, year: int) -> tuple[str, str, int]:
+        """
+        Формирует ключ составного индекса.
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+
+        Возвращает:
+            tuple[str, str, int]: Нормализованный ключ.
+        """
+        return normalize(title), normalize(author), year
+
+    def add(self, book: Book) -> None:
+        """
+        Добавляет книгу в индексы. Если ключ уже занят, в индексе остаётся первая книга.
+
+        Аргументы:
+            book (Book): Книга для индексации.
+        """
+        key = self.make_key(book.title, book.author, book.year)
+        self._keys.setdefault(key, book.book_id)
+        title, author, year = key
+        for field, index, value in (("title", self._titles, title), ("author", self._authors, author)):
+            if value not in index and field in self._sorted_keys:
+                insort(self._sorted_keys[field], value)
+            index.setdefault(value, {})[book.book_id] = None
+        if year not in self._years:
+            insort(self._sorted_years, year)
+        self._years.setdefault(year, {})[book.book_id] = None
+
+    def remove(self, book: Book) -> None:
+        """
+        Удаляет книгу из индексов. Если по её ключу был проиндексирован именно этот ID, ключ переводится на
+        самую раннюю из оставшихся книг с тем же ключом (она находится пересечением индексов по полям).
+
+        Аргументы:
+            book (Book): Удаляемая книга.
+        """
+        key = self.make_key(book.title, book.author, book.year)
+        title, author, year = key
+        self._discard(self._titles, title, book.book_id)
+        self._discard(self._authors, author, book.book_id)
+        self._discard(self._years, year, book.book_id)
+        if self._keys.get(key) == book.book_id:
+            postings = [self._titles.get(title, {}), self._authors.get(author, {}), self._years.get(year, {})]
+            postings.sort(key=len)
+            smallest, *others = postings
+            remaining = next((book_id for book_id in smallest if all(book_id in ids for ids in others)), None)
+            if remaining is None:
+                del self._keys[key]
+            else:
+                self._keys[key] = remaining
+        if year not in self._years:
+            self._remove_sorted(self._sorted_years, year)
+        for field, index, value in (("title", self._titles, title), ("author", self._authors, author)):
+            if value not in index and field in self._sorted_keys:
+                self._remove_sorted(self._sorted_keys[field], value)
+
+    @staticmethod
+    def _remove_sorted(values: list, value: str | int) -> None:
+        """
+        Удаляет значение из отсортированного списка, если оно там есть.
+
+        Аргументы:
+            values (list): Отсортированный список.
+            value (str | int): Удаляемое значение.
+        """
+        position = bisect_left(values, value)
+        if position < len(values) and values[position] == value:
+            del values[position]
+
+    @staticmethod
+    def _discard(index: dict, value: str | int, book_id: int) -> None:
+        """
+        Удаляет ID книги из индекса по полю, удаляя пустые записи.
+
+        Аргументы:
+            index (dict): Индекс по полю.
+            value (str | int): Значение поля.
+            book_id (int): ID книги.
+        """
+        ids = index.get(value)
+        if ids is not None:
+            ids.pop(book_id, None)
+            if not ids:
+                del index[value]
+
+    def clear(self) -> None:
+        """Очищает все индексы."""
+        self._keys.clear()
+        self._titles.clear()
+        self._authors.clear()
+        self._years.clear()
+        self._sorted_years.clear()
+        self._sorted_keys.clear()
+
+    def find_key(self, title: str, author: str, year: int) -> int | None:
+        """
+        Находит ID книги по точному (без учёта регистра) совпадению названия, автора и года.
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+
+        Возвращает:
+            int | None: ID найденной книги или None.
+        """
+        return self._keys.get(self.make_key(title, author, year))
+
+    def _year_postings(self, year_from: int | None, year_to: int | None) -> list[dict[int, None]]:
+        """
+        Возвращает множества ID книг для всех годов из диапазона в порядке возрастания года.
+
+        Аргументы:
+            year_from (int | None): Начало диапазона включительно (None - без ограничения).
+            year_to (int | None): Конец диапазона включительно (None - без ограничения).
+
+        Возвращает:
+            list[dict[int, None]]: Множества ID книг по годам.
+        """
+        start = 0 if year_from is None else bisect_left(self._sorted_years, year_from)
+        end = len(self._sorted_years) if year_to is None else bisect_right(self._sorted_years, year_to)
+        return [self._years[year] for year in self._sorted_years[start:end]]
+
+    def find_year_range(self, year_from: int | None = None, year_to: int | None = None) -> list[int]:
+        """
+        Находит ID книг, изданных в диапазоне годов, за O(log n + k).
+
+        Аргументы:
+            year_from (int | None): Начало диапазона включительно (None - без ограничения).
+            year_to (int | None): Конец диапазона включительно (None - без ограничения).
+
+        Возвращает:
+            list[int]: ID найденных книг, упорядоченные по году, внутри года - по порядку добавления.
+        """
+        return [book_id for ids in self._year_postings(year_from, year_to) for book_id in ids]
+
+    def find(
+            self,
+            title: str | None = None,
+            author: str | None = None,
+            year: int | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+    ) -> list[int] | None:
+        """
+        Находит ID книг, точно (без учёта регистра) совпадающих по всем заданным критериям.
+
+        Пересекает множества кандидатов, начиная с самого маленького, поэтому стоимость поиска определяется
+        самым избирательным критерием. Диапазон годов учитывается как объединение множеств по каждому году.
+
+        Аргументы:
+            title (str | None): Название книги (необязательно).
+            author (str | None): Автор книги (необязательно).
+            year (int | None): Год издания книги (необязательно).
+            year_from (int | None): Начало диапазона годов включительно (необязательно).
+            year_to (int | None): Конец диапазона годов включительно (необязательно).
+
+        Возвращает:
+            list[int] | None: ID найденных книг в порядке добавления или None, если не задан ни один критерий.
+        """
+        candidates = []
+        if title:
+            candidates.append(self._titles.get(normalize(title), {}))
+        if author:
+            candidates.append(self._authors.get(normalize(author), {}))
+        if year:
+            candidates.append(self._years.get(year, {}))
+
+        ranged = year_from is not None or year_to is not None
+        if not ranged:
+            if not candidates:
+                return None
+            candidates.sort(key=len)
+            smallest, others = candidates[0], candidates[1:]
+            return [book_id for book_id in smallest if all(book_id in ids for ids in others)]
+
+        postings = self._year_postings(year_from, year_to)
+        if not candidates or sum(map(len, postings)) <= min(map(len, candidates)):
+            # Диапазон избирательнее остальных критериев: обходим его, порядок добавления восстанавливаем сортировкой
+            found = [book_id for ids in postings for book_id in ids if all(book_id in other for other in candidates)]
+            return sorted(found)
+
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return [
+            book_id for book_id in smallest
+            if all(book_id in ids for ids in others) and any(book_id in ids for ids in postings)
+        ]
+
+    def sorted_ids(
+            self,
+            field: str,
+            descending: bool = False,
+            offset: int = 0,
+            limit: int | None = None,
+    ) -> list[int] | None:
+        """
+        Возвращает страницу ID книг, упорядоченных по названию, автору или году, без сортировки всего каталога.
+
+        Обходятся отсортированные списки различных значений поля и множества ID для каждого значения, поэтому
+        стоимость определяется смещением и размером страницы. Названия и авторы сравниваются в нормализованном виде.
+
+        Аргументы:
+            field (str): "title", "author" или "year".
+            descending (bool): Упорядочить по убыванию (по умолчанию - по возрастанию).
+            offset (int): Количество пропускаемых книг (по умолчанию 0).
+            limit (int | None): Максимальный размер страницы (None - до конца каталога).
+
+        Возвращает:
+            list[int] | None: ID книг страницы (при равных значениях - в порядке добавления, при убывании - в
+                обратном) или None, если поле не индексируется.
+        """
+        if field == "year":
+            index, values = self._years, self._sorted_years
+        elif field in ("title", "author"):
+            index = self._titles if field == "title" else self._authors
+            values = self._sorted_keys.get(field)
+            if values is None:
+                values = self._sorted_keys[field] = sorted(index)
+        else:
+            return None
+        if descending:
+            postings = (reversed(index[value]) for value in reversed(values))
+        else:
+            postings = (index[value] for value in values)
+        stop = offset + limit if limit is not None else None
+        return list(islice(chain.from_iterable(postings), offset, stop))
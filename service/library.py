@@ -1,46 +1,364 @@
+import heapq
 import json
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, TextIO
+
+from service.aggregates import Aggregates
+from service.binary import BinaryStorage, MappedBooks
 from service.book import Book
-from utils.decorators import save_after_action, handle_exceptions
+from service.cache import QueryCache
+from service.catalogue import BookRecord, Catalogue, ColumnarBooks, LazyBooks
+from service.circulation import ISSUE, RETURN, CirculationLog
+from service.index import BookIndex, normalize
+from service.search import TextIndex
+from service.sqlite import SqliteStorage
+from service.storage import JsonStorage, Storage
+from settings.settings import JOURNAL_COMPACT_EVERY, QUERY_CACHE_SIZE
+from utils.decorators import (
+    instrumented, process_locked, read_locked, save_after_action, synchronized, write_locked
+)
+from utils.locks import ReadWriteLock, StripedLock
+from utils.metrics import Metrics
 from utils.validators import validate_title, validate_author, validate_year
 
+# Количество книг в одной операции записи при выводе всего каталога
+DISPLAY_CHUNK_SIZE = 1000
+# Поля, по которым можно упорядочить книги
+SORT_FIELDS = ("title", "author", "year", "count")
+
 
 class Library:
     """
     Класс, представляющий библиотеку.
 
+    Библиотекой можно пользоваться из нескольких потоков (например, с нескольких пунктов выдачи): поиск и просмотр
+    выполняются параллельно, выдача и возврат блокируют только изменяемую книгу, а добавление, удаление и сохранение
+    выполняются в одиночку.
+
     Атрибуты:
-        books (list[Book]): Список всех книг в библиотеке.
+        books (list[Book]): Список всех книг в библиотеке (в порядке добавления).
         storage_file (str): Путь к файлу хранения данных.
+        _books (dict[int, Book] | Catalogue): Индекс книг по идентификатору, хранит порядок добавления.
+        lazy (bool): Создавать объекты Book только при обращении к книге.
+        columnar (bool): Хранить каталог в столбцах ColumnarBooks вместо отдельных объектов Book.
+        _index (BookIndex | SqliteIndex): Индексы для поиска книг по названию, автору и году.
+        _text_index (TextIndex): Инвертированный индекс по словам названий и авторов.
+        _indexed (bool): Построен ли индекс _index (строится при первом поиске или добавлении книги; индекс,
+            предоставленный хранилищем, построен всегда).
+        _text_indexed (bool): Построен ли индекс _text_index (строится при первом полнотекстовом поиске).
+        _storage (Storage): Хранилище каталога.
+        _changes (dict[int, Book | None]): Книги, изменённые с последнего сохранения (None - книга удалена).
+        flush_every (int | None): Сохранять изменения после каждых N действий (None - после каждого действия).
+        flush_interval (float | None): Период фонового сохранения в миллисекундах (None - без фонового сохранения).
+        shared (bool): Файл используется несколькими процессами: изменения выполняются под блокировкой файла
+            после применения изменений других процессов и сразу сохраняются.
+        _unsaved (int): Количество действий, выполненных после последнего сохранения.
+        _batch_depth (int): Глубина вложенности блоков batch.
+        _lock (threading.RLock): Блокировка сохранения: изменения записывает в хранилище один поток за раз.
+        _rwlock (ReadWriteLock): Блокировка каталога: поиск и просмотр выполняются параллельно, добавление,
+            удаление и сохранение - в одиночку.
+        _book_locks (StripedLock): Блокировки книг по ID для изменения количества и статуса под блокировкой чтения.
+        _index_lock (threading.Lock): Блокировка построения поисковых индексов при первом обращении.
         _next_id (int): Уникальный идентификатор для новой книги.
+        circulation (CirculationLog | None): Журнал выдач и возвратов (None - события не записываются).
+        _aggregates (Aggregates): Сводные показатели каталога, обновляемые при каждом изменении.
+        _aggregated (bool): Подсчитаны ли показатели каталога в _aggregates (подсчитываются при первом запросе
+            сводки и далее только обновляются).
+        _query_cache (QueryCache): LRU-кэш результатов find_books; устаревает при любом изменении состава каталога.
+        _metrics (Metrics | None): Сборщик метрик вызовов методов (None - сбор выключен).
+        metrics_interval (float | None): Период записи статистики в миллисекундах (None - без периодической записи).
+        metrics_file (str | None): Файл, в который дописывается статистика (None - стандартный поток ошибок).
 
     Методы:
         __init__: Инициализирует библиотеку и загружает книги из файла.
         add_book: Добавляет книгу в библиотеку или увеличивает её количество, если книга уже существует.
+        add_books: Добавляет несколько книг с одним сохранением.
         remove_book: Удаляет книгу из библиотеки по её идентификатору.
         find_book_by_id: Находит книгу по её идентификатору.
-        find_books: Находит книги по заданным критериям (названию, автору, году).
+        find_books: Находит книги по заданным критериям (названию, автору, году, диапазону годов).
+        find_books_by_year_range: Находит книги, изданные в диапазоне годов.
+        search_books: Ищет книги по фрагментам слов названия и автора с ранжированием.
         update_status: Изменяет статус книги (например, "выдана" или "в наличии").
-        display_books: Выводит список всех книг в библиотеке.
+        list_books: Возвращает страницу книг и общее количество книг.
+        records: Последовательно возвращает записи всех книг.
+        count_books: Возвращает количество книг.
+        sorted_books: Возвращает страницу книг, упорядоченных по названию, автору, году или количеству.
+        top_books: Возвращает первые n книг по заданному полю.
+        most_borrowed: Возвращает книги с наибольшим количеством выдач.
+        summary: Возвращает сводку по библиотеке: книги, экземпляры в наличии и выданные, книги по статусам.
+        count_by_author: Возвращает количество книг автора.
+        count_by_year: Возвращает количество книг года издания.
+        books_per_decade: Возвращает количество книг по десятилетиям.
+        top_authors: Возвращает авторов с наибольшим количеством книг.
+        display_books: Выводит все книги или страницу книг буферизованно.
         load_books: Загружает книги из указанного файла.
-        save_books: Сохраняет текущий список книг в файл.
+        save_books: Сохраняет изменения в файл (целиком или в журнал).
+        compact: Записывает полный снимок каталога и очищает журнал.
+        batch: Откладывает сохранение до выхода из блока with.
+        schedule_save: Сохраняет изменения сразу или откладывает их согласно политике сохранения.
+        flush: Немедленно сохраняет накопленные изменения.
+        close: Останавливает фоновые потоки и сохраняет накопленные изменения.
+        stats: Возвращает снимок статистики: количество и длительность вызовов методов, объём записи.
+        dump_stats: Записывает снимок статистики одной строкой JSON.
+        refresh: Применяет изменения, сохранённые другими процессами.
         _generate_id: Генерирует уникальный идентификатор для новой книги.
         _issue_book: Выдаёт книгу, уменьшая её количество.
         _return_book: Возвращает книгу, увеличивая её количество.
     """
 
-    def __init__(self, storage_file: str = "data/library.json"):
+    def __init__(
+            self,
+            storage_file: str = "data/library.json",
+            journal: bool = False,
+            compact_every: int = JOURNAL_COMPACT_EVERY,
+            backups: int = 0,
+            flush_every: int | None = None,
+            flush_interval: float | None = None,
+            lazy: bool = False,
+            columnar: bool = False,
+            storage_format: str = "json",
+            storage: Storage | None = None,
+            shared: bool = False,
+            metrics: bool = False,
+            metrics_interval: float | None = None,
+            metrics_file: str | None = None,
+            query_cache_size: int = QUERY_CACHE_SIZE,
+            circulation_file: str | None = None,
+    ):
         """
         Инициализирует объект класса Library и загружает книги из файла.
 
         Аргументы:
             storage_file (str): Путь к файлу хранения данных. По умолчанию "data/library.json".
+            journal (bool): Дописывать изменения в журнал вместо перезаписи всего файла (по умолчанию выключено).
+            compact_every (int): Количество записей журнала, после которого он сжимается в новый снимок.
+            backups (int): Количество хранимых резервных копий снимка (по умолчанию 0).
+            flush_every (int | None): Сохранять изменения после каждых N действий (по умолчанию после каждого).
+            flush_interval (float | None): Период фонового сохранения в миллисекундах (по умолчанию выключено).
+            lazy (bool): Создавать объекты Book только при обращении к книге (по умолчанию выключено).
+            columnar (bool): Хранить каталог в столбцах, а книги отдавать как представления BookView
+                (по умолчанию выключено).
+            storage_format (str): Формат файла: "json" (по умолчанию), "binary" - двоичный файл с доступом через
+                mmap, открытие которого не зависит от размера каталога, или "sqlite" - база SQLite, в которой
+                выполняются поиск и изменения каталога.
+            storage (Storage | None): Готовое хранилище; если задано, storage_file и storage_format не используются.
+            shared (bool): Согласовывать изменения с другими процессами, работающими с тем же файлом (по умолчанию
+                выключено). Несовместимо с flush_every и flush_interval.
+            metrics (bool): Собирать количество и длительность вызовов методов (по умолчанию выключено).
+            metrics_interval (float | None): Период записи статистики stats в миллисекундах (по умолчанию
+                выключено). Включает сбор метрик.
+            metrics_file (str | None): Файл, в который дописывается статистика, по строке JSON на запись (по
+                умолчанию - стандартный поток ошибок).
+            query_cache_size (int): Количество запоминаемых результатов find_books (0 - без кэша).
+            circulation_file (str | None): Файл журнала выдач и возвратов (по умолчанию журнал не ведётся).
+
+        Исключения:
+            ValueError: Если shared задан вместе с flush_every или flush_interval.
         """
-        self.books: list[Book] = []
+        if shared and (flush_every is not None or flush_interval is not None):
+            raise ValueError("Совместный доступ к файлу требует сохранения после каждого действия.")
+        self._books: dict[int, Book] | Catalogue = {}
+        self.lazy = lazy
+        self.columnar = columnar
+        self._index = BookIndex()
+        self._text_index = TextIndex()
+        self._indexed = False
+        self._text_indexed = False
+        self._changes: dict[int, Book | None] = {}
         self.storage_file = storage_file
-        self.load_books()
-        self._next_id = self.books[-1].book_id + 1 if len(self.books) > 0 else 1
+        if storage is not None:
+            self._storage = storage
+        elif storage_format == "binary":
+            self._storage = BinaryStorage(storage_file, backups=backups)
+        elif storage_format == "sqlite":
+            self._storage = SqliteStorage(storage_file)
+        else:
+            self._storage = JsonStorage(storage_file, journal=journal, compact_every=compact_every, backups=backups)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.shared = shared
+        self._unsaved = 0
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+        self._rwlock = ReadWriteLock()
+        self._book_locks = StripedLock()
+        self._index_lock = threading.Lock()
+        self._query_cache = QueryCache(query_cache_size)
+        self.circulation = CirculationLog(circulation_file) if circulation_file is not None else None
+        self._aggregates = Aggregates(self.circulation.outstanding() if self.circulation else None)
+        self._aggregated = False
+        self._metrics = Metrics() if metrics or metrics_interval else None
+        self.metrics_interval = metrics_interval
+        self.metrics_file = metrics_file
+        with self._storage.lock() if shared else nullcontext():  # Снимок и журнал не меняются во время загрузки
+            self.load_books()
+        # ID удалённых книг не используются повторно: иначе новая книга унаследует их историю выдач из журнала
+        self._next_id = max(self._max_id(), self.circulation.max_book_id() if self.circulation else 0) + 1
+
+        self._stop_background = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._auto_flush, name="library-flusher", daemon=True)
+            self._flusher.start()
+        self._metrics_dumper: threading.Thread | None = None
+        if metrics_interval:
+            self._metrics_dumper = threading.Thread(target=self._auto_dump_stats, name="library-metrics", daemon=True)
+            self._metrics_dumper.start()
+
+    @property
+    @read_locked
+    def books(self) -> list[Book]:
+        """
+        Возвращает список всех книг в порядке добавления.
+
+        Возвращает:
+            list[Book]: Новый список книг; изменение списка не влияет на библиотеку.
+        """
+        return list(self._books.values())
+
+    @books.setter
+    @write_locked
+    def books(self, books: list[Book]) -> None:
+        """
+        Заменяет содержимое библиотеки и перестраивает индексы.
+
+        Аргументы:
+            books (list[Book]): Новый список книг.
+        """
+        self._set_catalogue(self._make_catalogue(books))
+
+    def _make_catalogue(self, books: Iterable[Book | BookRecord]) -> dict[int, Book] | Catalogue:
+        """
+        Создаёт каталог в представлении, выбранном при создании библиотеки.
+
+        Аргументы:
+            books (Iterable[Book | BookRecord]): Книги или их записи в порядке добавления.
+
+        Возвращает:
+            dict[int, Book] | Catalogue: Новый каталог.
+        """
+        if self.columnar:
+            return ColumnarBooks(books)
+        if self.lazy:
+            return LazyBooks(books)
+        return {book.book_id: book for book in books}
+
+    def _set_catalogue(self, books: dict[int, Book] | Catalogue, index: BookIndex | None = None) -> None:
+        """
+        Заменяет каталог и сбрасывает индексы: они будут построены при первом обращении.
+
+        Аргументы:
+            books (dict[int, Book] | Catalogue): Новый каталог.
+            index (BookIndex | None): Индекс, который хранилище ведёт само (None - построить индекс в памяти).
+        """
+        self._books = books
+        self._query_cache.invalidate()
+        self._aggregates.reset()
+        self._aggregated = False
+        self._index = index if index is not None else BookIndex()
+        self._indexed = index is not None
+        self._text_index.clear()
+        self._text_indexed = False
+
+    def _ensure_indexes(self) -> None:
+        """
+        Строит индекс по названию, автору и году по всему каталогу, если он ещё не построен.
 
+        Может вызываться параллельными читателями: индекс строит только первый из них.
+        """
+        if self._indexed:
+            return
+        with self._index_lock:
+            if self._indexed:
+                return
+            for book in self._records():
+                self._index.add(book)
+            self._indexed = True
+
+    def _ensure_text_index(self) -> None:
+        """
+        Строит полнотекстовый индекс по всему каталогу, если он ещё не построен, и досортировывает его словарь,
+        чтобы параллельные читатели только читали индекс.
+        """
+        with self._index_lock:
+            if not self._text_indexed:
+                for book in self._records():
+                    self._text_index.add(book)
+                self._text_indexed = True
+            self._text_index.sync_vocabulary()
+
+    def _max_id(self) -> int:
+        """
+        Возвращает наибольший ID в каталоге. Двоичный файл и база SQLite отдают его без обхода записей.
+
+        Возвращает:
+            int: Наибольший ID или 0 для пустого каталога.
+        """
+        if isinstance(self._books, Catalogue):
+            return self._books.max_id()
+        return max(self._books, default=0)
+
+    def _records(self) -> Iterable[Book | BookRecord]:
+        """
+        Возвращает все книги каталога в порядке добавления, не создавая объекты Book в ленивом и столбцовом режимах.
+
+        Возвращает:
+            Iterable[Book | BookRecord]: Книги или их компактные записи.
+        """
+        return self._books.records() if isinstance(self._books, Catalogue) else self._books.values()
+
+    def _get_books(self, book_ids: Iterable[int]) -> list[Book]:
+        """
+        Возвращает книги по списку ID. База SQLite отдаёт их одним запросом, а не запросом на каждую книгу.
+
+        Аргументы:
+            book_ids (Iterable[int]): ID книг.
+
+        Возвращает:
+            list[Book]: Книги в порядке ID.
+        """
+        if isinstance(self._books, Catalogue):
+            return self._books.get_many(book_ids)
+        return [self._books[book_id] for book_id in book_ids]
+
+    def _index_book(self, book: Book | BookRecord) -> None:
+        """
+        Добавляет книгу во все уже построенные поисковые индексы.
+
+        Аргументы:
+            book (Book | BookRecord): Книга для индексации.
+        """
+        self._query_cache.invalidate()
+        if self._aggregated:
+            self._aggregates.add(book)
+        if self._indexed:
+            self._index.add(book)
+        if self._text_indexed:
+            self._text_index.add(book)
+
+    def _unindex_book(self, book: Book) -> None:
+        """
+        Удаляет книгу из всех уже построенных поисковых индексов.
+
+        Аргументы:
+            book (Book): Удаляемая книга.
+        """
+        self._query_cache.invalidate()
+        if self._aggregated:
+            self._aggregates.remove(book)
+        if self._indexed:
+            self._index.remove(book)
+        if self._text_indexed:
+            self._text_index.remove(book)
+
+    @instrumented
+    @process_locked
     @save_after_action
+    @write_locked
     def add_book(self, title: str, author: str, year: int, validated: int = 0) -> Book:
         """
         Добавляет книгу в библиотеку или увеличивает её количество, если книга уже существует.
@@ -53,17 +371,64 @@ class Library:
         Возвращает:
             Book: Добавленная или обновлённая книга.
         """
-        book_exists = self.find_books(title, author, year)
-        if not book_exists:
+        self._ensure_indexes()
+        return self._add(title, author, year)[0]
+
+    @instrumented
+    @process_locked
+    @save_after_action
+    @write_locked
+    def add_books(self, books: Iterable[tuple[str, str, int]]) -> tuple[int, int]:
+        """
+        Добавляет несколько книг под одной блокировкой и с одним сохранением.
+
+        Дубликаты (включая повторы внутри books) находятся по индексу названия, автора и года и увеличивают
+        количество существующей книги, как в add_book. Данные должны быть уже проверены валидаторами.
+
+        Аргументы:
+            books (Iterable[tuple[str, str, int]]): Названия, авторы и годы издания.
+
+        Возвращает:
+            tuple[int, int]: Количество новых книг и количество добавленных экземпляров существующих.
+        """
+        self._ensure_indexes()
+        added = merged = 0
+        for title, author, year in books:
+            if self._add(title, author, year)[1]:
+                added += 1
+            else:
+                merged += 1
+        return added, merged
+
+    def _add(self, title: str, author: str, year: int) -> tuple[Book, bool]:
+        """
+        Добавляет книгу или экземпляр существующей книги. Вызывается под блокировкой записи с построенным индексом.
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+
+        Возвращает:
+            tuple[Book, bool]: Книга и True, если она новая.
+        """
+        book_id = self._index.find_key(title, author, year)
+        created = book_id is None
+        if created:
             new_id: int = self._generate_id()
-            book = Book(book_id=new_id, title=title, author=author, year=year)
-            self.books.append(book)
+            self._books[new_id] = Book(book_id=new_id, title=title, author=author, year=year)
+            book = self._books[new_id]
+            self._index_book(book)
         else:
-            book = book_exists[0]
+            book = self._books[book_id]
             self._return_book(book)
-        return book
+        self._changes[book.book_id] = book
+        return book, created
 
+    @instrumented
+    @process_locked
     @save_after_action
+    @write_locked
     def remove_book(self, book_id: int) -> bool:
         """
         Удаляет книгу из библиотеки по её идентификатору.
@@ -74,12 +439,16 @@ class Library:
         Возвращает:
             bool: True, если книга была удалена, иначе False.
         """
-        book = self.find_book_by_id(book_id)
-        if book:
-            self.books.remove(book)
-            return True
-        return False
+        book = self._books.pop(book_id, None)
+        if book is None:
+            return False
+        self._unindex_book(book)
+        self._aggregates.forget(book_id)
+        self._changes[book_id] = None
+        return True
 
+    @instrumented
+    @read_locked
     def find_book_by_id(self, book_id: int) -> Book | None:
         """
         Находит книгу по её идентификатору.
@@ -90,38 +459,104 @@ class Library:
         Возвращает:
             Book | None: Найденная книга или None, если книга не найдена.
         """
-        for book in self.books:
-            if book.book_id == book_id:
-                return book
-        return None
+        return self._books.get(book_id)
 
-    def find_books(self, title: str | None = None, author: str | None = None, year: int | None = None) -> list[Book]:
+    @instrumented
+    @read_locked
+    def find_books(
+            self,
+            title: str | None = None,
+            author: str | None = None,
+            year: int | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+    ) -> list[Book]:
         """
-        Ищет книги по заданным критериям (названию, автору или году).
+        Ищет книги по заданным критериям (названию, автору, году или диапазону годов).
 
         Аргументы:
             title (str | None): Название книги (необязательно).
             author (str | None): Автор книги (необязательно).
             year (int | None): Год издания книги (необязательно).
+            year_from (int | None): Начало диапазона годов включительно (необязательно).
+            year_to (int | None): Конец диапазона годов включительно (необязательно).
+
+        Результаты запросов с критериями запоминаются в LRU-кэше по нормализованным критериям и используются, пока
+        состав каталога не изменится.
 
         Возвращает:
-            list[Book]: Список найденных книг.
+            list[Book]: Список найденных книг в порядке добавления.
         """
+        self._ensure_indexes()
+        key = (
+            normalize(title) if title else None,
+            normalize(author) if author else None,
+            year or None,
+            year_from,
+            year_to,
+        )
+        book_ids = self._query_cache.get(key)
+        if book_ids is None:
+            ranged = year_from is not None or year_to is not None
+            if title and author and year and not ranged:
+                book_id = self._index.find_key(title, author, year)
+                book_ids = (book_id,) if book_id is not None else ()
+            else:
+                found = self._index.find(title, author, year, year_from, year_to)
+                if found is None:
+                    return list(self._books.values())
+                book_ids = tuple(found)
+            self._query_cache.put(key, book_ids)
+        return self._get_books(book_ids)
 
-        def matches_criteria(book):
-            return (
-                    (not title or (title.lower() in book.title.lower() and len(title) == len(book.title))) and
-                    (not author or (author.lower() in book.author.lower() and len(author) == len(book.author))) and
-                    (not year or book.year == year)
-            )
+    @instrumented
+    @read_locked
+    def find_books_by_year_range(self, year_from: int | None = None, year_to: int | None = None) -> list[Book]:
+        """
+        Находит книги, изданные в диапазоне годов, по отсортированному индексу годов.
+
+        Аргументы:
+            year_from (int | None): Начало диапазона включительно (None - без ограничения).
+            year_to (int | None): Конец диапазона включительно (None - без ограничения).
+
+        Возвращает:
+            list[Book]: Список найденных книг, упорядоченный по году издания.
+        """
+        self._ensure_indexes()
+        return self._get_books(self._index.find_year_range(year_from, year_to))
+
+    @instrumented
+    @read_locked
+    def search_books(self, query: str, limit: int | None = None) -> list[Book]:
+        """
+        Ищет книги по фрагментам слов названия и автора (например, "кнут искусств").
 
-        return [book for book in self.books if matches_criteria(book)]
+        Регистр не учитывается, "ё" приравнивается к "е". Каждое слово запроса должно быть началом какого-либо слова
+        в названии или имени автора.
 
+        Аргументы:
+            query (str): Поисковый запрос.
+            limit (int | None): Максимальное количество результатов (None - без ограничения).
+
+        Возвращает:
+            list[Book]: Список найденных книг по убыванию релевантности.
+        """
+        self._ensure_text_index()
+        return self._get_books(self._text_index.search(query, limit))
+
+    @instrumented
+    @process_locked
     @save_after_action
+    @read_locked
     def update_status(self, book_id: int, status: str) -> bool:
         """
         Изменяет статус книги ("выдана" или "в наличии").
 
+        Выполняется под блокировкой чтения каталога и блокировкой самой книги, поэтому выдача и возврат разных книг
+        идут параллельно, а проверка и изменение количества одной книги не разрываются другими потоками.
+        Успешная выдача или возврат учитывается в сводке summary и записывается в журнал circulation, если он
+        ведётся.
+
         Аргументы:
             book_id (int): Уникальный идентификатор книги.
             status (str): Новый статус книги.
@@ -129,17 +564,50 @@ class Library:
         Возвращает:
             bool: True, если статус был успешно обновлён, иначе False.
         """
-        book = self.find_book_by_id(book_id)
+        book = self._books.get(book_id)
         actions = {
             "выдана": lambda: book.count > 0 and self._issue_book(book),
             "в наличии": lambda: self._return_book(book),
         }
-        return actions.get(status, lambda: False)()
+        with self._book_locks.for_key(book_id):
+            updated = actions.get(status, lambda: False)()
+            if updated:
+                self._changes[book_id] = book
+                if status == "выдана":
+                    self._aggregates.issue(book_id)
+                else:
+                    self._aggregates.give_back(book_id)
+                if self.circulation is not None:
+                    self.circulation.record(book_id, ISSUE if status == "выдана" else RETURN)
+        return updated
+
+    @read_locked
+    def most_borrowed(self, n: int, since: float | None = None) -> list[tuple[Book, int]]:
+        """
+        Возвращает книги с наибольшим количеством выдач по журналу circulation.
+
+        Аргументы:
+            n (int): Количество книг.
+            since (float | None): Учитывать выдачи начиная с этого времени в секундах с начала эпохи (None - за всё
+                время).
+
+        Возвращает:
+            list[tuple[Book, int]]: Книга и количество выдач по убыванию количества. Удалённые из каталога книги
+                пропускаются, поэтому книг может быть меньше n.
+
+        Исключения:
+            ValueError: Если журнал выдач не ведётся.
+        """
+        if self.circulation is None:
+            raise ValueError("Журнал выдач не ведётся.")
+        return [
+            (self._books[book_id], issues) for book_id, issues in self.circulation.most_borrowed(n, since)
+            if book_id in self._books
+        ]
 
-    @staticmethod
-    def _issue_book(book: Book) -> bool:
+    def _issue_book(self, book: Book) -> bool:
         """
-        Выдаёт книгу, уменьшая её количество.
+        Выдаёт книгу, уменьшая её количество, и обновляет сводные показатели.
 
         Аргументы:
             book (Book): Книга для выдачи.
@@ -147,15 +615,17 @@ class Library:
         Возвращает:
             bool: True, если книга была успешно выдана.
         """
+        status = book.status
         book.count -= 1
         if book.count == 0:
             book.status = "выдана"
+        if self._aggregated:
+            self._aggregates.change(status, book.status, -1)
         return True
 
-    @staticmethod
-    def _return_book(book: Book) -> bool:
+    def _return_book(self, book: Book) -> bool:
         """
-        Возвращает книгу, увеличивая её количество.
+        Возвращает книгу, увеличивая её количество, и обновляет сводные показатели.
 
         Аргументы:
             book (Book): Книга для возврата.
@@ -163,40 +633,483 @@ class Library:
         Возвращает:
             bool: True, если книга была успешно возвращена.
         """
+        status = book.status
         book.count += 1
         book.status = "в наличии"
+        if self._aggregated:
+            self._aggregates.change(status, book.status, 1)
         return True
 
-    def display_books(self) -> bool:
+    def _ensure_aggregates(self) -> None:
+        """
+        Подсчитывает сводные показатели по всему каталогу, если они ещё не подсчитаны. Подсчёт выполняется под
+        блокировкой записи, чтобы параллельные выдачи не изменили количество во время обхода.
+        """
+        if self._aggregated:
+            return
+        with self._rwlock.write():
+            if not self._aggregated:
+                self._aggregates.reset()  # Выдачи до подсчёта учитываются при добавлении книг
+                self._aggregates.retain(self._books)
+                for book in self._records():
+                    self._aggregates.add(book)
+                self._aggregated = True
+
+    def summary(self) -> dict:
+        """
+        Возвращает сводку по библиотеке без обхода книг (после первого запроса сводки).
+
+        Возвращает:
+            dict: Количество книг ("books"), экземпляров в наличии ("available"), выданных экземпляров книг
+                каталога ("issued"; восстанавливается по журналу выдач, если он ведётся, иначе считается с запуска;
+                экземпляры удалённых книг не учитываются), всех экземпляров
+                ("copies"), книг по статусам ("statuses") и количество авторов ("authors").
+        """
+        self._ensure_aggregates()
+        return self._aggregates.summary()
+
+    def count_by_author(self, author: str) -> int:
+        """
+        Возвращает количество книг автора за O(1).
+
+        Аргументы:
+            author (str): Автор в том виде, в котором он записан в каталоге.
+
+        Возвращает:
+            int: Количество книг.
+        """
+        self._ensure_aggregates()
+        return self._aggregates.authors.get(author, 0)
+
+    def count_by_year(self, year: int) -> int:
         """
-        Выводит список всех книг в библиотеке.
+        Возвращает количество книг, изданных в году, за O(1).
+
+        Аргументы:
+            year (int): Год издания.
+
+        Возвращает:
+            int: Количество книг.
+        """
+        self._ensure_aggregates()
+        return self._aggregates.years.get(year, 0)
+
+    def books_per_decade(self) -> dict[int, int]:
+        """
+        Возвращает количество книг по десятилетиям, обходя только различные годы издания.
+
+        Возвращает:
+            dict[int, int]: Первый год десятилетия -> количество книг, по возрастанию десятилетия.
+        """
+        self._ensure_aggregates()
+        return self._aggregates.decades()
+
+    def top_authors(self, n: int) -> list[tuple[str, int]]:
+        """
+        Возвращает авторов с наибольшим количеством книг.
+
+        Аргументы:
+            n (int): Количество авторов.
+
+        Возвращает:
+            list[tuple[str, int]]: Автор и количество книг по убыванию количества (при равенстве - по имени).
+        """
+        self._ensure_aggregates()
+        return self._aggregates.top_authors(n)
+
+    def records(self) -> Iterator[dict]:
+        """
+        Последовательно возвращает записи всех книг в формате Book.to_dict в порядке добавления.
+
+        Полный список в памяти не строится. До исчерпания итератора удерживается блокировка чтения, поэтому
+        изменять библиотеку во время обхода нельзя.
+
+        Возвращает:
+            Iterator[dict]: Записи книг.
+        """
+        with self._rwlock.read():
+            for book in self._records():
+                yield book.to_dict()
+
+    @instrumented
+    @read_locked
+    def list_books(self, offset: int = 0, limit: int | None = None) -> tuple[list[Book], int]:
+        """
+        Возвращает страницу книг в порядке добавления и общее количество книг.
+
+        Аргументы:
+            offset (int): Количество пропускаемых книг (по умолчанию 0).
+            limit (int | None): Максимальный размер страницы (None - до конца каталога).
+
+        Возвращает:
+            tuple[list[Book], int]: Книги страницы и общее количество книг в библиотеке.
+        """
+        stop = offset + limit if limit is not None else None
+        return self._get_books(islice(self._books, offset, stop)), len(self._books)
+
+    @instrumented
+    @read_locked
+    def sorted_books(
+            self,
+            field: str = "title",
+            descending: bool = False,
+            offset: int = 0,
+            limit: int | None = None,
+    ) -> tuple[list[Book], int]:
+        """
+        Возвращает страницу книг, упорядоченных по названию, автору, году или количеству, и общее количество книг.
+
+        Порядок по названию, автору и году берётся из поддерживаемых отсортированных индексов. Количество
+        экземпляров меняется при каждой выдаче и возврате, поэтому индекса по нему нет: первые offset + limit книг
+        выбираются кучей (heapq) за O(n log k), весь каталог сортируется только при limit = None.
+
+        Аргументы:
+            field (str): Поле сортировки из SORT_FIELDS (по умолчанию "title").
+            descending (bool): Упорядочить по убыванию (по умолчанию - по возрастанию).
+            offset (int): Количество пропускаемых книг (по умолчанию 0).
+            limit (int | None): Максимальный размер страницы (None - до конца каталога).
+
+        Возвращает:
+            tuple[list[Book], int]: Книги страницы (при равных значениях - в порядке добавления, при убывании -
+                в обратном) и общее количество книг в библиотеке.
+
+        Исключения:
+            ValueError: Если поле сортировки не поддерживается.
+        """
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Неизвестное поле сортировки: {field}. Допустимые значения: {', '.join(SORT_FIELDS)}.")
+        self._ensure_indexes()
+        with self._index_lock:  # Отсортированный список значений поля строится при первом обращении
+            book_ids = self._index.sorted_ids(field, descending, offset, limit)
+        if book_ids is None:
+            key = attrgetter(field, "book_id")
+            if limit is None:
+                chosen = sorted(self._records(), key=key, reverse=descending)[offset:]
+            else:
+                select = heapq.nlargest if descending else heapq.nsmallest
+                chosen = select(offset + limit, self._records(), key=key)[offset:]
+            book_ids = [book.book_id for book in chosen]
+        return self._get_books(book_ids), len(self._books)
+
+    def top_books(self, n: int, field: str = "count", descending: bool = True) -> list[Book]:
+        """
+        Возвращает первые n книг по заданному полю, например самые новые (field="year") или книги с наибольшим
+        количеством экземпляров (по умолчанию).
+
+        Аргументы:
+            n (int): Количество книг.
+            field (str): Поле сортировки из SORT_FIELDS (по умолчанию "count").
+            descending (bool): Брать наибольшие значения (по умолчанию) или наименьшие.
+
+        Возвращает:
+            list[Book]: Не более n книг.
+
+        Исключения:
+            ValueError: Если поле сортировки не поддерживается.
+        """
+        return self.sorted_books(field, descending, 0, n)[0]
+
+    @read_locked
+    def count_books(self) -> int:
+        """
+        Возвращает количество книг (записей каталога) в библиотеке.
+
+        Возвращает:
+            int: Количество книг.
+        """
+        return len(self._books)
+
+    @read_locked
+    def display_books(self, offset: int = 0, limit: int | None = None, file: TextIO | None = None) -> bool:
+        """
+        Выводит книги библиотеки: все или страницу из limit книг, начиная с offset.
+
+        Строки книг собираются в буфер и выводятся одним вызовом write на страницу (при выводе всего каталога - на
+        каждые DISPLAY_CHUNK_SIZE книг), а не отдельным print на каждую книгу.
+
+        Аргументы:
+            offset (int): Количество пропускаемых книг (по умолчанию 0).
+            limit (int | None): Размер страницы (None - до конца каталога).
+            file (TextIO | None): Куда выводить (по умолчанию sys.stdout).
+
+        Возвращает:
+            bool: True, если выведена хотя бы одна книга.
         """
-        if not self.books:
-            print("Библиотека пуста.")
+        file = file if file is not None else sys.stdout
+        if not self._books:
+            file.write("Библиотека пуста.\n")
             return False
-        for book in self.books:
-            print(book)
-        return True
+        book_ids = islice(self._books, offset, offset + limit if limit is not None else None)
+        shown = False
+        while chunk := self._get_books(islice(book_ids, limit or DISPLAY_CHUNK_SIZE)):
+            file.write("\n".join(map(str, chunk)) + "\n")
+            shown = True
+        return shown
 
-    @handle_exceptions
+    @instrumented
+    @write_locked
     def load_books(self) -> None:
         """
-        Загружает книги из указанного файла.
+        Загружает книги из указанного файла и применяет журнал изменений, если он есть.
+
+        Двоичный файл только отображается в память, база SQLite сама служит каталогом и индексом. JSON-файл
+        разбирается потоково: в ленивом режиме вместо объектов Book хранятся компактные записи, в столбцовом -
+        параллельные массивы.
+        Если файла ещё нет, библиотека начинает работу с пустым каталогом.
 
         Исключения:
-            FileNotFoundError: Если файл не существует.
-            JSONDecodeError: Если файл содержит некорректные данные.
+            FileNotFoundError: Если файл не найден, но остались его резервные копии.
+            ValueError: Если файл или журнал содержат некорректные данные.
         """
-        with open(self.storage_file, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            self.books = [Book.from_dict(book) for book in data]
+        self._changes.clear()
+        catalogue = self._storage.catalogue()
+        if catalogue is not None:
+            self._set_catalogue(catalogue, self._storage.index())
+            return
+        from_dict = BookRecord.from_dict if self.lazy or self.columnar else Book.from_dict
+        self._set_catalogue(self._make_catalogue(map(from_dict, self._storage.load())))
 
+    @instrumented
+    @write_locked
     def save_books(self) -> None:
         """
-        Сохраняет текущий список книг в файл.
+        Сохраняет изменения в файл.
+
+        В режиме журнала дописывает в него только изменённые книги и при необходимости сжимает журнал, иначе
+        перезаписывает файл целиком. Выполняется под блокировкой записи, поэтому в файл попадает согласованное
+        состояние каталога.
+        """
+        self._unsaved = 0
+        if not self._storage.journal:
+            self.compact()
+            return
+        self._storage.append(self._pending_changes())
+        self._changes.clear()
+        if self._storage.needs_compaction():
+            self.compact()
+
+    @instrumented
+    @write_locked
+    def compact(self) -> None:
+        """
+        Записывает полный снимок каталога и очищает журнал изменений.
+
+        Двоичный файл после перезаписи заново отображается в память, уже созданные объекты книг сохраняются.
+        База SQLite уже содержит весь каталог и не перезаписывается из записей: в неё записываются несохранённые
+        изменения количества и статуса, после чего журнал WAL переносится в основной файл.
+        """
+        if isinstance(self._storage, SqliteStorage):
+            if self._changes:
+                self._storage.append(self._pending_changes())
+            self._storage.checkpoint()
+        else:
+            self._storage.save(book.to_dict() for book in self._records())
+        self._changes.clear()
+        if isinstance(self._books, MappedBooks):
+            previous = self._books
+            self._books = self._storage.open(cache=previous.cache)
+            previous.close()
+
+    def _pending_changes(self) -> dict[int, dict | None]:
+        """
+        Возвращает несохранённые изменения в формате Storage.append.
+
+        Возвращает:
+            dict[int, dict | None]: ID книги -> запись книги или None, если книга удалена.
+        """
+        return {book_id: book.to_dict() if book is not None else None for book_id, book in self._changes.items()}
+
+    @contextmanager
+    def batch(self) -> Iterator["Library"]:
+        """
+        Откладывает сохранение изменений до выхода из блока with, после чего сохраняет их один раз.
+
+        Блоки могут быть вложенными: сохранение выполняется при выходе из внешнего блока. При совместном доступе
+        (shared) файл остаётся заблокированным для других процессов до конца блока.
+
+        Пример:
+            with library.batch():
+                for title, author, year in rows:
+                    library.add_book(title, author, year)
+
+        Возвращает:
+            Iterator[Library]: Сама библиотека.
+        """
+        with self._process_lock():
+            with self._lock:
+                self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                with self._lock:
+                    self._batch_depth -= 1
+                    if not self._batch_depth:
+                        self.flush()
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        """
+        При совместном доступе (shared) блокирует файл от других процессов и применяет их изменения.
+
+        Возвращает:
+            Iterator[None]: Контекстный менеджер; без shared ничего не делает.
+        """
+        if not self.shared:
+            yield
+            return
+        with self._lock, self._storage.lock():
+            self._apply_external_changes()
+            yield
+
+    @instrumented
+    def refresh(self) -> None:
+        """
+        Применяет изменения, сохранённые другими процессами: дочитывает журнал или, если снимок перезаписан,
+        загружает каталог заново. Если изменений нет, стоит двух вызовов stat.
+
+        Исключения:
+            ValueError: Если файл или журнал содержат некорректные данные.
+        """
+        with self._lock, self._storage.lock():
+            self._apply_external_changes()
+
+    def _apply_external_changes(self) -> None:
+        """
+        Применяет к каталогу и индексам изменения, прочитанные из хранилища, затем дочитывает журнал выдач, который
+        ведут другие процессы. Вызывается под блокировкой хранилища.
+        """
+        self._apply_catalogue_changes()
+        if self.circulation is None:
+            return
+        for event in self.circulation.refresh():
+            self._next_id = max(self._next_id, event.book_id + 1)
+            if event.book_id not in self._books:
+                continue  # Книга уже удалена: её выданные экземпляры не учитываются
+            if event.kind == ISSUE:
+                self._aggregates.issue(event.book_id)
+            else:
+                self._aggregates.give_back(event.book_id)
+
+    def _apply_catalogue_changes(self) -> None:
+        """
+        Применяет к каталогу и индексам изменения, прочитанные из хранилища.
+        """
+        changes = self._storage.read_changes()
+        if changes is None:
+            self.load_books()
+            self._next_id = max(self._next_id, self._max_id() + 1)
+            return
+        if not changes:
+            return
+        with self._rwlock.write():
+            from_dict = BookRecord.from_dict if self.lazy or self.columnar else Book.from_dict
+            for book_id, record in changes.items():
+                book = self._books.get(book_id)
+                if book is not None:
+                    self._unindex_book(book)
+                if record is None:
+                    if book is not None:
+                        del self._books[book_id]
+                        self._aggregates.forget(book_id)
+                    continue
+                if book is None or self.columnar:
+                    # Строка столбцового каталога заменяется на месте: представления BookView видят новые значения
+                    self._books[book_id] = from_dict(record)
+                else:
+                    # Объект книги сохраняется: на него могут ссылаться другие потоки этого процесса
+                    for field in ("title", "author", "year", "status", "count"):
+                        setattr(book, field, record[field])
+                    self._books[book_id] = book
+                self._index_book(self._books[book_id])
+                self._next_id = max(self._next_id, book_id + 1)
+
+    @synchronized
+    def schedule_save(self) -> None:
+        """
+        Учитывает выполненное действие и сохраняет изменения, если этого требует политика сохранения.
+
+        Внутри блока batch сохранение откладывается до выхода из блока. Без flush_every и flush_interval
+        изменения сохраняются после каждого действия, с flush_every - после каждых N действий, с одним только
+        flush_interval - фоновым потоком.
+        """
+        self._unsaved += 1
+        if self._batch_depth:
+            return
+        if self.flush_every is not None:
+            if self._unsaved >= self.flush_every:
+                self.flush()
+        elif self.flush_interval is None:
+            self.flush()
+
+    @synchronized
+    def flush(self) -> None:
+        """
+        Немедленно сохраняет накопленные изменения, если они есть.
+        """
+        if self._unsaved:
+            self.save_books()
+
+    def _auto_flush(self) -> None:
+        """
+        Цикл фонового потока: раз в flush_interval миллисекунд сохраняет изменения вне блоков batch.
+        """
+        while not self._stop_background.wait(self.flush_interval / 1000):
+            with self._lock:
+                if not self._batch_depth:
+                    self.flush()
+
+    def stats(self) -> dict:
+        """
+        Возвращает снимок статистики библиотеки.
+
+        Возвращает:
+            dict: Включён ли сбор метрик ("enabled"), количество книг ("books"), количество байтов, записанных
+                хранилищем ("bytes_written"), счётчики кэша find_books ("query_cache") и для каждого
+                инструментированного метода ("methods") количество вызовов, суммарное время, процентили p50, p95,
+                p99 и наибольшая длительность в миллисекундах.
+        """
+        return {
+            "enabled": self._metrics is not None,
+            "books": len(self._books),
+            "bytes_written": self._storage.bytes_written,
+            "methods": self._metrics.snapshot() if self._metrics is not None else {},
+            "query_cache": self._query_cache.stats(),
+        }
+
+    def dump_stats(self) -> None:
+        """
+        Дописывает снимок статистики одной строкой JSON в metrics_file или в стандартный поток ошибок.
+        """
+        line = json.dumps(self.stats(), ensure_ascii=False) + "\n"
+        if self.metrics_file is None:
+            sys.stderr.write(line)
+            return
+        with open(self.metrics_file, "a", encoding="utf-8") as file:
+            file.write(line)
+
+    def _auto_dump_stats(self) -> None:
+        """
+        Цикл фонового потока: раз в metrics_interval миллисекунд записывает статистику.
+        """
+        while not self._stop_background.wait(self.metrics_interval / 1000):
+            self.dump_stats()
+
+    def close(self) -> None:
+        """
+        Останавливает фоновые потоки, сохраняет накопленные изменения и закрывает хранилище.
         """
-        with open(self.storage_file, "w", encoding="utf-8") as file:
-            json.dump([book.to_dict() for book in self.books], file, ensure_ascii=False, indent=4)
+        self._stop_background.set()
+        for thread in (self._flusher, self._metrics_dumper):
+            if thread is not None:
+                thread.join()
+        self._flusher = self._metrics_dumper = None
+        self.flush()
+        with self._rwlock.write():
+            if isinstance(self._books, MappedBooks):
+                self._books.close()
+            self._storage.close()
+            if self.circulation is not None:
+                self.circulation.close()
 
     def _generate_id(self) -> int:
         """
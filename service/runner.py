@@ -1,7 +1,27 @@
-from service.library import Library
-from settings.settings import APP_NAME, STATUSES
+import time
+from typing import Callable
+
+from service.book import Book
+from service.circulation import ISSUE, RETURN
+from service.library import SORT_FIELDS, Library
+from settings.settings import (
+    APP_NAME, CIRCULATION_FILE, CIRCULATION_REPORT_DAYS, COLLECT_METRICS, METRICS_FILE, METRICS_INTERVAL, PAGE_SIZE,
+    SEARCH_LIMIT, SHARED_STORAGE, SNAPSHOT_BACKUPS, STATUSES, USE_JOURNAL
+)
 from utils.decorators import handle_exceptions
-from utils.validators import validate_input, validate_title, validate_author, validate_year, validate_id
+from utils.validators import (
+    validate_input, validate_title, validate_author, validate_year, validate_year_range, validate_id
+)
+
+# Подписи полей сортировки в меню
+SORT_FIELD_LABELS = {
+    "title": "по названию",
+    "author": "по автору",
+    "year": "по году издания",
+    "count": "по количеству экземпляров",
+}
+# Количество авторов в сводке по библиотеке
+SUMMARY_TOP_AUTHORS = 5
 
 
 class Runner:
@@ -10,20 +30,33 @@ class Runner:
 
     Методы:
         __init__: Инициализирует объект класса.
-        _display_menu: Выводит меню команд для взасновной цикл приложения.
+        _display_menu: Выводит меню команд для взаимодействия с пользователем.
+        _display_name: Выводит название приложения при запуске.
+        run: Запускает основной цикл приложения.
         add_book_interactive: Интерактивное добавление новой книги в библиотеку.
         remove_book_interactive: Удаляет книгу по идентификатору.
-        find_books_intимодействия с пользователем.
-        _display_name: Выводит название приложения при запуске.
-        run: Запускает оeractive: Осуществляет поиск книг по заданным критериям.
-        display_books_interactive: Отображает все книги, доступные в библиотеке.
+        find_books_interactive: Осуществляет поиск книг по заданным критериям.
+        search_books_interactive: Осуществляет поиск книг по фрагментам слов названия и автора.
+        display_books_interactive: Постранично отображает все книги, доступные в библиотеке.
+        sorted_books_interactive: Постранично отображает книги, упорядоченные по выбранному полю.
+        top_books_interactive: Отображает первые N книг по выбранному полю.
+        circulation_report_interactive: Отображает количество выдач и самые востребованные книги за период.
+        summary_interactive: Отображает сводку по библиотеке.
         update_status_interactive: Изменяет статус книги.
         exit_interactive: Завершает выполнение приложения.
     """
 
     def __init__(self):
         """Инициализирует объект класса Runner и создает экземпляр библиотеки."""
-        self.library = Library()
+        self.library = Library(
+            journal=USE_JOURNAL,
+            backups=SNAPSHOT_BACKUPS,
+            shared=SHARED_STORAGE,
+            metrics=COLLECT_METRICS,
+            metrics_interval=METRICS_INTERVAL,
+            metrics_file=METRICS_FILE,
+            circulation_file=CIRCULATION_FILE,
+        )
 
     @staticmethod
     def _display_menu() -> None:
@@ -37,6 +70,11 @@ class Runner:
         print("4. Показать все книги")
         print("5. Изменить статус книги")
         print("6. Выйти")
+        print("7. Найти книгу по фрагменту названия или автора")
+        print("8. Показать книги по порядку (название, автор, год, количество)")
+        print("9. Показать первые N книг (например, самые новые)")
+        print(f"10. Отчёт о выдачах за {CIRCULATION_REPORT_DAYS} дней")
+        print("11. Сводка по библиотеке")
 
     @staticmethod
     def _display_name() -> None:
@@ -56,6 +94,8 @@ class Runner:
         while True:
             self._display_menu()
             choice = input("Введите номер команды: ").strip()
+            if self.library.shared:
+                self.library.refresh()  # Показывает изменения, сделанные в других запущенных приложениях
             if choice == "1":
                 self.add_book_interactive()
             elif choice == "2":
@@ -68,6 +108,16 @@ class Runner:
                 self.update_status_interactive()
             elif choice == "6":
                 self.exit_interactive()
+            elif choice == "7":
+                self.search_books_interactive()
+            elif choice == "8":
+                self.sorted_books_interactive()
+            elif choice == "9":
+                self.top_books_interactive()
+            elif choice == "10":
+                self.circulation_report_interactive()
+            elif choice == "11":
+                self.summary_interactive()
             else:
                 print("Неверный выбор. Попробуйте снова.")
 
@@ -96,12 +146,13 @@ class Runner:
 
     def find_books_interactive(self) -> None:
         """
-        Интерактивный поиск книг по названию, автору или году издания.
+        Интерактивный поиск книг по названию, автору, году издания или диапазону годов.
         """
         criteria = {
             "1": ("названию книги", "title"),
             "2": ("автору книги", "author"),
             "3": ("году издания", "year"),
+            "4": ("диапазону годов (например, 1950-1970)", "years"),
         }
 
         print("\nВыберите критерии поиска (можно несколько через пробел):")
@@ -118,11 +169,15 @@ class Runner:
             selected["author"] = validate_author(selected["author"])
         if "year" in selected:
             selected["year"] = validate_year(selected["year"])
+        if "years" in selected:
+            selected["year_from"], selected["year_to"] = validate_year_range(selected.pop("years"))
 
         books = self.library.find_books(
             title=selected.get("title"),
             author=selected.get("author"),
             year=selected.get("year"),
+            year_from=selected.get("year_from"),
+            year_to=selected.get("year_to"),
         )
 
         if books:
@@ -135,12 +190,154 @@ class Runner:
         else:
             print("Книги не найдены.")
 
+    def search_books_interactive(self) -> None:
+        """
+        Интерактивный полнотекстовый поиск книг по фрагментам слов названия и автора.
+        """
+        query = input("Введите слова или их начала (например, кнут искусство): ").strip()
+        books = self.library.search_books(query, limit=SEARCH_LIMIT)
+
+        if books:
+            print("\nНайденные книги:")
+            for book in books:
+                print(book)
+        else:
+            print("Книги не найдены.")
+
     def display_books_interactive(self) -> None:
         """
-        Отображает список всех книг в библиотеке.
+        Постранично отображает список всех книг в библиотеке.
+        """
+        self._page_through(
+            "Список всех книг",
+            self.library.count_books(),
+            lambda offset: self.library.display_books(offset=offset, limit=PAGE_SIZE),
+        )
+
+    def sorted_books_interactive(self) -> None:
+        """
+        Постранично отображает книги, упорядоченные по выбранному полю.
+        """
+        field = self._choose_sort_field()
+        if field is None:
+            return
+        descending = input("Порядок: 1 - по возрастанию, 2 - по убыванию: ").strip() == "2"
+        self._page_through(
+            f"Книги, упорядоченные {SORT_FIELD_LABELS[field]}",
+            self.library.count_books(),
+            lambda offset: self._print_books(self.library.sorted_books(field, descending, offset, PAGE_SIZE)[0]),
+        )
+
+    def top_books_interactive(self) -> None:
+        """
+        Отображает первые N книг с наибольшими значениями выбранного поля (например, самые новые).
+        """
+        field = self._choose_sort_field()
+        if field is None:
+            return
+        n = validate_input("Сколько книг показать: ", validate_id, "Количество должно быть числом.")
+        if n < 1:
+            print("Количество должно быть больше нуля.")
+            return
+        books = self.library.top_books(n, field)
+        if books:
+            print(f"\nПервые {len(books)} книг с наибольшими значениями поля ({SORT_FIELD_LABELS[field]}):")
+            self._print_books(books)
+        else:
+            print("Библиотека пуста.")
+
+    def circulation_report_interactive(self) -> None:
+        """
+        Отображает количество выдач и возвратов и самые востребованные книги за последние CIRCULATION_REPORT_DAYS
+        дней.
+        """
+        if self.library.circulation is None:
+            print("Журнал выдач не ведётся.")
+            return
+        since = time.time() - CIRCULATION_REPORT_DAYS * 24 * 60 * 60
+        issues = self.library.circulation.count(ISSUE, since)
+        returns = self.library.circulation.count(RETURN, since)
+        print(f"\nЗа последние {CIRCULATION_REPORT_DAYS} дней: выдач - {issues}, возвратов - {returns}.")
+        books = self.library.most_borrowed(PAGE_SIZE, since)
+        if books:
+            print("Самые востребованные книги:")
+            print("\n".join(f"{book} | Выдач: {count}" for book, count in books))
+
+    def summary_interactive(self) -> None:
+        """
+        Отображает сводку по библиотеке: количество книг и экземпляров, книги по статусам, авторов с наибольшим
+        количеством книг и книги по десятилетиям. Показатели не подсчитываются обходом каталога.
+        """
+        summary = self.library.summary()
+        print(f"\nКниг: {summary['books']}, авторов: {summary['authors']}.")
+        print(f"Экземпляров в наличии: {summary['available']}, выдано: {summary['issued']}.")
+        print("По статусам: " + ", ".join(f"{status} - {count}" for status, count in summary["statuses"].items()))
+        authors = self.library.top_authors(SUMMARY_TOP_AUTHORS)
+        if authors:
+            print("Авторы с наибольшим количеством книг:")
+            print("\n".join(f"{author} | Книг: {count}" for author, count in authors))
+            print("По десятилетиям:")
+            print("\n".join(f"{decade}-е | Книг: {count}" for decade, count in self.library.books_per_decade().items()))
+
+    @staticmethod
+    def _choose_sort_field() -> str | None:
+        """
+        Запрашивает у пользователя поле сортировки.
+
+        Возвращает:
+            str | None: Поле из SORT_FIELDS или None при неверном выборе.
+        """
+        print("\nУпорядочить по:")
+        for number, field in enumerate(SORT_FIELDS, start=1):
+            print(f"{number}. {SORT_FIELD_LABELS[field].capitalize()}")
+        choice = input("Введите номер поля: ").strip()
+        if not (choice.isdecimal() and 1 <= int(choice) <= len(SORT_FIELDS)):
+            print("Неверный выбор поля.")
+            return None
+        return SORT_FIELDS[int(choice) - 1]
+
+    @staticmethod
+    def _print_books(books: list[Book]) -> None:
+        """
+        Выводит книги одной операцией записи.
+
+        Аргументы:
+            books (list[Book]): Книги для вывода.
+        """
+        print("\n".join(map(str, books)))
+
+    @staticmethod
+    def _page_through(header: str, total: int, show_page: Callable[[int], object]) -> None:
+        """
+        Постранично выводит список из total книг по PAGE_SIZE книг на странице.
+
+        Enter открывает следующую страницу, номер - страницу с этим номером, 0 - возврат в меню.
+
+        Аргументы:
+            header (str): Заголовок списка.
+            total (int): Общее количество книг.
+            show_page (Callable[[int], object]): Выводит страницу, начинающуюся с переданного смещения.
         """
-        print("\nСписок всех книг:")
-        self.library.display_books()
+        if not total:
+            print("Библиотека пуста.")
+            return
+
+        pages = -(-total // PAGE_SIZE)
+        page = 1
+        while True:
+            print(f"\n{header}, страница {page} из {pages}:")
+            show_page((page - 1) * PAGE_SIZE)
+            if pages == 1:
+                return
+            answer = input("Enter - следующая страница, номер - перейти к странице, 0 - в меню: ").strip()
+            if answer == "0" or (not answer and page == pages):
+                return
+            if not answer:
+                page += 1
+            elif answer.isdecimal() and 1 <= int(answer) <= pages:
+                page = int(answer)
+            else:
+                print(f"Некорректный номер страницы. Допустимые значения: от 1 до {pages}.")
 
     def update_status_interactive(self) -> None:
         """
@@ -167,10 +364,10 @@ class Runner:
         else:
             print(f"Ошибка обновления статуса книги с ID {book_id}.")
 
-    @staticmethod
-    def exit_interactive() -> None:
+    def exit_interactive(self) -> None:
         """
-        Завершает выполнение приложения.
+        Сохраняет отложенные изменения и завершает выполнение приложения.
         """
+        self.library.close()
         print("Выход из приложения. До свидания!")
         exit()
@@ -0,0 +1,186 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+
+from service.book import Book
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Вес совпадения в зависимости от поля книги
+TITLE_WEIGHT = 2
+AUTHOR_WEIGHT = 1
+
+
+def normalize_text(text: str) -> str:
+    """
+    Нормализует текст для полнотекстового поиска: без учёта регистра, "ё" приравнивается к "е".
+
+    Аргументы:
+        text (str): Исходный текст.
+
+    Возвращает:
+        str: Нормализованный текст.
+    """
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Разбивает текст на нормализованные слова.
+
+    Аргументы:
+        text (str): Исходный текст.
+
+    Возвращает:
+        list[str]: Список слов в порядке следования.
+    """
+    return _TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class TextIndex:
+    """
+    Класс, представляющий инвертированный индекс по словам названий и авторов книг.
+
+    Атрибуты:
+        _postings (dict[str, dict[int, int]]): Слово -> {ID книги: вес совпадения}.
+        _vocabulary (list[str]): Отсортированный список слов для поиска по префиксу.
+        _pending (list[str]): Новые слова, ещё не добавленные в _vocabulary.
+
+    Методы:
+        add: Добавляет книгу в индекс.
+        remove: Удаляет книгу из индекса.
+        clear: Очищает индекс.
+        sync_vocabulary: Добавляет новые слова в отсортированный словарь.
+        search: Ищет книги по фрагментам слов и ранжирует результат.
+    """
+
+    def __init__(self):
+        """Инициализирует пустой индекс."""
+        self._postings: dict[str, dict[int, int]] = {}
+        self._vocabulary: list[str] = []
+        self._pending: list[str] = []
+
+    @staticmethod
+    def _weights(book: Book) -> dict[str, int]:
+        """
+        Вычисляет вес каждого слова книги: слово из названия весит больше слова из имени автора.
+
+        Аргументы:
+            book (Book): Книга.
+
+        Возвращает:
+            dict[str, int]: Слово -> суммарный вес по полям, в которых оно встречается.
+        """
+        weights = dict.fromkeys(tokenize(book.title), TITLE_WEIGHT)
+        for token in set(tokenize(book.author)):
+            weights[token] = weights.get(token, 0) + AUTHOR_WEIGHT
+        return weights
+
+    def add(self, book: Book) -> None:
+        """
+        Добавляет книгу в индекс.
+
+        Аргументы:
+            book (Book): Книга для индексации.
+        """
+        for token, weight in self._weights(book).items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._pending.append(token)
+            postings[book.book_id] = weight
+
+    def remove(self, book: Book) -> None:
+        """
+        Удаляет книгу из индекса. Слова без книг удаляются из словаря при следующей перестройке.
+
+        Аргументы:
+            book (Book): Удаляемая книга.
+        """
+        for token in self._weights(book):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(book.book_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def clear(self) -> None:
+        """Очищает индекс."""
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._pending.clear()
+
+    def sync_vocabulary(self) -> None:
+        """
+        Добавляет новые слова в отсортированный словарь.
+
+        Небольшое число слов вставляется через bisect, после массовой загрузки словарь пересортировывается целиком.
+        Вызывается из search; при параллельном поиске вызывающий должен заранее выполнить его под блокировкой,
+        тогда search только читает индекс.
+        """
+        if not self._pending:
+            return
+        if len(self._pending) * 8 > len(self._vocabulary):
+            self._vocabulary = sorted(self._postings)
+        else:
+            for token in self._pending:
+                position = bisect_left(self._vocabulary, token)
+                if position == len(self._vocabulary) or self._vocabulary[position] != token:
+                    insort(self._vocabulary, token, lo=position)
+        self._pending.clear()
+
+    def _match(self, fragment: str) -> dict[int, int]:
+        """
+        Находит книги, содержащие слово, начинающееся с фрагмента.
+
+        Аргументы:
+            fragment (str): Нормализованный фрагмент слова.
+
+        Возвращает:
+            dict[int, int]: ID книги -> лучшая оценка совпадения (точное совпадение слова ценится вдвое выше).
+        """
+        scores: dict[int, int] = {}
+        position = bisect_left(self._vocabulary, fragment)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(fragment):
+            token = self._vocabulary[position]
+            position += 1
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            factor = 2 if token == fragment else 1
+            for book_id, weight in postings.items():
+                score = weight * factor
+                if score > scores.get(book_id, 0):
+                    scores[book_id] = score
+        return scores
+
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        """
+        Ищет книги, у которых для каждого слова запроса найдётся слово в названии или авторе с таким префиксом.
+
+        Аргументы:
+            query (str): Поисковый запрос, например "кнут искусство".
+            limit (int | None): Максимальное количество результатов (None - без ограничения).
+
+        Возвращает:
+            list[int]: ID найденных книг по убыванию релевантности, при равенстве - в порядке добавления.
+        """
+        fragments = list(dict.fromkeys(tokenize(query)))
+        if not fragments:
+            return []
+        self.sync_vocabulary()
+
+        matches = sorted((self._match(fragment) for fragment in fragments), key=len)
+        smallest, others = matches[0], matches[1:]
+        ranked = []
+        for book_id, score in smallest.items():
+            for other in others:
+                other_score = other.get(book_id)
+                if other_score is None:
+                    break
+                score += other_score
+            else:
+                ranked.append((-score, book_id))
+
+        ranked = heapq.nsmallest(limit, ranked) if limit is not None else sorted(ranked)
+        return [book_id for _, book_id in ranked]
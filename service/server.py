@@ -0,0 +1,408 @@
+"""
+HTTP/JSON API библиотеки на asyncio.
+
+Сервер обслуживает одну общую библиотеку. Цикл событий только разбирает запросы и формирует ответы: чтение
+каталога выполняется в пуле потоков читателей, изменения вместе с сохранением в файл - в единственном потоке
+писателя, поэтому запись на диск не останавливает обработку других соединений.
+
+Эндпоинты:
+    GET    /books?offset=0&limit=20                    - страница книг в порядке добавления;
+    GET    /books/<id>                                 - книга по ID;
+    GET    /books/find?title=&author=&year=&year_from=&year_to=&offset=&limit=
+                                                       - поиск по критериям;
+    GET    /search?q=&limit=                           - поиск по фрагментам слов названия и автора;
+    POST   /books      {"title": ..., "author": ..., "year": ...}
+                                                       - добавление книги;
+    PATCH  /books/<id> {"status": "выдана" | "в наличии"}
+                                                       - изменение статуса;
+    DELETE /books/<id>                                 - удаление книги;
+    GET    /stats                                      - статистика библиотеки (Library.stats).
+
+Запуск из корня проекта:
+    python -m service.server
+    python -m service.server --host 0.0.0.0 --port 8080 --storage data/library.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from service.library import Library
+from settings.settings import (
+    CIRCULATION_FILE, COLLECT_METRICS, MAX_PAGE_SIZE, METRICS_FILE, METRICS_INTERVAL, PAGE_SIZE, SERVER_HOST,
+    SERVER_PORT, SHARED_STORAGE, SNAPSHOT_BACKUPS, STATUSES, USE_JOURNAL
+)
+from utils.validators import validate_author, validate_id, validate_title, validate_year
+
+# Наибольший допустимый размер тела запроса в байтах
+MAX_BODY_SIZE = 1 << 20
+
+
+class LibraryServer:
+    """
+    Класс, представляющий HTTP/JSON сервер библиотеки.
+
+    Атрибуты:
+        library (Library): Обслуживаемая библиотека.
+        host (str): Адрес, на котором принимаются соединения.
+        port (int): Порт; после start - фактический порт (при port=0 выбирается свободный).
+        _reads (ThreadPoolExecutor): Потоки для чтения каталога.
+        _writes (ThreadPoolExecutor): Единственный поток для изменений и сохранения.
+        _server (asyncio.Server | None): Запущенный сервер asyncio.
+        _routes (dict[tuple[str, str], Callable]): (метод, шаблон пути) -> обработчик.
+
+    Методы:
+        start: Начинает принимать соединения.
+        serve_forever: Обслуживает соединения до отмены.
+        close: Останавливает сервер и сохраняет библиотеку.
+    """
+
+    def __init__(self, library: Library, host: str = SERVER_HOST, port: int = SERVER_PORT, read_workers: int = 4):
+        """
+        Инициализирует сервер.
+
+        Аргументы:
+            library (Library): Обслуживаемая библиотека.
+            host (str): Адрес для приёма соединений (по умолчанию SERVER_HOST).
+            port (int): Порт (по умолчанию SERVER_PORT, 0 - любой свободный).
+            read_workers (int): Количество потоков чтения (по умолчанию 4).
+        """
+        self.library = library
+        self.host = host
+        self.port = port
+        self._reads = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="library-reader")
+        self._writes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="library-writer")
+        self._server: asyncio.Server | None = None
+        self._routes: dict[tuple[str, str], Callable] = {
+            ("GET", "/books"): self._list_books,
+            ("POST", "/books"): self._add_book,
+            ("GET", "/books/find"): self._find_books,
+            ("GET", "/books/<id>"): self._get_book,
+            ("PATCH", "/books/<id>"): self._update_status,
+            ("DELETE", "/books/<id>"): self._remove_book,
+            ("GET", "/search"): self._search_books,
+            ("GET", "/stats"): self._stats,
+        }
+
+    async def start(self) -> None:
+        """Начинает принимать соединения."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Обслуживает соединения до отмены задачи."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Прекращает приём соединений, сохраняет изменения библиотеки и останавливает потоки.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(self._writes, self.library.close)
+        self._writes.shutdown()
+        self._reads.shutdown()
+
+    async def _read(self, func: Callable, *args) -> Any:
+        """
+        Выполняет чтение каталога в пуле потоков читателей. При совместном доступе (shared) перед чтением
+        применяются изменения других процессов, как это делает консольное приложение перед каждой командой.
+
+        Аргументы:
+            func (Callable): Функция чтения.
+            *args: Её аргументы.
+
+        Возвращает:
+            Any: Результат функции.
+        """
+        def read() -> Any:
+            if self.library.shared:
+                self.library.refresh()
+            return func(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(self._reads, read)
+
+    async def _write(self, func: Callable, *args) -> Any:
+        """
+        Выполняет изменение каталога (вместе с сохранением) в потоке писателя.
+
+        Аргументы:
+            func (Callable): Изменяющая функция.
+            *args: Её аргументы.
+
+        Возвращает:
+            Any: Результат функции.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._writes, partial(func, *args))
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обслуживает одно соединение; в HTTP/1.1 соединение по умолчанию остаётся открытым для следующих запросов.
+
+        Аргументы:
+            reader (asyncio.StreamReader): Поток чтения соединения.
+            writer (asyncio.StreamWriter): Поток записи соединения.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, None, False))
+                    break
+                try:
+                    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                    method, target, version = request_line.split(" ", 2)
+                    headers = {}
+                    for line in header_lines:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    writer.write(self._response(HTTPStatus.BAD_REQUEST, {"error": "Некорректный запрос."}, False))
+                    break
+                if length > MAX_BODY_SIZE:
+                    writer.write(self._response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, None, False))
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+        """
+        Формирует HTTP-ответ с телом в JSON.
+
+        Аргументы:
+            status (int): Код ответа.
+            payload (Any): Тело ответа (None - без тела).
+            keep_alive (bool): Оставить ли соединение открытым.
+
+        Возвращает:
+            bytes: Ответ целиком.
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> tuple[int, Any]:
+        """
+        Находит обработчик запроса и преобразует исключения в коды ответа.
+
+        Аргументы:
+            method (str): HTTP-метод.
+            target (str): Путь с параметрами запроса.
+            body (bytes): Тело запроса.
+
+        Возвращает:
+            tuple[int, Any]: Код и тело ответа.
+        """
+        url = urlsplit(target)
+        parts = url.path.rstrip("/").split("/")
+        book_id = None
+        if len(parts) == 3 and parts[1] == "books" and parts[2] != "find":
+            book_id, parts[2] = parts[2], "<id>"
+        path = "/".join(parts)
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Метод {method} не поддерживается для {url.path}."}
+            return HTTPStatus.NOT_FOUND, {"error": f"Ресурс {url.path} не найден."}
+
+        try:
+            arguments = {"query": dict(parse_qsl(url.query))}
+            if body:
+                arguments["data"] = json.loads(body)
+            if book_id is not None:
+                arguments["book_id"] = validate_id(book_id)
+            return await handler(**arguments)
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Тело запроса должно быть JSON."}
+        except LookupError as e:
+            return HTTPStatus.NOT_FOUND, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Неопределенная ошибка: {e}"}
+
+    @staticmethod
+    def _page(query: dict[str, str]) -> tuple[int, int]:
+        """
+        Читает параметры страницы из запроса.
+
+        Аргументы:
+            query (dict[str, str]): Параметры запроса.
+
+        Возвращает:
+            tuple[int, int]: Смещение и размер страницы.
+
+        Исключения:
+            ValueError: Если параметры не являются числами или выходят за допустимые пределы.
+        """
+        try:
+            offset, limit = int(query.get("offset", 0)), int(query.get("limit", PAGE_SIZE))
+        except ValueError:
+            raise ValueError("offset и limit должны быть числами.")
+        if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"offset не может быть отрицательным, limit должен быть от 1 до {MAX_PAGE_SIZE}.")
+        return offset, limit
+
+    async def _list_books(self, query: dict[str, str], **_) -> tuple[int, Any]:
+        """GET /books: страница книг в порядке добавления и общее количество книг."""
+        offset, limit = self._page(query)
+
+        def read() -> tuple[list[dict], int]:
+            books, total = self.library.list_books(offset, limit)
+            return [book.to_dict() for book in books], total
+
+        items, total = await self._read(read)
+        return HTTPStatus.OK, {"items": items, "total": total, "offset": offset, "limit": limit}
+
+    async def _find_books(self, query: dict[str, str], **_) -> tuple[int, Any]:
+        """GET /books/find: поиск по названию, автору, году и диапазону годов со страницами результата."""
+        offset, limit = self._page(query)
+        criteria = {
+            "title": query.get("title") or None,
+            "author": query.get("author") or None,
+            "year": validate_year(query["year"]) if query.get("year") else None,
+            "year_from": validate_year(query["year_from"]) if query.get("year_from") else None,
+            "year_to": validate_year(query["year_to"]) if query.get("year_to") else None,
+        }
+
+        def read() -> tuple[list[dict], int]:
+            books = self.library.find_books(**criteria)
+            return [book.to_dict() for book in books[offset:offset + limit]], len(books)
+
+        items, total = await self._read(read)
+        return HTTPStatus.OK, {"items": items, "total": total, "offset": offset, "limit": limit}
+
+    async def _search_books(self, query: dict[str, str], **_) -> tuple[int, Any]:
+        """GET /search: поиск по фрагментам слов названия и автора."""
+        _, limit = self._page(query)
+
+        def read() -> list[dict]:
+            return [book.to_dict() for book in self.library.search_books(query.get("q", ""), limit)]
+
+        return HTTPStatus.OK, {"items": await self._read(read)}
+
+    async def _get_book(self, book_id: int, **_) -> tuple[int, Any]:
+        """GET /books/<id>: книга по ID."""
+        def read() -> dict | None:
+            book = self.library.find_book_by_id(book_id)
+            return book.to_dict() if book is not None else None
+
+        book = await self._read(read)
+        if book is None:
+            raise LookupError(f"Книга с ID {book_id} не найдена.")
+        return HTTPStatus.OK, book
+
+    async def _add_book(self, data: Any = None, **_) -> tuple[int, Any]:
+        """POST /books: добавление книги или увеличение количества уже существующей."""
+        if not isinstance(data, dict):
+            raise ValueError("Ожидается объект с полями title, author и year.")
+        title = validate_title(str(data.get("title") or "").strip())
+        author = validate_author(str(data.get("author") or "").strip())
+        year = validate_year(str(data.get("year") or "").strip())
+
+        def write() -> dict:
+            return self.library.add_book(title=title, author=author, year=year).to_dict()
+
+        return HTTPStatus.CREATED, await self._write(write)
+
+    async def _update_status(self, book_id: int, data: Any = None, **_) -> tuple[int, Any]:
+        """PATCH /books/<id>: выдача или возврат книги."""
+        status = data.get("status") if isinstance(data, dict) else None
+        if status not in STATUSES:
+            raise ValueError(f"Некорректный статус. Допустимые значения: {sorted(STATUSES)}.")
+
+        def write() -> tuple[bool, dict]:
+            if self.library.find_book_by_id(book_id) is None:
+                raise LookupError(f"Книга с ID {book_id} не найдена.")
+            updated = self.library.update_status(book_id, status)
+            return updated, self.library.find_book_by_id(book_id).to_dict()
+
+        updated, book = await self._write(write)
+        if not updated:
+            return HTTPStatus.CONFLICT, {"error": f"Статус книги с ID {book_id} не изменён.", "book": book}
+        return HTTPStatus.OK, book
+
+    async def _stats(self, **_) -> tuple[int, Any]:
+        """GET /stats: количество и длительность вызовов методов библиотеки, объём записи на диск."""
+        return HTTPStatus.OK, await self._read(self.library.stats)
+
+    async def _remove_book(self, book_id: int, **_) -> tuple[int, Any]:
+        """DELETE /books/<id>: удаление книги."""
+        if not await self._write(self.library.remove_book, book_id):
+            raise LookupError(f"Книга с ID {book_id} не найдена.")
+        return HTTPStatus.NO_CONTENT, None
+
+
+async def serve(library: Library, host: str = SERVER_HOST, port: int = SERVER_PORT) -> None:
+    """
+    Запускает сервер и обслуживает соединения до отмены, после чего сохраняет библиотеку.
+
+    Аргументы:
+        library (Library): Обслуживаемая библиотека.
+        host (str): Адрес для приёма соединений.
+        port (int): Порт.
+    """
+    server = LibraryServer(library, host, port)
+    await server.start()
+    print(f"API библиотеки: http://{server.host}:{server.port}/books")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="python -m service.server", description="HTTP/JSON API библиотеки.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--storage", default="data/library.json", help="путь к файлу библиотеки")
+    arguments = parser.parse_args(argv)
+    library = Library(
+        storage_file=arguments.storage,
+        journal=USE_JOURNAL,
+        backups=SNAPSHOT_BACKUPS,
+        shared=SHARED_STORAGE,
+        metrics=COLLECT_METRICS,
+        metrics_interval=METRICS_INTERVAL,
+        metrics_file=METRICS_FILE,
+        circulation_file=CIRCULATION_FILE,
+    )
+    try:
+        asyncio.run(serve(library, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        print("Сервер остановлен.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
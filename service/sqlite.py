@@ -0,0 +1,508 @@
+import sqlite3
+import threading
+from itertools import islice
+from typing import Iterable, Iterator
+
+from service.book import Book
+from service.catalogue import BookRecord, Catalogue
+from service.index import normalize
+from service.storage import Storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    title_key TEXT NOT NULL,
+    author_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_title ON books (title_key, author_key, year);
+CREATE INDEX IF NOT EXISTS books_author ON books (author_key);
+CREATE INDEX IF NOT EXISTS books_year ON books (year);
+"""
+
+_COLUMNS = "id, title, author, year, status, count"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM books WHERE id = ?"
+_SELECT_PAGE = f"SELECT {_COLUMNS} FROM books WHERE id > ? ORDER BY id LIMIT ?"
+_UPSERT = (
+    "INSERT INTO books (id, title, author, year, status, count, title_key, author_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET title = excluded.title, author = excluded.author, year = excluded.year, "
+    "status = excluded.status, count = excluded.count, title_key = excluded.title_key, "
+    "author_key = excluded.author_key"
+)
+_DELETE = "DELETE FROM books WHERE id = ?"
+_EXISTS = "SELECT 1 FROM books WHERE id = ?"
+_COUNT = "SELECT COUNT(*) FROM books"
+_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM books"
+_IDS_PAGE = "SELECT id FROM books WHERE id > ? ORDER BY id LIMIT ?"
+_SORT_COLUMNS = {"title": "title_key", "author": "author_key", "year": "year", "count": "count"}
+# Количество строк, читаемых одним запросом при обходе таблицы
+FETCH_SIZE = 1000
+# Наибольшее количество ID в одном запросе WHERE id IN (...): ограничение SQLite на число параметров - 999
+# в старых версиях
+SELECT_MANY_SIZE = 500
+_FIND_KEY = "SELECT id FROM books WHERE title_key = ? AND author_key = ? AND year = ? ORDER BY id LIMIT 1"
+
+
+class SqliteBooks(Catalogue):
+    """
+    Класс, представляющий каталог, хранящийся в таблице SQLite.
+
+    Изменения записываются в открытую транзакцию соединения и сразу видны запросам поиска; фиксируются они при
+    сохранении библиотеки. Выданные объекты Book запоминаются до фиксации, чтобы изменения количества и статуса
+    не терялись между действием и сохранением. Таблица обходится страницами по FETCH_SIZE строк по первичному
+    ключу, поэтому в памяти не бывает больше одной страницы.
+
+    Атрибуты:
+        _storage (SqliteStorage): Хранилище, владеющее соединением.
+        _cache (dict[int, Book]): Объекты книг, выданные с момента последней фиксации.
+        _count (int): Количество строк таблицы: подсчитывается при открытии и поддерживается при изменениях.
+
+    Методы:
+        records: Возвращает записи всех книг в порядке добавления.
+        max_id: Возвращает наибольший ID в таблице.
+        get_many: Возвращает книги по списку ID, загружая недостающие запросами WHERE id IN (...).
+        forget: Забывает выданные объекты книг после фиксации транзакции.
+        recount: Заново подсчитывает строки таблицы.
+    """
+
+    def __init__(self, storage: "SqliteStorage"):
+        """
+        Инициализирует каталог.
+
+        Аргументы:
+            storage (SqliteStorage): Хранилище, владеющее соединением.
+        """
+        self._storage = storage
+        self._cache: dict[int, Book] = {}
+        self._count = storage.query_one(_COUNT)[0]
+
+    def __getitem__(self, book_id: int) -> Book:
+        book = self._cache.get(book_id)
+        if book is not None:
+            return book
+        row = self._storage.query_one(_SELECT_BY_ID, (book_id,))
+        if row is None:
+            raise KeyError(book_id)
+        # setdefault: параллельные читатели должны получить один и тот же объект книги
+        return self._cache.setdefault(book_id, Book(*row))
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        if book_id not in self:
+            self._count += 1
+        self._storage.execute(_UPSERT, (
+            book_id, book.title, book.author, book.year, book.status, book.count,
+            normalize(book.title), normalize(book.author),
+        ))
+        self._cache[book_id] = book
+
+    def __delitem__(self, book_id: int) -> None:
+        if not self._storage.execute(_DELETE, (book_id,)).rowcount:
+            raise KeyError(book_id)
+        self._count -= 1
+        self._cache.pop(book_id, None)
+
+    def __contains__(self, book_id: object) -> bool:
+        return book_id in self._cache or self._storage.query_one(_EXISTS, (book_id,)) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        for (book_id,) in self._pages(_IDS_PAGE):
+            yield book_id
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _pages(self, sql: str) -> Iterator[tuple]:
+        """
+        Обходит таблицу по возрастанию ID страницами по FETCH_SIZE строк: каждая следующая страница начинается
+        после последнего прочитанного ID (WHERE id > ? ... LIMIT ?), поэтому обход не держит курсор открытым
+        и не пропускает строки при изменении таблицы между страницами.
+
+        Аргументы:
+            sql (str): Запрос с параметрами последнего ID и размера страницы; первый столбец - ID.
+
+        Возвращает:
+            Iterator[tuple]: Строки таблицы.
+        """
+        last_id = 0  # ID книг начинаются с 1
+        while rows := self._storage.query(sql, (last_id, FETCH_SIZE)):
+            yield from rows
+            last_id = rows[-1][0]
+
+    def records(self) -> Iterator[Book | BookRecord]:
+        """
+        Возвращает все книги в порядке добавления, не создавая объекты Book для невыданных книг.
+
+        Возвращает:
+            Iterator[Book | BookRecord]: Выданные книги или записи из таблицы.
+        """
+        for row in self._pages(_SELECT_PAGE):
+            book = self._cache.get(row[0])
+            yield book if book is not None else BookRecord(*row)
+
+    def max_id(self) -> int:
+        """
+        Возвращает наибольший ID в таблице по первичному ключу.
+
+        Возвращает:
+            int: Наибольший ID или 0 для пустой таблицы.
+        """
+        return self._storage.query_one(_MAX_ID)[0]
+
+    def get_many(self, book_ids: Iterable[int]) -> list[Book]:
+        """
+        Возвращает книги по списку ID. Книги, ещё не выданные с момента фиксации, загружаются запросами
+        WHERE id IN (...) по SELECT_MANY_SIZE ID, а не отдельным запросом на каждую.
+
+        Аргументы:
+            book_ids (Iterable[int]): ID книг.
+
+        Возвращает:
+            list[Book]: Книги в порядке ID.
+
+        Исключения:
+            KeyError: Если книги с одним из ID нет в таблице.
+        """
+        book_ids = list(book_ids)
+        missing = [book_id for book_id in book_ids if book_id not in self._cache]
+        for start in range(0, len(missing), SELECT_MANY_SIZE):
+            chunk = missing[start:start + SELECT_MANY_SIZE]
+            sql = f"SELECT {_COLUMNS} FROM books WHERE id IN ({', '.join('?' * len(chunk))})"
+            for row in self._storage.query(sql, tuple(chunk)):
+                self._cache.setdefault(row[0], Book(*row))
+        return [self._cache[book_id] for book_id in book_ids]
+
+    def forget(self) -> None:
+        """Забывает выданные объекты книг: после фиксации транзакции их состояние уже есть в таблице."""
+        self._cache.clear()
+
+    def recount(self) -> None:
+        """Заново подсчитывает строки таблицы после изменения, выполненного в обход каталога."""
+        self._count = self._storage.query_one(_COUNT)[0]
+
+
+class SqliteIndex:
+    """
+    Класс, представляющий поисковый индекс с интерфейсом BookIndex, который выполняет поиск запросами к SQLite.
+
+    Названия и авторы хранятся в таблице в нормализованном виде (столбцы title_key и author_key), поэтому поиск
+    без учёта регистра использует обычные индексы таблицы. Книги индексируются при записи в таблицу, поэтому
+    add, remove и clear ничего не делают.
+    """
+
+    def __init__(self, storage: "SqliteStorage"):
+        """
+        Инициализирует индекс.
+
+        Аргументы:
+            storage (SqliteStorage): Хранилище, владеющее соединением.
+        """
+        self._storage = storage
+
+    def add(self, book: Book | BookRecord) -> None:
+        """Ничего не делает: книга индексируется при записи в таблицу."""
+
+    def remove(self, book: Book | BookRecord) -> None:
+        """Ничего не делает: книга удаляется из индексов вместе со строкой таблицы."""
+
+    def clear(self) -> None:
+        """Ничего не делает: индексы принадлежат таблице."""
+
+    def find_key(self, title: str, author: str, year: int) -> int | None:
+        """
+        Находит ID книги по точному (без учёта регистра) совпадению названия, автора и года.
+
+        Аргументы:
+            title (str): Название книги.
+            author (str): Автор книги.
+            year (int): Год издания.
+
+        Возвращает:
+            int | None: ID найденной книги или None.
+        """
+        row = self._storage.query_one(_FIND_KEY, (normalize(title), normalize(author), year))
+        return row[0] if row is not None else None
+
+    def find_year_range(self, year_from: int | None = None, year_to: int | None = None) -> list[int]:
+        """
+        Находит ID книг, изданных в диапазоне годов.
+
+        Аргументы:
+            year_from (int | None): Начало диапазона включительно (None - без ограничения).
+            year_to (int | None): Конец диапазона включительно (None - без ограничения).
+
+        Возвращает:
+            list[int]: ID найденных книг, упорядоченные по году, внутри года - по порядку добавления.
+        """
+        where, parameters = self._where(year_from=year_from, year_to=year_to)
+        return [row[0] for row in self._storage.query(f"SELECT id FROM books{where} ORDER BY year, id", parameters)]
+
+    def find(
+            self,
+            title: str | None = None,
+            author: str | None = None,
+            year: int | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+    ) -> list[int] | None:
+        """
+        Находит ID книг, точно (без учёта регистра) совпадающих по всем заданным критериям.
+
+        Аргументы:
+            title (str | None): Название книги (необязательно).
+            author (str | None): Автор книги (необязательно).
+            year (int | None): Год издания книги (необязательно).
+            year_from (int | None): Начало диапазона годов включительно (необязательно).
+            year_to (int | None): Конец диапазона годов включительно (необязательно).
+
+        Возвращает:
+            list[int] | None: ID найденных книг в порядке добавления или None, если не задан ни один критерий.
+        """
+        where, parameters = self._where(title, author, year, year_from, year_to)
+        if not where:
+            return None
+        return [row[0] for row in self._storage.query(f"SELECT id FROM books{where} ORDER BY id", parameters)]
+
+    def sorted_ids(
+            self,
+            field: str,
+            descending: bool = False,
+            offset: int = 0,
+            limit: int | None = None,
+    ) -> list[int] | None:
+        """
+        Возвращает страницу ID книг, упорядоченных по названию, автору, году или количеству, запросом ORDER BY.
+
+        Аргументы:
+            field (str): "title", "author", "year" или "count".
+            descending (bool): Упорядочить по убыванию (по умолчанию - по возрастанию).
+            offset (int): Количество пропускаемых книг (по умолчанию 0).
+            limit (int | None): Максимальный размер страницы (None - до конца каталога).
+
+        Возвращает:
+            list[int] | None: ID книг страницы (при равных значениях - в порядке добавления, при убывании - в
+                обратном) или None, если поле не поддерживается.
+        """
+        column = _SORT_COLUMNS.get(field)
+        if column is None:
+            return None
+        direction = "DESC" if descending else "ASC"
+        rows = self._storage.query(
+            f"SELECT id FROM books ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        )
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _where(
+            title: str | None = None,
+            author: str | None = None,
+            year: int | None = None,
+            year_from: int | None = None,
+            year_to: int | None = None,
+    ) -> tuple[str, tuple]:
+        """
+        Формирует условие WHERE с параметрами для заданных критериев.
+
+        Возвращает:
+            tuple[str, tuple]: Условие (пустая строка, если критериев нет) и значения параметров.
+        """
+        conditions, parameters = [], []
+        for column, operator, value in (
+                ("title_key", "=", normalize(title) if title else None),
+                ("author_key", "=", normalize(author) if author else None),
+                ("year", "=", year or None),
+                ("year", ">=", year_from),
+                ("year", "<=", year_to),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        return (f" WHERE {' AND '.join(conditions)}" if conditions else ""), tuple(parameters)
+
+
+class SqliteStorage(Storage):
+    """
+    Класс, представляющий хранилище каталога в базе SQLite.
+
+    Книги хранятся в таблице с индексами по ID, названию, автору и году; база работает в режиме WAL. Каталог
+    и поиск библиотеки выполняются запросами к базе, поэтому каталог может быть больше оперативной памяти.
+    Изменения накапливаются в транзакции и фиксируются при сохранении библиотеки.
+
+    Атрибуты:
+        path (str): Путь к файлу базы.
+        journal (bool): Всегда True: сохранение фиксирует только накопленные изменения.
+        bytes_written (int): Всегда 0: объём записи на диск определяет сама SQLite и модуль sqlite3 его не сообщает.
+        _connection (sqlite3.Connection): Соединение с базой.
+        _lock (threading.RLock): Блокировка соединения для доступа из фонового потока сохранения.
+        _books (SqliteBooks): Каталог поверх таблицы.
+
+    Методы:
+        catalogue: Возвращает каталог поверх таблицы.
+        index: Возвращает индекс, выполняющий поиск запросами к базе.
+        execute: Выполняет изменяющий запрос в текущей транзакции.
+        query: Выполняет запрос и возвращает строки результата.
+        query_one: Выполняет запрос и возвращает первую строку результата.
+        load: Возвращает записи книг из таблицы.
+        append: Фиксирует накопленные изменения.
+        save: Заменяет содержимое таблицы переданными записями.
+        checkpoint: Фиксирует изменения и переносит журнал WAL в основной файл базы.
+        close: Фиксирует изменения и закрывает соединение.
+    """
+
+    journal = True
+
+    def __init__(self, path: str):
+        """
+        Открывает (при необходимости создаёт) базу.
+
+        Аргументы:
+            path (str): Путь к файлу базы.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._books = SqliteBooks(self)
+
+    def catalogue(self) -> SqliteBooks:
+        """
+        Возвращает каталог поверх таблицы книг.
+
+        Возвращает:
+            SqliteBooks: Каталог.
+        """
+        return self._books
+
+    def index(self) -> SqliteIndex:
+        """
+        Возвращает индекс, выполняющий поиск запросами к базе.
+
+        Возвращает:
+            SqliteIndex: Индекс.
+        """
+        return SqliteIndex(self)
+
+    def execute(self, sql: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        """
+        Выполняет изменяющий запрос в текущей транзакции.
+
+        Аргументы:
+            sql (str): Текст запроса с параметрами "?"; sqlite3 кеширует подготовленные запросы по тексту.
+            parameters (tuple): Значения параметров.
+
+        Возвращает:
+            sqlite3.Cursor: Курсор выполненного запроса.
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters)
+
+    def query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        """
+        Выполняет запрос и возвращает все строки результата. Таблица целиком так не читается: её обходят
+        страницами (SqliteBooks._pages).
+
+        Аргументы:
+            sql (str): Текст запроса с параметрами "?".
+            parameters (tuple): Значения параметров.
+
+        Возвращает:
+            list[tuple]: Строки результата.
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def query_one(self, sql: str, parameters: tuple = ()) -> tuple | None:
+        """
+        Выполняет запрос и возвращает первую строку результата.
+
+        Аргументы:
+            sql (str): Текст запроса с параметрами "?".
+            parameters (tuple): Значения параметров.
+
+        Возвращает:
+            tuple | None: Первая строка или None, если результат пуст.
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchone()
+
+    def load(self) -> Iterator[dict]:
+        """
+        Возвращает записи книг из таблицы, читая её страницами. Библиотеке не нужен: каталогом служит сама таблица.
+
+        Возвращает:
+            Iterator[dict]: Записи книг в порядке ID.
+        """
+        for record in self._books.records():
+            yield record.to_dict()
+
+    def append(self, changes: dict[int, dict | None]) -> None:
+        """
+        Записывает изменённые книги в таблицу и фиксирует транзакцию.
+
+        Новые и удалённые книги уже записаны каталогом SqliteBooks, а количество и статус меняются у объектов Book
+        в памяти, поэтому изменённые книги записываются ещё раз одним пакетом подготовленных запросов.
+
+        Аргументы:
+            changes (dict[int, dict | None]): ID книги -> новая запись книги или None, если книга удалена.
+        """
+        with self._lock:
+            self._connection.executemany(_UPSERT, (
+                (book_id, record["title"], record["author"], record["year"], record["status"], record["count"],
+                 normalize(record["title"]), normalize(record["author"]))
+                for book_id, record in changes.items() if record is not None
+            ))
+            self._connection.executemany(
+                _DELETE, ((book_id,) for book_id, record in changes.items() if record is None)
+            )
+            self._connection.commit()
+            self._books.forget()
+
+    def save(self, records: Iterable[dict]) -> None:
+        """
+        Заменяет содержимое таблицы переданными записями и переносит журнал WAL в основной файл базы.
+
+        Записи читаются пакетами по FETCH_SIZE, поэтому могут поступать из обхода самой таблицы. ID сохранённых
+        книг собираются во временной таблице, после чего удаляются книги, которых среди записей не было.
+
+        Аргументы:
+            records (Iterable[dict]): Записи всех книг в формате Book.to_dict.
+        """
+        records = iter(records)
+        with self._lock:
+            self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS saved_ids (id INTEGER PRIMARY KEY)")
+            self._connection.execute("DELETE FROM saved_ids")
+            while batch := list(islice(records, FETCH_SIZE)):
+                self._connection.executemany(_UPSERT, (
+                    (record["id"], record["title"], record["author"], record["year"], record["status"],
+                     record["count"], normalize(record["title"]), normalize(record["author"]))
+                    for record in batch
+                ))
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO saved_ids (id) VALUES (?)", ((record["id"],) for record in batch)
+                )
+            self._connection.execute("DELETE FROM books WHERE id NOT IN (SELECT id FROM saved_ids)")
+            self._connection.execute("DROP TABLE saved_ids")
+            self._books.recount()
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """
+        Фиксирует транзакцию и переносит журнал WAL в основной файл базы. Заменяет полное сохранение каталога
+        при сжатии: таблица уже содержит весь каталог.
+        """
+        with self._lock:
+            self._connection.commit()
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._books.forget()
+
+    def close(self) -> None:
+        """Фиксирует изменения и закрывает соединение."""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
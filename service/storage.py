@@ -0,0 +1,569 @@
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import textwrap
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import partial
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, TextIO
+
+from settings.settings import JOURNAL_COMPACT_EVERY
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка между процессами недоступна
+    fcntl = None
+
+if TYPE_CHECKING:
+    from service.catalogue import Catalogue
+    from service.index import BookIndex
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Маска прав процесса: читается один раз, так как os.umask меняет её для всех потоков
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Последовательно разбирает JSON-массив верхнего уровня, возвращая элементы по одному.
+
+    Файл читается блоками по chunk_size символов, в памяти одновременно находятся только текущий блок и текущий
+    элемент, поэтому потребление памяти не зависит от размера файла.
+
+    Аргументы:
+        file (TextIO): Открытый текстовый файл.
+        chunk_size (int): Размер читаемого блока в символах.
+
+    Возвращает:
+        Iterator[Any]: Элементы массива в порядке следования.
+
+    Исключения:
+        JSONDecodeError: Если файл не является корректным JSON-массивом.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    state = "start"  # "start" -> "first" | "value" -> "separator"
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Неожиданный конец файла", buffer, position)
+            buffer, position = file.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        char = buffer[position]
+        if state == "start":
+            if char != "[":
+                raise json.JSONDecodeError("Ожидался массив", buffer, position)
+            position += 1
+            state = "first"
+        elif state == "separator" or (state == "first" and char == "]"):
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Ожидалась запятая", buffer, position)
+            position += 1
+            state = "value"
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                error = None
+            except json.JSONDecodeError as e:
+                end, error = len(buffer), e
+            if end == len(buffer) and not eof:
+                # Элемент может продолжаться в следующем блоке: дочитываем и разбираем заново
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            if error is not None:
+                raise error
+            yield value
+            position = end
+            state = "separator"
+
+
+def backup_path(path: str, number: int) -> str:
+    """
+    Возвращает путь к резервной копии файла.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        number (int): Номер копии, 1 - самая свежая.
+
+    Возвращает:
+        str: Путь к файлу резервной копии.
+    """
+    return f"{path}.{number}"
+
+
+def rotate_backups(path: str, backups: int) -> None:
+    """
+    Сдвигает резервные копии ("<path>.1" -> "<path>.2" и т. д.) и сохраняет текущий файл как самую свежую копию.
+    Сам файл остаётся на месте до атомарной замены.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        backups (int): Количество хранимых копий.
+    """
+    if not backups or not os.path.exists(path):
+        return
+    for number in range(backups - 1, 0, -1):
+        if os.path.exists(backup_path(path, number)):
+            os.replace(backup_path(path, number), backup_path(path, number + 1))
+    if os.path.exists(backup_path(path, 1)):
+        os.remove(backup_path(path, 1))
+    try:
+        os.link(path, backup_path(path, 1))
+    except OSError:
+        shutil.copy2(path, backup_path(path, 1))
+
+
+def fsync_directory(directory: str) -> None:
+    """
+    Сбрасывает на диск запись каталога, чтобы переименование файла пережило сбой питания.
+
+    Аргументы:
+        directory (str): Путь к каталогу.
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def write_atomically(path: str, write: Callable[[IO], None], binary: bool = False, backups: int = 0) -> int:
+    """
+    Атомарно заменяет файл: данные пишутся во временный файл в том же каталоге, который сбрасывается на диск (fsync)
+    и переименовывается поверх старого. Прерванная запись не повреждает существующий файл. Права доступа старого
+    файла сохраняются (mkstemp создаёт файл только для владельца), новый файл получает права с учётом umask.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        write (Callable[[IO], None]): Функция, записывающая содержимое в открытый временный файл.
+        binary (bool): Открыть временный файл в двоичном режиме (по умолчанию текстовый UTF-8).
+        backups (int): Количество хранимых резервных копий прежней версии (по умолчанию 0).
+
+    Возвращает:
+        int: Размер записанного файла в байтах.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        os.chmod(temp_path, mode)
+        with (os.fdopen(descriptor, "wb") if binary else os.fdopen(descriptor, "w", encoding="utf-8")) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+            size = os.fstat(file.fileno()).st_size
+        rotate_backups(path, backups)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(directory)
+    return size
+
+
+class Storage(ABC):
+    """
+    Базовый класс хранилищ каталога.
+
+    Хранилище либо отдаёт записи книг, из которых библиотека строит каталог в памяти (load), либо само
+    предоставляет каталог (catalogue) и, возможно, индекс для поиска (index), выполняя поиск без обхода книг
+    в Python. Изменения сохраняются целиком (save) или, если journal = True, только изменённые книги (append).
+    Загрузку записей и оба способа сохранения обязан реализовать каждый наследник; остальные методы имеют
+    поведение по умолчанию.
+
+    Атрибуты:
+        journal (bool): Поддерживает ли хранилище сохранение только изменённых книг.
+        bytes_written (int): Количество байтов, записанных хранилищем в файлы (для статистики).
+
+    Методы:
+        load: Возвращает записи книг для каталога в памяти.
+        catalogue: Возвращает каталог, который хранилище предоставляет само, или None.
+        index: Возвращает индекс, выполняющий поиск на стороне хранилища, или None.
+        save: Сохраняет весь каталог.
+        append: Сохраняет изменённые книги.
+        needs_compaction: Проверяет, пора ли сохранить каталог целиком.
+        lock: Блокирует хранилище от изменений другими процессами.
+        read_changes: Читает изменения, сохранённые другими процессами.
+        close: Освобождает ресурсы хранилища.
+    """
+
+    journal = False
+    bytes_written = 0
+
+    @abstractmethod
+    def load(self) -> Iterator[dict]:
+        """
+        Возвращает записи книг в формате Book.to_dict в порядке добавления.
+
+        Возвращает:
+            Iterator[dict]: Записи книг.
+        """
+
+    def catalogue(self) -> "Catalogue | None":
+        """
+        Возвращает каталог, который хранилище предоставляет само, вместо загрузки записей в память.
+
+        Возвращает:
+            Catalogue | None: Каталог или None, если книги нужно загрузить через load.
+        """
+        return None
+
+    def index(self) -> "BookIndex | None":
+        """
+        Возвращает индекс с интерфейсом BookIndex, выполняющий поиск на стороне хранилища.
+
+        Возвращает:
+            BookIndex | None: Индекс или None, если библиотека должна построить индекс в памяти.
+        """
+        return None
+
+    @abstractmethod
+    def save(self, records: Iterable[dict]) -> None:
+        """
+        Сохраняет весь каталог.
+
+        Аргументы:
+            records (Iterable[dict]): Записи всех книг в формате Book.to_dict.
+        """
+
+    @abstractmethod
+    def append(self, changes: dict[int, dict | None]) -> None:
+        """
+        Сохраняет только изменённые книги.
+
+        Аргументы:
+            changes (dict[int, dict | None]): ID книги -> новая запись книги или None, если книга удалена.
+        """
+
+    def needs_compaction(self) -> bool:
+        """
+        Проверяет, пора ли сохранить каталог целиком после нескольких вызовов append.
+
+        Возвращает:
+            bool: True, если нужно вызвать save.
+        """
+        return False
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Блокирует хранилище от изменений другими процессами на время блока with.
+
+        Возвращает:
+            Iterator[None]: Контекстный менеджер; по умолчанию ничего не блокирует.
+        """
+        yield
+
+    def read_changes(self) -> dict[int, dict | None] | None:
+        """
+        Читает изменения, сохранённые другими процессами после загрузки или предыдущего вызова.
+
+        Возвращает:
+            dict[int, dict | None] | None: ID книги -> новая запись книги или None, если книга удалена;
+                None, если каталог нужно загрузить заново. По умолчанию изменения не отслеживаются.
+        """
+        return {}
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+
+
+class JsonStorage(Storage):
+    """
+    Класс, представляющий хранилище книг в JSON-файле.
+
+    Основной файл содержит снимок каталога. В режиме журнала каждое изменение дописывается одной компактной строкой
+    в файл "<storage_file>.journal", а снимок перезаписывается только при сжатии журнала. Записи журнала идемпотентны
+    ("положить книгу целиком" или "удалить книгу по ID"), поэтому повторное применение журнала к более новому снимку
+    безопасно.
+
+    Снимок записывается атомарно: во временный файл в том же каталоге, который сбрасывается на диск (fsync) и затем
+    переименовывается поверх старого. Прерванная запись не повреждает существующий файл.
+
+    Несколько процессов согласуют запись через блокировку fcntl файла "<storage_file>.lock". Хранилище запоминает
+    отметку снимка (inode, время изменения, размер) и прочитанную длину журнала: изменения других процессов
+    дочитываются из журнала, а если снимок перезаписан, каталог загружается заново.
+
+    Атрибуты:
+        path (str): Путь к файлу снимка.
+        journal_path (str): Путь к файлу журнала.
+        journal (bool): Включён ли режим журнала (иначе append не используется).
+        compact_every (int): Количество записей журнала, после которого выполняется сжатие.
+        backups (int): Количество хранимых резервных копий снимка ("<storage_file>.1" - самая свежая).
+        pretty (bool): Записывать снимок с отступами для чтения человеком.
+        journal_size (int): Текущее количество записей в журнале.
+        lock_path (str): Путь к файлу блокировки.
+        journal_offset (int): Длина прочитанной или записанной этим процессом части журнала в байтах.
+        _snapshot_stamp (tuple | None): Отметка загруженного или записанного снимка.
+        _lock_depth (int): Глубина вложенности блоков lock.
+
+    Методы:
+        load: Загружает снимок и применяет к нему журнал.
+        save: Записывает снимок и очищает журнал.
+        append: Дописывает изменения в журнал.
+        needs_compaction: Проверяет, пора ли сжать журнал в новый снимок.
+        lock: Захватывает блокировку файла между процессами.
+        read_changes: Дочитывает журнал, дописанный другими процессами.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            journal: bool = False,
+            compact_every: int = JOURNAL_COMPACT_EVERY,
+            backups: int = 0,
+            pretty: bool = False,
+    ):
+        """
+        Инициализирует хранилище.
+
+        Аргументы:
+            path (str): Путь к файлу снимка.
+            journal (bool): Включить режим журнала (по умолчанию выключен).
+            compact_every (int): Количество записей журнала, после которого выполняется сжатие.
+            backups (int): Количество хранимых резервных копий снимка (по умолчанию 0).
+            pretty (bool): Записывать снимок с отступами (по умолчанию компактно).
+        """
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.journal = journal
+        self.compact_every = compact_every
+        self.backups = backups
+        self.pretty = pretty
+        self.journal_size = 0
+        self.lock_path = f"{path}.lock"
+        self.journal_offset = 0
+        self._snapshot_stamp: tuple | None = None
+        self._lock_depth = 0
+
+    def backup_path(self, number: int) -> str:
+        """
+        Возвращает путь к резервной копии снимка.
+
+        Аргументы:
+            number (int): Номер копии, 1 - самая свежая.
+
+        Возвращает:
+            str: Путь к файлу резервной копии.
+        """
+        return backup_path(self.path, number)
+
+    def load(self) -> Iterator[dict]:
+        """
+        Последовательно загружает записи книг из снимка, применяя к ним журнал, если он существует.
+
+        Снимок разбирается потоково, по одной записи, поэтому в памяти не строится полный список записей.
+        Отсутствие снимка, журнала и резервных копий означает новый пустой каталог. Повреждённые данные никогда
+        не заменяются пустым каталогом: загрузка завершается ошибкой.
+
+        Возвращает:
+            Iterator[dict]: Записи книг в порядке добавления.
+
+        Исключения:
+            FileNotFoundError: Если снимка нет, но остались резервные копии.
+            ValueError: Если снимок или журнал содержат некорректные данные.
+        """
+        self.journal_size = self.journal_offset = 0
+        self._snapshot_stamp = self._stamp()
+        changes = self._read_journal() if os.path.exists(self.journal_path) else {}
+        try:
+            file = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            backup = self.backup_path(1)
+            if os.path.exists(backup):
+                raise FileNotFoundError(f"Файл {self.path} не найден. Восстановите его из резервной копии {backup}.")
+            file = None
+
+        if file is not None:
+            with file:
+                try:
+                    for record in iter_json_array(file):
+                        if record["id"] in changes:
+                            record = changes.pop(record["id"])
+                            if record is None:
+                                continue
+                        yield record
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Файл {self.path} повреждён: {e}.") from e
+
+        for record in changes.values():
+            if record is not None:
+                yield record
+
+    def _stamp(self) -> tuple | None:
+        """
+        Возвращает отметку файла снимка, которая меняется при каждой его перезаписи.
+
+        Возвращает:
+            tuple | None: Inode, время изменения в наносекундах и размер или None, если снимка нет.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_journal(self) -> dict[int, dict | None]:
+        """
+        Читает журнал начиная с journal_offset и сворачивает его в последнее состояние каждой изменённой книги.
+
+        Незавершённая последняя строка (обрыв записи при сбое или запись другого процесса, которая ещё идёт)
+        не читается. Файл при этом не обрезается: это делает append под блокировкой записи.
+
+        Возвращает:
+            dict[int, dict | None]: ID книги -> последняя запись книги или None, если книга удалена.
+        """
+        changes = {}
+        offset = self.journal_offset
+        with open(self.journal_path, "rb") as file:
+            file.seek(offset)
+            for number, line in enumerate(file, start=1):
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Журнал {self.journal_path} повреждён в строке {number}: {e}.") from e
+                if entry["op"] == "put":
+                    changes[entry["book"]["id"]] = entry["book"]
+                else:
+                    changes[entry["id"]] = None
+                offset += len(line)
+                self.journal_size += 1
+        self.journal_offset = offset
+        return changes
+
+    def save(self, records: Iterable[dict]) -> None:
+        """
+        Атомарно записывает снимок каталога и удаляет журнал, изменения из которого вошли в снимок.
+
+        Записи сериализуются по одной, полный список в памяти не строится.
+
+        Аргументы:
+            records (Iterable[dict]): Записи всех книг.
+        """
+        def write(file: TextIO) -> None:
+            if self.pretty:
+                def dumps(record: dict) -> str:
+                    return textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), "    ")
+                separator, opening, closing = ",\n", "[\n", "\n]"
+            else:
+                dumps = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+                separator, opening, closing = ",", "[", "]"
+            file.write(opening)
+            for number, record in enumerate(records):
+                if number:
+                    file.write(separator)
+                file.write(dumps(record))
+            file.write(closing)
+
+        self.bytes_written += write_atomically(self.path, write, backups=self.backups)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_size = self.journal_offset = 0
+        self._snapshot_stamp = self._stamp()
+
+    def append(self, changes: dict[int, dict | None]) -> None:
+        """
+        Дописывает изменения в журнал одной операцией записи.
+
+        Незавершённая строка в конце журнала (после journal_offset) осталась от прерванной записи и обрезается, чтобы
+        изменения начинались с новой строки. При совместном доступе append выполняется под блокировкой lock после
+        чтения изменений других процессов, поэтому чужая незавершённая запись здесь невозможна.
+
+        Аргументы:
+            changes (dict[int, dict | None]): ID книги -> новая запись книги или None, если книга удалена.
+        """
+        if not changes:
+            return
+        lines = []
+        for book_id, record in changes.items():
+            entry = {"op": "put", "book": record} if record is not None else {"op": "del", "id": book_id}
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        data = "".join(lines).encode("utf-8")
+        with open(self.journal_path, "ab") as file:
+            if file.seek(0, os.SEEK_END) > self.journal_offset:
+                file.truncate(self.journal_offset)
+            file.write(data)
+            self.journal_offset = file.tell()
+        self.bytes_written += len(data)
+        self.journal_size += len(lines)
+
+    def needs_compaction(self) -> bool:
+        """
+        Проверяет, накопилось ли в журнале достаточно записей для сжатия в новый снимок.
+
+        Возвращает:
+            bool: True, если журнал пора сжать.
+        """
+        return self.journal_size >= self.compact_every
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Захватывает исключительную блокировку fcntl файла "<storage_file>.lock" на время блока with.
+
+        Блоки могут быть вложенными: блокировка снимается при выходе из внешнего блока. Без fcntl (Windows)
+        ничего не блокирует.
+
+        Возвращает:
+            Iterator[None]: Контекстный менеджер.
+        """
+        if self._lock_depth or fcntl is None:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        with open(self.lock_path, "a") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def read_changes(self) -> dict[int, dict | None] | None:
+        """
+        Дочитывает журнал, дописанный другими процессами после загрузки, последнего сохранения или вызова.
+
+        Вызывается под блокировкой lock, иначе можно прочитать недописанную строку журнала. Проверка без изменений
+        стоит двух вызовов stat.
+
+        Возвращает:
+            dict[int, dict | None] | None: ID книги -> новая запись книги или None, если книга удалена;
+                None, если снимок перезаписан другим процессом и каталог нужно загрузить заново.
+
+        Исключения:
+            ValueError: Если журнал содержит некорректные данные.
+        """
+        if self._stamp() != self._snapshot_stamp:
+            return None
+        try:
+            size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self.journal_offset:
+            return None
+        if size == self.journal_offset:
+            return {}
+        return self._read_journal()
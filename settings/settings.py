@@ -9,3 +9,42 @@ APP_NAME = ('╔╗──╔══╗╔══╗─╔═══╗╔══╗
 
 # Все возможные статусы книг, можно дополнять собственными
 STATUSES = {"в наличии", "выдана"}
+
+# Максимальное количество результатов полнотекстового поиска, выводимых в консоль
+SEARCH_LIMIT = 20
+
+# Количество результатов поиска по критериям, которые библиотека запоминает до изменения каталога (0 - без кэша)
+QUERY_CACHE_SIZE = 256
+
+# Файл журнала выдач и возвратов книг (None - не вести журнал)
+CIRCULATION_FILE = "data/library.circulation"
+
+# Количество дней, за которые консоль показывает отчёт о выдачах
+CIRCULATION_REPORT_DAYS = 30
+
+# Дописывать изменения в журнал рядом с data/library.json вместо перезаписи всего файла после каждого действия
+USE_JOURNAL = True
+
+# Количество записей журнала изменений, после которого он сжимается в новый снимок data/library.json
+JOURNAL_COMPACT_EVERY = 1000
+
+# Количество резервных копий снимка data/library.json (data/library.json.1 - самая свежая)
+SNAPSHOT_BACKUPS = 1
+
+# Разрешить нескольким запущенным приложениям работать с data/library.json одновременно
+SHARED_STORAGE = True
+
+# Адрес и порт HTTP/JSON API (python -m service.server)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+
+# Размер страницы списка книг в консоли и в API по умолчанию и наибольший допустимый размер
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 1000
+
+# Собирать количество и длительность вызовов методов библиотеки (Library.stats, GET /stats)
+COLLECT_METRICS = False
+
+# Период записи статистики в METRICS_FILE в миллисекундах (None - не записывать)
+METRICS_INTERVAL = None
+METRICS_FILE = "data/metrics.jsonl"
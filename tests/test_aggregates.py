@@ -0,0 +1,87 @@
+import pytest
+
+from service.aggregates import Aggregates
+from service.library import Library
+
+
+def recount(library: Library) -> Aggregates:
+    """Подсчитывает показатели обходом всех книг."""
+    aggregates = Aggregates(library._aggregates._outstanding)
+    for book in library._records():
+        aggregates.add(book)
+    return aggregates
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}])
+def test_summary_matches_recount(tmp_path, options):
+    """Показатели, обновляемые при изменениях, совпадают с подсчитанными обходом каталога."""
+    library = Library(storage_file=str(tmp_path / "library.json"), **options)
+    first = library.add_book(title="Book", author="Author", year=1995)
+    library.add_book(title="Other", author="Author", year=2004)
+    assert library.summary() == {
+        "books": 2, "available": 2, "issued": 0, "copies": 2, "statuses": {"в наличии": 2, "выдана": 0},
+        "authors": 1,
+    }
+
+    library.add_book(title="Book", author="Author", year=1995)  # Ещё один экземпляр
+    last = library.add_book(title="Last", author="Writer", year=1999)
+    lost = library.add_book(title="Lost", author="Writer", year=1980)
+    assert library.update_status(first.book_id, "выдана")
+    assert library.update_status(first.book_id, "выдана")
+    assert not library.update_status(first.book_id, "выдана")
+    assert library.update_status(last.book_id, "выдана")
+    assert library.update_status(last.book_id, "в наличии")
+    assert library.update_status(lost.book_id, "выдана")
+    assert library.summary()["issued"] == 3
+    library.remove_book(last.book_id)
+    library.remove_book(lost.book_id)  # Выданный экземпляр списывается вместе с книгой
+
+    summary = library.summary()
+    assert summary == recount(library).summary()
+    assert (summary["available"], summary["issued"], summary["copies"]) == (1, 2, 3)
+    assert summary["statuses"] == {"в наличии": 1, "выдана": 1}
+    assert (library.count_by_author("Author"), library.count_by_author("Writer")) == (2, 0)
+    assert (library.count_by_year(1995), library.count_by_year(1999)) == (1, 0)
+    assert library.books_per_decade() == {1990: 1, 2000: 1}
+    assert library.top_authors(5) == [("Author", 2)]
+
+
+def test_issued_restored_from_circulation(tmp_path):
+    """Количество выданных экземпляров восстанавливается по журналу выдач после перезапуска."""
+    options = {
+        "storage_file": str(tmp_path / "library.json"), "circulation_file": str(tmp_path / "library.circulation")
+    }
+    library = Library(**options)
+    book = library.add_book(title="Book", author="Author", year=2000)
+    library.add_book(title="Book", author="Author", year=2000)
+    library.update_status(book.book_id, "выдана")
+    removed = library.add_book(title="Removed", author="Author", year=2000)
+    library.update_status(removed.book_id, "выдана")
+    library.remove_book(removed.book_id)
+    library.close()
+
+    library = Library(**options)
+    assert library.summary()["issued"] == 1
+    assert library.summary()["copies"] == 2
+    library.close()
+
+
+def test_summary_after_restart_ignores_removed_books(tmp_path):
+    """Выданные экземпляры удалённой книги не учитываются после перезапуска, в том числе для новой книги."""
+    options = {
+        "storage_file": str(tmp_path / "library.json"), "circulation_file": str(tmp_path / "library.circulation")
+    }
+    library = Library(**options)
+    library.add_book(title="Book", author="Author", year=2000)
+    removed = library.add_book(title="Removed", author="Author", year=2001)
+    library.update_status(removed.book_id, "выдана")
+    library.remove_book(removed.book_id)
+    library.close()
+
+    library = Library(**options)
+    library.add_book(title="New", author="Author", year=2002)
+    summary = library.summary()
+    assert (summary["books"], summary["available"], summary["issued"], summary["copies"]) == (2, 2, 0, 2)
+    assert summary["statuses"] == {"в наличии": 2, "выдана": 0}
+    assert library._aggregates._outstanding == {}
+    library.close()
@@ -0,0 +1,67 @@
+import json
+
+from service.binary import BinaryStorage, MappedBooks, binary_to_json, json_to_binary
+from service.library import Library
+
+
+def make_json(path, ids):
+    books = [
+        {"id": book_id, "title": f"Книга {book_id}", "author": "Автор", "year": 2000, "status": "в наличии", "count": 1}
+        for book_id in ids
+    ]
+    path.write_text(json.dumps(books, ensure_ascii=False), encoding="utf-8")
+    return books
+
+
+def test_convert_round_trip(tmp_path):
+    """JSON -> двоичный формат -> JSON сохраняет все данные и порядок книг."""
+    books = make_json(tmp_path / "library.json", [1, 2, 3, 7, 10])
+    json_to_binary(str(tmp_path / "library.json"), str(tmp_path / "library.bin"))
+    binary_to_json(str(tmp_path / "library.bin"), str(tmp_path / "copy.json"))
+
+    assert json.loads((tmp_path / "copy.json").read_text(encoding="utf-8")) == books
+
+
+def test_mapped_books_lookup(tmp_path):
+    """Книги находятся по ID как при сплошной нумерации, так и с пропусками."""
+    make_json(tmp_path / "library.json", [1, 2, 3, 7, 10])
+    json_to_binary(str(tmp_path / "library.json"), str(tmp_path / "library.bin"))
+    books = MappedBooks(str(tmp_path / "library.bin"))
+
+    assert books[2].title == "Книга 2"
+    assert books[10].title == "Книга 10"
+    assert 5 not in books and 11 not in books
+    assert list(books) == [1, 2, 3, 7, 10]
+    assert books.max_id() == 10
+    books.close()
+
+
+def test_binary_library(tmp_path):
+    """Двоичная библиотека изменяет, сохраняет и заново отображает каталог."""
+    storage_file = str(tmp_path / "library.bin")
+    library = Library(storage_file=storage_file, storage_format="binary")
+    first = library.add_book(title="Book 1", author="Author I", year=2000)
+    library.add_book(title="Book 2", author="Author II", year=2010)
+    library.add_book(title="Book 3", author="Author III", year=2020)
+    assert library.update_status(first.book_id, "выдана") is True
+    assert library.remove_book(2) is True
+    assert library.find_book_by_id(1) is first
+    library.close()
+
+    reloaded = Library(storage_file=storage_file, storage_format="binary")
+    assert [(book.book_id, book.status) for book in reloaded.books] == [(1, "выдана"), (3, "в наличии")]
+    assert [book.title for book in reloaded.find_books(author="author iii")] == ["Book 3"]
+    assert reloaded.add_book(title="Book 4", author="Author IV", year=2021).book_id == 4
+    reloaded.close()
+
+
+def test_binary_storage_load_and_append(tmp_path):
+    """Двоичное хранилище отдаёт записи и применяет изменения перезаписью файла."""
+    books = make_json(tmp_path / "library.json", [1, 2, 3])
+    json_to_binary(str(tmp_path / "library.json"), str(tmp_path / "library.bin"))
+    storage = BinaryStorage(str(tmp_path / "library.bin"))
+    assert list(storage.load()) == books
+
+    added = dict(books[0], id=4, title="Книга 4")
+    storage.append({2: None, 3: dict(books[2], status="выдана", count=0), 4: added})
+    assert list(storage.load()) == [books[0], dict(books[2], status="выдана", count=0), added]
@@ -0,0 +1,97 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from service import bulk
+from service.bulk import export_books, import_books
+from service.library import Library
+
+
+def test_import_csv(tmp_path, monkeypatch):
+    """Импорт CSV объединяет дубликаты, сообщает о плохих строках и сохраняет библиотеку один раз."""
+    source = tmp_path / "books.csv"
+    source.write_text(
+        "title,author,year\n"
+        "Война и мир,Лев Толстой,1869\n"
+        "война и мир,ЛЕВ ТОЛСТОЙ,1869\n"
+        ",Автор,2000\n"
+        "Книга,Автор 2,2000\n"
+        "Книга,Автор,год\n"
+        "Анна Каренина,Лев Толстой,1878\n",
+        encoding="utf-8",
+    )
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    library.add_book(title="Анна Каренина", author="Лев Толстой", year=1878)
+    saves = []
+    monkeypatch.setattr(library._storage, "save", lambda records: saves.append(len(list(records))))
+
+    report = import_books(library, str(source), batch_size=2)
+
+    assert (report.added, report.merged, report.rejected) == (1, 2, 3)
+    assert [number for number, _ in report.errors] == [4, 5, 6]
+    assert [(book.title, book.count) for book in library.books] == [("Анна Каренина", 2), ("Война и мир", 2)]
+    assert saves == [2]
+
+
+def test_import_jsonl_and_export(tmp_path):
+    """JSON Lines импортируется с отчётом о некорректных строках и экспортируется обратно."""
+    source = tmp_path / "books.jsonl"
+    source.write_text(
+        '{"title": "Book 1", "author": "Author", "year": 2000}\n'
+        "not json\n"
+        "\n"
+        '{"title": "Book 2", "author": "Author", "year": "2010"}\n',
+        encoding="utf-8",
+    )
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    report = import_books(library, str(source))
+    assert (report.added, report.rejected, report.errors[0][0]) == (2, 1, 2)
+
+    target = tmp_path / "export.jsonl"
+    assert export_books(library, str(target)) == 2
+    records = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert records == [book.to_dict() for book in library.books]
+
+
+class CountingPool(ProcessPoolExecutor):
+    """Пул процессов, запоминающий количество отправленных в него порций."""
+
+    submitted = 0
+
+    def map(self, func, *iterables, **kwargs):
+        chunks = list(iterables[0])
+        CountingPool.submitted += len(chunks)
+        return super().map(func, chunks, *iterables[1:], **kwargs)
+
+
+def test_import_with_process_pool(tmp_path, monkeypatch):
+    """Проверка строк в пуле процессов даёт тот же отчёт, что и в текущем процессе."""
+    monkeypatch.setattr("utils.validators.VALIDATION_CHUNK_SIZE", 4)
+    monkeypatch.setattr(bulk, "VALIDATION_CHUNK_SIZE", 4)
+    monkeypatch.setattr(bulk, "ProcessPoolExecutor", CountingPool)
+    monkeypatch.setattr(CountingPool, "submitted", 0)
+    source = tmp_path / "books.csv"
+    source.write_text("title,author,year\n" + "Book,Author,2000\n,Author,2000\n" * 20, encoding="utf-8")
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    report = import_books(library, str(source), workers=2)
+    assert CountingPool.submitted > 1
+    assert (report.added, report.merged, report.rejected) == (1, 19, 20)
+    assert report.errors[0] == (3, "Название книги не может быть пустым.")
+
+
+def test_main_shares_library_file(tmp_path, monkeypatch, capsys):
+    """Импорт открывает библиотеку в режиме совместного доступа и не перезаписывает книги консоли."""
+    storage_file = str(tmp_path / "library.json")
+    source = tmp_path / "books.csv"
+    source.write_text("title,author,year\nImported,Author,2010\n", encoding="utf-8")
+    console = Library(storage_file=storage_file, journal=True, shared=True)
+
+    def import_after_console(library, *args, **kwargs):
+        console.add_book(title="Console", author="Author", year=2000)
+        return import_books(library, *args, **kwargs)
+
+    monkeypatch.setattr(bulk, "import_books", import_after_console)
+    bulk.main(["import", str(source), "--storage", storage_file])
+
+    assert [(book.book_id, book.title) for book in Library(storage_file=storage_file, journal=True).books] == [
+        (1, "Console"), (2, "Imported")
+    ]
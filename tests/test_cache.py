@@ -0,0 +1,38 @@
+from service.cache import QueryCache
+from service.library import Library
+
+
+def test_query_cache_lru_and_generations():
+    """Кэш вытесняет давно не использованный результат и не отдаёт результаты прошлых поколений."""
+    cache = QueryCache(capacity=2)
+    cache.put("a", (1,))
+    cache.put("b", (2,))
+    assert cache.get("a") == (1,)
+    cache.put("c", (3,))
+    assert cache.get("b") is None
+    assert cache.get("c") == (3,)
+
+    cache.invalidate()
+    assert cache.get("a") is None
+    assert cache.stats() == {"entries": 1, "capacity": 2, "hits": 2, "misses": 2, "generation": 1}
+
+
+def test_find_books_cache_invalidation(tmp_path):
+    """Повторный поиск берётся из кэша, а добавление и удаление книг делают кэш устаревшим."""
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    first = library.add_book(title="Book", author="Author", year=2000)
+    assert library.find_books(author="author") == [first]
+    assert library.find_books(author="AUTHOR") == [first]
+    assert library._query_cache.hits == 1
+
+    # Выдача не меняет состав результата: книга берётся из каталога с актуальным статусом
+    library.update_status(first.book_id, "выдана")
+    assert library.find_books(author="Author")[0].status == "выдана"
+    assert library._query_cache.hits == 2
+
+    second = library.add_book(title="Other", author="Author", year=2001)
+    assert library.find_books(author="Author") == [first, second]
+    library.remove_book(first.book_id)
+    assert library.find_books(author="Author") == [second]
+    assert library.find_books(title="book", author="author", year=2000) == []
+    assert library.stats()["query_cache"]["hits"] == 2
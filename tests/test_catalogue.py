@@ -0,0 +1,81 @@
+from service.book import Book
+from service.catalogue import BookRecord, ColumnarBooks, LazyBooks
+from service.library import Library
+
+
+def test_lazy_books_materialize_on_access():
+    """Объект Book создаётся при первом обращении и затем переиспользуется."""
+    books = LazyBooks([BookRecord(1, "Book 1", "Author I", 2000, "в наличии", 1)])
+    assert isinstance(next(iter(books.records())), BookRecord)
+
+    book = books[1]
+    book.count = 5
+    assert books[1] is book
+    assert next(iter(books.records())).to_dict()["count"] == 5
+
+
+def test_lazy_library(tmp_path):
+    """Ленивая библиотека ищет и сохраняет книги так же, как обычная."""
+    storage_file = str(tmp_path / "library.json")
+    library = Library(storage_file=storage_file)
+    library.add_book(title="Book 1", author="Author I", year=2000)
+    library.add_book(title="Book 2", author="Author II", year=2010)
+
+    lazy = Library(storage_file=storage_file, lazy=True)
+    assert all(isinstance(item, BookRecord) for item in lazy._books.records())
+    assert [book.title for book in lazy.find_books(author="author ii")] == ["Book 2"]
+    assert lazy.update_status(1, "выдана") is True
+    assert lazy.add_book(title="Book 3", author="Author III", year=2020).book_id == 3
+
+    reloaded = Library(storage_file=storage_file)
+    assert [(book.book_id, book.count) for book in reloaded.books] == [(1, 0), (2, 1), (3, 1)]
+
+
+def test_columnar_books_views_write_through():
+    """Изменения через BookView сразу попадают в столбцы каталога."""
+    books = ColumnarBooks([BookRecord(1, "Book 1", "Author I", 2000, "в наличии", 1)])
+    books[2] = Book(2, "Book 2", "Author I", 2010)
+
+    view = books[1]
+    view.count -= 1
+    view.status = "выдана"
+    assert books[1] == view
+    assert (books[1].count, books[1].status) == (0, "выдана")
+    assert books.authors[0] is books.authors[1]
+    assert str(books[2]) == str(Book(2, "Book 2", "Author I", 2010))
+
+
+def test_columnar_books_delete_and_vacuum():
+    """Удалённые строки не видны и вычищаются, когда их становится больше половины."""
+    books = ColumnarBooks(
+        BookRecord(book_id, f"Book {book_id}", "Author", 2000, "в наличии", 1) for book_id in range(1, 5)
+    )
+
+    removed = books.pop(2)
+    assert removed.to_dict()["title"] == "Book 2"
+    assert 2 not in books and list(books) == [1, 3, 4]
+    assert books.pop(2, None) is None
+
+    del books[1]
+    del books[4]
+    assert len(books.ids) == 1 and list(books) == [3]
+    assert [record.book_id for record in books.records()] == [3]
+
+
+def test_columnar_library(tmp_path):
+    """Столбцовая библиотека ведёт себя так же, как обычная."""
+    storage_file = str(tmp_path / "library.json")
+    library = Library(storage_file=storage_file, columnar=True)
+    first = library.add_book(title="Book 1", author="Author I", year=2000)
+    library.add_book(title="Book 2", author="Author II", year=2010)
+    assert library.add_book(title="book 1", author="author i", year=2000) == first
+    assert first.count == 2
+
+    assert library.update_status(2, "выдана") is True
+    assert library.remove_book(1) is True
+    assert [book.title for book in library.find_books(year_from=2000)] == ["Book 2"]
+
+    reloaded = Library(storage_file=storage_file, columnar=True)
+    assert [book.to_dict() for book in reloaded.books] == [
+        {"id": 2, "title": "Book 2", "author": "Author II", "year": 2010, "status": "выдана", "count": 0}
+    ]
@@ -0,0 +1,119 @@
+import pytest
+
+from service.circulation import EVENT, ISSUE, RETURN, CirculationEvent, CirculationLog
+from service.library import Library
+
+
+def test_circulation_queries_and_reload(tmp_path):
+    """События находятся по книге и периоду, переживают перезапуск, а неполная запись отбрасывается."""
+    path = str(tmp_path / "library.circulation")
+    now = iter([100.0, 110.0, 105.0, 200.0, 300.0])
+    log = CirculationLog(path, clock=lambda: next(now))
+    log.record(1, ISSUE)
+    log.record(2, ISSUE)
+    log.record(1, RETURN)  # Часы отстали: время не убывает
+    log.record(1, ISSUE)
+    log.record(3, ISSUE)
+    with pytest.raises(ValueError):
+        log.record(1, "списание")
+    log.close()
+    with open(path, "ab") as file:
+        file.write(b"\x00" * (EVENT.size - 1))
+
+    log = CirculationLog(path)
+    assert len(log) == 5
+    assert log.history(1) == [
+        CirculationEvent(100.0, 1, ISSUE), CirculationEvent(110.0, 1, RETURN), CirculationEvent(200.0, 1, ISSUE)
+    ]
+    assert log.history(1, since=105, until=150) == [CirculationEvent(110.0, 1, RETURN)]
+    assert [event.book_id for event in log.events(since=110, until=200)] == [2, 1, 1]
+    assert (log.count(ISSUE, since=150), log.count(RETURN)) == (2, 1)
+    assert log.most_borrowed(2) == [(1, 2), (2, 1)]
+    assert log.most_borrowed(5, since=150) == [(1, 1), (3, 1)]
+    assert log.outstanding() == {1: 1, 2: 1, 3: 1}
+    assert (tmp_path / "library.circulation").stat().st_size == 6 * EVENT.size - 1  # Обрезается при записи
+    log.record(2, RETURN)
+    log.close()
+    assert (tmp_path / "library.circulation").stat().st_size == 6 * EVENT.size
+    assert len(CirculationLog(path)) == 6
+
+
+def test_library_records_circulation(tmp_path):
+    """Успешные выдачи и возвраты записываются в журнал, отказ в выдаче - нет."""
+    library = Library(storage_file=str(tmp_path / "library.json"),
+                      circulation_file=str(tmp_path / "library.circulation"))
+    first = library.add_book(title="Book", author="Author", year=2000)
+    second = library.add_book(title="Other", author="Author", year=2001)
+    assert library.update_status(first.book_id, "выдана") is True
+    assert library.update_status(first.book_id, "выдана") is False
+    assert library.update_status(first.book_id, "в наличии") is True
+    assert library.update_status(first.book_id, "выдана") is True
+    assert library.update_status(second.book_id, "выдана") is True
+
+    assert [event.kind for event in library.circulation.history(first.book_id)] == [ISSUE, RETURN, ISSUE]
+    assert library.most_borrowed(1) == [(first, 2)]
+    library.remove_book(first.book_id)
+    assert library.most_borrowed(2) == [(second, 1)]
+    library.close()
+
+
+def test_removed_book_ids_are_not_reused(tmp_path):
+    """После перезапуска новая книга не получает ID удалённой книги и не наследует её историю выдач."""
+    options = {
+        "storage_file": str(tmp_path / "library.json"), "circulation_file": str(tmp_path / "library.circulation")
+    }
+    library = Library(**options)
+    library.add_book(title="Book", author="Author", year=2000)
+    removed = library.add_book(title="Removed", author="Author", year=2001)
+    library.update_status(removed.book_id, "выдана")
+    library.remove_book(removed.book_id)
+    library.close()
+
+    library = Library(**options)
+    new = library.add_book(title="New", author="Author", year=2002)
+    assert new.book_id == 3
+    assert library.circulation.history(new.book_id) == []
+    assert library.most_borrowed(5) == []
+    library.close()
+
+
+def test_circulation_shared_between_processes(tmp_path):
+    """Журналы одного файла видят события друг друга, а время в файле не убывает при отстающих часах."""
+    path = str(tmp_path / "library.circulation")
+    first = CirculationLog(path, clock=lambda: 200.0)
+    second = CirculationLog(path, clock=lambda: 100.0)
+    first.record(1, ISSUE)
+    second.record(2, ISSUE)  # Сначала дочитывает событие первого журнала
+    assert first.refresh() == [CirculationEvent(200.0, 2, ISSUE)]
+    assert first.refresh() == []
+    assert first.most_borrowed(5) == [(1, 1), (2, 1)]
+    first.close()
+    second.close()
+
+    reloaded = CirculationLog(path)
+    assert [event.time for event in reloaded.events()] == [200.0, 200.0]
+    assert [event.book_id for event in reloaded.events(since=150)] == [1, 2]
+
+
+def test_shared_libraries_see_each_others_circulation(tmp_path):
+    """Библиотеки с общим файлом видят выдачи друг друга в журнале и сводке после refresh."""
+    options = {
+        "storage_file": str(tmp_path / "library.json"), "circulation_file": str(tmp_path / "library.circulation"),
+        "journal": True, "shared": True,
+    }
+    first = Library(**options)
+    second = Library(**options)
+    book = first.add_book(title="Book", author="Author", year=2000)
+    first.add_book(title="Book", author="Author", year=2000)
+    assert second.summary()["issued"] == 0
+
+    assert first.update_status(book.book_id, "выдана") is True
+    second.refresh()
+    assert second.circulation.count(ISSUE) == 1
+    assert [(found.book_id, count) for found, count in second.most_borrowed(5)] == [(book.book_id, 1)]
+    assert second.summary()["issued"] == 1
+    assert second.update_status(book.book_id, "в наличии") is True
+    first.refresh()
+    assert first.summary()["issued"] == 0
+    first.close()
+    second.close()
@@ -67,3 +67,26 @@ def test_save_after_action():
     assert result == book  # Проверяем, что метод возвращает правильный результат
     assert book in library.books  # Проверяем, что книга добавлена
     library.save_books.assert_called_once()  # Проверяем, что save_books был вызван
+
+
+def test_save_after_action_uses_schedule_save():
+    """Если объект умеет откладывать запись, save_books не вызывается напрямую."""
+    library = HelperLibrary()
+    library.schedule_save = Mock()
+
+    library.add_book({"title": "Test Book"})
+
+    library.schedule_save.assert_called_once()
+    library.save_books.assert_not_called()
+
+
+def test_log_action_returns_result(capfd):
+    """log_action печатает вызов и результат и возвращает результат функции."""
+    from utils.decorators import log_action
+
+    @log_action
+    def add(first, second):
+        return first + second
+
+    assert add(1, 2) == 3
+    assert "Результат: 3" in capfd.readouterr().out
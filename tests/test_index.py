@@ -0,0 +1,115 @@
+from service.book import Book
+from service.index import BookIndex
+
+
+def test_find_key_case_insensitive():
+    """Составной индекс не учитывает регистр названия и автора."""
+    index = BookIndex()
+    index.add(Book(book_id=1, title="Искусство программирования", author="Дональд Кнут", year=1968))
+
+    assert index.find_key("искусство ПРОГРАММИРОВАНИЯ", "дональд кнут", 1968) == 1
+    assert index.find_key("Искусство программирования", "Дональд Кнут", 1969) is None
+
+
+def test_remove_keeps_other_book_with_same_key():
+    """Удаление книги не затрагивает ключ, принадлежащий другой книге."""
+    index = BookIndex()
+    first = Book(book_id=1, title="Book", author="Author", year=2000)
+    duplicate = Book(book_id=2, title="book", author="author", year=2000)
+    index.add(first)
+    index.add(duplicate)
+
+    index.remove(duplicate)
+    assert index.find_key("Book", "Author", 2000) == 1
+
+    index.remove(first)
+    assert index.find_key("Book", "Author", 2000) is None
+
+
+def test_remove_moves_key_to_remaining_book():
+    """После удаления первой книги ключ указывает на оставшуюся книгу с тем же ключом."""
+    index = BookIndex()
+    books = [
+        Book(book_id=1, title="Book", author="Author", year=2000),
+        Book(book_id=2, title="Book", author="Other", year=2000),
+        Book(book_id=3, title="BOOK", author="author", year=2000),
+        Book(book_id=4, title="book", author="AUTHOR", year=2000),
+    ]
+    for book in books:
+        index.add(book)
+
+    index.remove(books[0])
+    assert index.find_key("Book", "Author", 2000) == 3
+
+    index.remove(books[2])
+    assert index.find_key("Book", "Author", 2000) == 4
+
+    index.remove(books[3])
+    assert index.find_key("Book", "Author", 2000) is None
+
+
+def test_find_intersects_criteria_in_insertion_order():
+    """Поиск по нескольким полям возвращает пересечение в порядке добавления книг."""
+    index = BookIndex()
+    books = [
+        Book(book_id=1, title="Book 1", author="Author I", year=2000),
+        Book(book_id=2, title="Book 2", author="Author II", year=2010),
+        Book(book_id=3, title="Book 3", author="Author II", year=2012),
+        Book(book_id=4, title="Book 3", author="Author III", year=2012),
+    ]
+    for book in books:
+        index.add(book)
+
+    assert index.find(author="author ii") == [2, 3]
+    assert index.find(title="BOOK 3", year=2012) == [3, 4]
+    assert index.find(title="Book 3", author="Author III") == [4]
+    assert index.find(title="Book", author="Author II") == []
+    assert index.find() is None
+
+    index.remove(books[2])
+    assert index.find(author="Author II") == [2]
+    assert index.find(year=2012) == [4]
+
+
+def test_year_range():
+    """Диапазон годов выбирается по отсортированному индексу и поддерживается при удалении."""
+    index = BookIndex()
+    books = [
+        Book(book_id=1, title="Book 1", author="Author I", year=1970),
+        Book(book_id=2, title="Book 2", author="Author II", year=1950),
+        Book(book_id=3, title="Book 3", author="Author II", year=1980),
+        Book(book_id=4, title="Book 4", author="Author I", year=1960),
+    ]
+    for book in books:
+        index.add(book)
+
+    assert index.find_year_range(1950, 1970) == [2, 4, 1]
+    assert index.find_year_range(year_from=1975) == [3]
+    assert index.find(year_from=1950, year_to=1970) == [1, 2, 4]
+    assert index.find(author="Author I", year_from=1965) == [1]
+
+    index.remove(books[3])
+    assert index.find_year_range(1955, 1965) == []
+    assert index._sorted_years == [1950, 1970, 1980]
+
+
+def test_sorted_ids_follow_changes():
+    """Отсортированные списки полей поддерживаются при добавлении и удалении книг после первой сортировки."""
+    index = BookIndex()
+    books = [
+        Book(book_id=1, title="Война и мир", author="Лев Толстой", year=1869),
+        Book(book_id=2, title="Анна Каренина", author="Лев Толстой", year=1878),
+        Book(book_id=3, title="белые ночи", author="Фёдор Достоевский", year=1848),
+    ]
+    for book in books:
+        index.add(book)
+
+    assert index.sorted_ids("title") == [2, 3, 1]
+    assert index.sorted_ids("year", descending=True, limit=2) == [2, 1]
+    assert index.sorted_ids("author", offset=1) == [2, 3]
+    assert index.sorted_ids("count") is None
+
+    index.add(Book(book_id=4, title="Бесы", author="Фёдор Достоевский", year=1872))
+    index.remove(books[1])
+    assert index.sorted_ids("title") == [3, 4, 1]
+    assert index.sorted_ids("author", descending=True) == [4, 3, 1]
@@ -5,3 +5,81 @@ def test_validate_input(monkeypatch):
     monkeypatch.setattr("builtins.input", lambda _: "Test Title")
     result = validate_input("Enter title: ", validation_func=lambda x: x)
     assert result == "Test Title"
+
+
+def test_display_books_paging(runner, monkeypatch, capsys, tmp_path):
+    from service.library import Library
+
+    runner.library = Library(storage_file=str(tmp_path / "library.json"))
+    for number in range(3):
+        runner.library.add_book(title=f"Book {number}", author="Author", year=2000)
+    monkeypatch.setattr("service.runner.PAGE_SIZE", 2)
+    answers = iter(["", "1", "0"])
+    monkeypatch.setattr("builtins.input", lambda _: next(answers))
+
+    runner.display_books_interactive()
+
+    output = capsys.readouterr().out
+    assert [line for line in output.splitlines() if "страница" in line] == [
+        "Список всех книг, страница 1 из 2:", "Список всех книг, страница 2 из 2:", "Список всех книг, страница 1 из 2:"
+    ]
+
+
+def test_sorted_books_interactive(runner, monkeypatch, capsys, tmp_path):
+    from service.library import Library
+
+    runner.library = Library(storage_file=str(tmp_path / "library.json"))
+    for year in (2001, 2003, 2002):
+        runner.library.add_book(title=f"Book {year}", author="Author", year=year)
+    answers = iter(["3", "2"])
+    monkeypatch.setattr("builtins.input", lambda _: next(answers))
+
+    runner.sorted_books_interactive()
+
+    output = capsys.readouterr().out
+    assert output.index("Book 2003") < output.index("Book 2002") < output.index("Book 2001")
+
+
+def test_circulation_report(runner, capsys, tmp_path):
+    from service.library import Library
+
+    runner.library = Library(storage_file=str(tmp_path / "library.json"),
+                             circulation_file=str(tmp_path / "library.circulation"))
+    book = runner.library.add_book(title="Book", author="Author", year=2000)
+    runner.library.update_status(book.book_id, "выдана")
+
+    runner.circulation_report_interactive()
+
+    output = capsys.readouterr().out
+    assert "выдач - 1, возвратов - 0" in output
+    assert "Выдач: 1" in output
+
+
+def test_summary_interactive(runner, capsys, tmp_path):
+    from service.library import Library
+
+    runner.library = Library(storage_file=str(tmp_path / "library.json"))
+    for year in (1995, 2004):
+        runner.library.add_book(title=f"Book {year}", author="Author", year=year)
+
+    runner.summary_interactive()
+
+    output = capsys.readouterr().out
+    assert "Книг: 2, авторов: 1." in output
+    assert "Author | Книг: 2" in output
+    assert "1990-е | Книг: 1" in output
+
+
+def test_menu_keeps_exit_key(runner, monkeypatch, capsys, tmp_path):
+    import pytest
+
+    from service.library import Library
+
+    runner.library = Library(storage_file=str(tmp_path / "library.json"))
+    monkeypatch.setattr("builtins.input", lambda _: "6")
+
+    with pytest.raises(SystemExit):
+        runner.run()
+
+    output = capsys.readouterr().out
+    assert "6. Выйти" in output and "11. Сводка по библиотеке" in output
@@ -1,5 +1,13 @@
+import multiprocessing
+import random
+import sys
+import threading
+import time
+
 import pytest
 
+from service.library import Library
+
 
 @pytest.mark.parametrize(
     "title, author, year, count",
@@ -59,6 +67,54 @@ def test_display_books_true(library):
     assert books is True
 
 
+def test_display_books_page(tmp_path):
+    """Страница выводится одной записью, а выход за конец каталога ничего не выводит."""
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    for number in range(5):
+        library.add_book(title=f"Book {number}", author="Author", year=2000 + number)
+
+    class Output:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+
+    output = Output()
+    assert library.display_books(offset=1, limit=2, file=output) is True
+    assert output.writes == [f"{library.find_book_by_id(2)}\n{library.find_book_by_id(3)}\n"]
+    assert library.display_books(offset=5, limit=2, file=output) is False
+    assert library.count_books() == 5
+
+
+@pytest.mark.parametrize("storage_format", ["json", "sqlite"])
+def test_sorted_and_top_books(tmp_path, storage_format):
+    """Книги упорядочиваются по полям индекса и по количеству экземпляров одинаково во всех хранилищах."""
+    library = Library(storage_file=str(tmp_path / "library"), storage_format=storage_format)
+    for title, author, year in (
+            ("Война и мир", "Лев Толстой", 1869),
+            ("Анна Каренина", "Лев Толстой", 1878),
+            ("Бесы", "Фёдор Достоевский", 1872),
+            ("анна каренина", "лев толстой", 1878),
+    ):
+        library.add_book(title=title, author=author, year=year)
+    library.update_status(book_id=3, status="выдана")
+
+    def ids(books):
+        return [book.book_id for book in books]
+
+    books, total = library.sorted_books("title", offset=1, limit=5)
+    assert (ids(books), total) == ([3, 1], 3)
+    assert ids(library.sorted_books("year", descending=True)[0]) == [2, 3, 1]
+    assert ids(library.sorted_books("count")[0]) == [3, 1, 2]
+    assert ids(library.sorted_books("count", descending=True, limit=2)[0]) == [2, 1]
+    assert ids(library.top_books(1, "year")) == [2]
+    assert ids(library.top_books(2)) == [2, 1]
+    with pytest.raises(ValueError):
+        library.sorted_books("status")
+    library.close()
+
+
 def test_update_status(library):
     # Выдача книги
     result1 = library.update_status(book_id=1, status="выдана")
@@ -83,3 +139,182 @@ def test_remove_book(library):
     [library.remove_book(book_id=i) for i in range(2, 5)]
 
 
+def test_find_book_by_id_after_remove(tmp_path):
+    """Индекс по ID синхронизирован с добавлением и удалением книг."""
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    first = library.add_book(title="Book 1", author="Author I", year=2000)
+    second = library.add_book(title="Book 2", author="Author II", year=2010)
+
+    assert library.find_book_by_id(first.book_id) is first
+    assert library.remove_book(first.book_id) is True
+    assert library.find_book_by_id(first.book_id) is None
+    assert library.books == [second]
+
+    # После перезагрузки индекс строится из файла
+    reloaded = Library(storage_file=str(tmp_path / "library.json"))
+    assert reloaded.find_book_by_id(second.book_id).title == "Book 2"
+    assert reloaded.add_book(title="Book 3", author="Author III", year=2020).book_id == second.book_id + 1
+
+
+def test_batch_saves_once(tmp_path, monkeypatch):
+    """Внутри batch сохранение откладывается до выхода из внешнего блока."""
+    library = Library(storage_file=str(tmp_path / "library.json"))
+    saves = []
+    monkeypatch.setattr(library._storage, "save", lambda records: saves.append(len(list(records))))
+
+    with library.batch():
+        for number in range(50):
+            library.add_book(title=f"Book {number}", author="Author", year=2000)
+        with library.batch():
+            library.remove_book(1)
+        assert saves == []
+
+    assert saves == [49]
+
+
+def test_flush_every(tmp_path, monkeypatch):
+    """С flush_every изменения сохраняются после каждых N действий и при закрытии."""
+    library = Library(storage_file=str(tmp_path / "library.json"), flush_every=10)
+    saves = []
+    monkeypatch.setattr(library._storage, "save", lambda records: saves.append(len(list(records))))
+
+    for number in range(25):
+        library.add_book(title=f"Book {number}", author="Author", year=2000)
+    assert saves == [10, 20]
+
+    library.close()
+    assert saves == [10, 20, 25]
+
+
+def test_flush_interval(tmp_path):
+    """С flush_interval изменения сохраняет фоновый поток."""
+    storage_file = tmp_path / "library.json"
+    library = Library(storage_file=str(storage_file), flush_interval=10)
+    library.add_book(title="Book 1", author="Author I", year=2000)
+
+    for _ in range(100):
+        if storage_file.exists():
+            break
+        time.sleep(0.01)
+    library.close()
+    assert len(Library(storage_file=str(storage_file)).books) == 1
+
+
+def test_concurrent_circulation(tmp_path):
+    """Параллельные выдачи и возвраты не теряют изменений и не уводят количество в минус."""
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    storage_file = str(tmp_path / "library.json")
+    library = Library(storage_file=storage_file, journal=True, compact_every=50, flush_interval=5)
+    book_ids = [library.add_book(title=f"Book {n}", author="Author", year=2000).book_id for n in range(5)]
+    for book_id in book_ids:
+        for _ in range(2):
+            library.update_status(book_id, "в наличии")
+    balance = {book_id: 0 for book_id in book_ids}
+    balance_lock = threading.Lock()
+    negative = []
+    stop = threading.Event()
+
+    def desk(seed):
+        rng = random.Random(seed)
+        local = dict.fromkeys(book_ids, 0)
+        for _ in range(500):
+            book_id = rng.choice(book_ids)
+            if rng.random() < 0.6:
+                local[book_id] -= library.update_status(book_id, "выдана")
+            else:
+                local[book_id] += library.update_status(book_id, "в наличии")
+        with balance_lock:
+            for book_id, delta in local.items():
+                balance[book_id] += delta
+
+    def reader():
+        while not stop.is_set():
+            negative.extend(book for book in library.find_books(author="author") if book.count < 0)
+
+    try:
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        desks = [threading.Thread(target=desk, args=(seed,)) for seed in range(4)]
+        for thread in readers + desks:
+            thread.start()
+        for thread in desks:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    library.close()
+
+    assert not negative
+    expected = {book_id: 3 + delta for book_id, delta in balance.items()}
+    assert {book.book_id: book.count for book in library.books} == expected
+    assert {book.book_id: book.count for book in Library(storage_file=storage_file, journal=True).books} == expected
+
+
+def test_shared_storage_sees_other_instances(tmp_path):
+    """Библиотеки с общим файлом применяют изменения друг друга перед своими."""
+    storage_file = str(tmp_path / "library.json")
+    first = Library(storage_file=storage_file, journal=True, compact_every=4, shared=True)
+    second = Library(storage_file=storage_file, journal=True, compact_every=4, shared=True)
+
+    book = first.add_book(title="Book 1", author="Author I", year=2000)
+    assert second.add_book(title="Book 2", author="Author II", year=2010).book_id == 2
+    assert second.add_book(title="Book 1", author="Author I", year=2000).count == 2
+    assert first.update_status(book.book_id, "выдана") is True
+    assert book.count == 1
+    # Четвёртая запись журнала сжимает его в снимок: второй экземпляр загружает каталог заново
+    second.refresh()
+    assert [(book.book_id, book.count) for book in second.books] == [(1, 1), (2, 1)]
+    assert second.remove_book(2) is True
+    first.refresh()
+    assert [book.book_id for book in first.find_books(author="author ii")] == []
+
+
+@pytest.mark.parametrize("options", [{"columnar": True}, {"lazy": True}])
+def test_shared_compact_catalogue_applies_changes(tmp_path, options):
+    """Ленивый и столбцовый каталоги применяют изменения других библиотек, сохраняя индексы и сводку."""
+    storage_file = str(tmp_path / "library.json")
+    first = Library(storage_file=storage_file, journal=True, shared=True, **options)
+    second = Library(storage_file=storage_file, journal=True, shared=True)
+    book = first.add_book(title="Book 1", author="Author I", year=2000)
+    assert first.summary()["available"] == 1
+
+    second.refresh()
+    assert second.update_status(book.book_id, "выдана") is True
+    second.add_book(title="Book 2", author="Author II", year=2010)
+    first.refresh()
+
+    assert (book.status, book.count) == ("выдана", 0)
+    assert [found.book_id for found in first.find_books(author="author i")] == [1]
+    assert [found.book_id for found in first.find_books(author="author ii")] == [2]
+    assert first.summary()["statuses"] == {"в наличии": 1, "выдана": 1}
+
+
+def _shared_desk(storage_file, operations):
+    library = Library(storage_file=storage_file, journal=True, compact_every=25, shared=True)
+    for _ in range(operations):
+        library.add_book(title="Book", author="Author", year=2000)
+    library.close()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="нужен fork")
+def test_shared_storage_across_processes(tmp_path):
+    """Несколько процессов, изменяющих один файл, не теряют изменений друг друга."""
+    storage_file = str(tmp_path / "library.json")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_shared_desk, args=(storage_file, 40)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [(book.book_id, book.count) for book in Library(storage_file=storage_file, journal=True).books] == [
+        (1, 120)
+    ]
+
+
+def test_shared_storage_requires_immediate_saves(tmp_path):
+    """Совместный доступ несовместим с отложенным сохранением."""
+    with pytest.raises(ValueError):
+        Library(storage_file=str(tmp_path / "library.json"), shared=True, flush_every=10)
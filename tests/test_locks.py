@@ -0,0 +1,47 @@
+import threading
+
+from utils.locks import ReadWriteLock, StripedLock
+
+
+def test_readers_run_in_parallel():
+    """Несколько читателей одновременно удерживают блокировку."""
+    lock = ReadWriteLock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with lock.read():
+            barrier.wait()
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not barrier.broken
+
+
+def test_writer_excludes_readers():
+    """Читатель ждёт писателя, писатель может повторно захватить блокировку."""
+    lock = ReadWriteLock()
+    events = []
+
+    def reader():
+        with lock.read():
+            events.append("read")
+
+    with lock.write():
+        with lock.write(), lock.read():
+            events.append("nested")
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join(0.05)
+        events.append("write")
+    thread.join()
+    assert events == ["nested", "write", "read"]
+
+
+def test_striped_lock_is_stable():
+    """Один и тот же ключ всегда получает одну и ту же блокировку."""
+    locks = StripedLock(stripes=4)
+    assert locks.for_key(7) is locks.for_key(7)
+    assert locks.for_key(1) is not locks.for_key(2)
@@ -0,0 +1,48 @@
+import json
+
+from service.library import Library
+from utils.metrics import LatencyHistogram
+
+
+def test_histogram_percentiles():
+    """Процентили оцениваются сверху с погрешностью не больше 1/8 и не превышают максимум."""
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+
+    assert histogram.calls == 1000
+    for share, exact in ((0.5, 500_000), (0.95, 950_000), (0.99, 990_000)):
+        assert exact <= histogram.percentile(share) <= exact * 1.125
+    assert histogram.percentile(1.0) == histogram.max == 1_000_000
+    assert LatencyHistogram().percentile(0.5) == 0
+
+
+def test_library_stats(tmp_path):
+    """Статистика учитывает вызовы инструментированных методов и байты, записанные хранилищем."""
+    metrics_file = tmp_path / "metrics.jsonl"
+    library = Library(storage_file=str(tmp_path / "library.json"), metrics=True, metrics_file=str(metrics_file))
+    library.add_book(title="Book", author="Author", year=2000)
+    library.find_books(title="Book")
+    library.find_books(author="Author")
+
+    stats = library.stats()
+    assert stats["enabled"] is True and stats["books"] == 1
+    assert stats["bytes_written"] == (tmp_path / "library.json").stat().st_size
+    assert stats["methods"]["find_books"]["calls"] == 2
+    assert stats["methods"]["add_book"]["calls"] == stats["methods"]["save_books"]["calls"] == 1
+    summary = stats["methods"]["add_book"]
+    assert 0 < summary["p50_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+
+    library.dump_stats()
+    assert json.loads(metrics_file.read_text(encoding="utf-8"))["methods"]["find_books"]["calls"] == 2
+    library.close()
+
+
+def test_library_stats_disabled(tmp_path):
+    """Без сбора метрик вызовы не учитываются, а объём записи считается всегда."""
+    library = Library(storage_file=str(tmp_path / "library.json"), journal=True)
+    library.add_book(title="Book", author="Author", year=2000)
+    stats = library.stats()
+    assert (stats["enabled"], stats["methods"]) == (False, {})
+    assert stats["bytes_written"] == (tmp_path / "library.json.journal").stat().st_size
+    library.close()
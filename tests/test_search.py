@@ -0,0 +1,42 @@
+from service.book import Book
+from service.search import TextIndex, tokenize
+
+
+def make_index() -> TextIndex:
+    index = TextIndex()
+    index.add(Book(book_id=1, title="Искусство программирования", author="Дональд Эрвин Кнут", year=1968))
+    index.add(Book(book_id=2, title="Конкретная математика", author="Кнут Паташник Грэхем", year=1989))
+    index.add(Book(book_id=3, title="Ёжик в тумане", author="Сергей Козлов", year=1969))
+    index.add(Book(book_id=4, title="Кнут", author="Неизвестный автор", year=2000))
+    return index
+
+
+def test_tokenize_normalizes_case_and_yo():
+    assert tokenize("Ёжик в ТУМАНЕ!") == ["ежик", "в", "тумане"]
+
+
+def test_search_prefix_and_ranking():
+    """Совпадение в названии важнее совпадения в авторе, точное слово важнее префикса."""
+    index = make_index()
+
+    assert index.search("кнут") == [4, 1, 2]
+    assert index.search("искусств") == [1]
+    assert index.search("ЁЖИК") == [3]
+    assert index.search("ежик тум") == [3]
+    assert index.search("кнут математика") == [2]
+    assert index.search("кнут", limit=1) == [4]
+    assert index.search("толстой") == []
+    assert index.search("  ") == []
+
+
+def test_search_after_add_and_remove():
+    """Индекс обновляется инкрементально при добавлении и удалении книг."""
+    index = make_index()
+    index.search("кнут")  # Строит словарь для поиска по префиксу
+
+    index.add(Book(book_id=5, title="Кнутовище", author="Автор", year=2001))
+    assert index.search("кнутов") == [5]
+
+    index.remove(Book(book_id=4, title="Кнут", author="Неизвестный автор", year=2000))
+    assert index.search("кнут") == [1, 2, 5]
+    assert index.search("неизвестный") == []
@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from service.library import Library
+from service.server import LibraryServer, main
+
+
+async def request(port, method, path, data=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(data).encode("utf-8") if data is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode("utf-8") + body
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(body) if body else None
+
+
+def run_with_server(tmp_path, scenario):
+    async def main():
+        server = LibraryServer(Library(storage_file=str(tmp_path / "library.json"), journal=True), port=0)
+        await server.start()
+        try:
+            await scenario(server.port)
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_book_endpoints(tmp_path):
+    """API добавляет, находит, выдаёт и удаляет книги."""
+    async def scenario(port):
+        status, book = await request(port, "POST", "/books", {"title": "Book 1", "author": "Author", "year": 2000})
+        assert status == 201 and book["id"] == 1
+        await request(port, "POST", "/books", {"title": "Book 2", "author": "Author", "year": 2010})
+
+        assert await request(port, "GET", "/books/1") == (200, book)
+        status, page = await request(port, "GET", "/books?offset=1&limit=1")
+        assert status == 200 and page["total"] == 2 and [item["id"] for item in page["items"]] == [2]
+        status, found = await request(port, "GET", "/books/find?author=author&year_from=2005")
+        assert [item["id"] for item in found["items"]] == [2]
+
+        status, issued = await request(port, "PATCH", "/books/1", {"status": "выдана"})
+        assert status == 200 and issued["status"] == "выдана"
+        assert (await request(port, "PATCH", "/books/1", {"status": "выдана"}))[0] == 409
+        assert await request(port, "DELETE", "/books/2") == (204, None)
+        assert (await request(port, "GET", "/books/2"))[0] == 404
+
+    run_with_server(tmp_path, scenario)
+    assert [book.status for book in Library(storage_file=str(tmp_path / "library.json"), journal=True).books] == [
+        "выдана"
+    ]
+
+
+def test_request_errors(tmp_path):
+    """Некорректные запросы получают коды 400, 404 и 405 с описанием ошибки."""
+    async def scenario(port):
+        status, error = await request(port, "POST", "/books", {"title": "", "author": "Author", "year": 2000})
+        assert status == 400 and "Название" in error["error"]
+        assert (await request(port, "GET", "/books?limit=0"))[0] == 400
+        assert (await request(port, "GET", "/books/abc"))[0] == 400
+        assert (await request(port, "GET", "/authors"))[0] == 404
+        assert (await request(port, "PUT", "/books"))[0] == 405
+
+    run_with_server(tmp_path, scenario)
+
+
+def test_shared_server_reads_other_processes_changes(tmp_path):
+    """Сервер с общим файлом показывает книги, добавленные другой библиотекой после его запуска."""
+    storage_file = str(tmp_path / "library.json")
+
+    async def main():
+        server = LibraryServer(Library(storage_file=storage_file, journal=True, shared=True), port=0)
+        await server.start()
+        try:
+            assert (await request(server.port, "GET", "/books"))[1]["total"] == 0
+            console = Library(storage_file=storage_file, journal=True, shared=True)
+            book = console.add_book(title="Console", author="Author", year=2000)
+            status, page = await request(server.port, "GET", "/books")
+            assert status == 200 and [item["title"] for item in page["items"]] == ["Console"]
+            assert (await request(server.port, "GET", f"/books/{book.book_id}"))[0] == 200
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_main_shares_library_file(tmp_path, monkeypatch):
+    """Сервер открывает библиотеку в режиме совместного доступа и не перезаписывает книги консоли."""
+    storage_file = str(tmp_path / "library.json")
+    console = Library(storage_file=storage_file, journal=True, shared=True)
+
+    async def serve(library, host, port):
+        console.add_book(title="Console", author="Author", year=2000)
+        assert library.add_book(title="Server", author="Author", year=2010).book_id == 2
+
+    monkeypatch.setattr("service.server.CIRCULATION_FILE", str(tmp_path / "library.circulation"))
+    monkeypatch.setattr("service.server.serve", serve)
+    main(["--storage", storage_file])
+
+    assert [book.title for book in Library(storage_file=storage_file, journal=True).books] == ["Console", "Server"]
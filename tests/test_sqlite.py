@@ -0,0 +1,113 @@
+from service.library import Library
+from service.sqlite import SqliteStorage
+
+
+def test_sqlite_library(tmp_path):
+    """Библиотека в SQLite изменяет каталог, сохраняет его и находит книги запросами к базе."""
+    storage_file = str(tmp_path / "library.db")
+    library = Library(storage_file=storage_file, storage_format="sqlite")
+    first = library.add_book(title="Book 1", author="Author I", year=2000)
+    library.add_book(title="Book 2", author="Author II", year=2010)
+    library.add_book(title="Book 3", author="Author III", year=2020)
+    assert library.add_book(title="book 1", author="AUTHOR I", year=2000).book_id == first.book_id
+    assert library.update_status(first.book_id, "выдана") is True
+    assert library.remove_book(2) is True
+    assert library.remove_book(2) is False
+    library.close()
+
+    reloaded = Library(storage_file=storage_file, storage_format="sqlite")
+    assert [(book.book_id, book.status, book.count) for book in reloaded.books] == [
+        (1, "в наличии", 1), (3, "в наличии", 1)
+    ]
+    assert [book.title for book in reloaded.find_books(author="author iii")] == ["Book 3"]
+    assert [book.book_id for book in reloaded.find_books(year_from=1990, year_to=2000)] == [1]
+    assert [book.book_id for book in reloaded.find_books_by_year_range(year_from=2000)] == [1, 3]
+    assert [book.book_id for book in reloaded.search_books("boo auth")] == [1, 3]
+    assert reloaded.add_book(title="Book 4", author="Author IV", year=2021).book_id == 4
+    reloaded.close()
+
+
+def test_sqlite_deferred_changes(tmp_path):
+    """Изменения внутри batch видны поиску сразу, а в базу фиксируются при выходе из блока."""
+    storage_file = str(tmp_path / "library.db")
+    library = Library(storage=SqliteStorage(storage_file))
+    with library.batch():
+        book = library.add_book(title="Book", author="Author", year=2000)
+        library.add_book(title="Book", author="Author", year=2000)
+        assert library.find_books(title="book", author="author", year=2000) == [book]
+        assert book.count == 2
+
+    reloaded = Library(storage=SqliteStorage(storage_file))
+    assert [(book.book_id, book.count) for book in reloaded.books] == [(1, 2)]
+    reloaded.close()
+    library.close()
+
+
+def test_sqlite_find_loads_books_in_one_query(tmp_path):
+    """Найденные книги загружаются одним запросом, а не запросом на каждую книгу."""
+    storage_file = str(tmp_path / "library.db")
+    library = Library(storage_file=storage_file, storage_format="sqlite")
+    with library.batch():
+        for number in range(200):
+            library.add_book(title=f"Book {number}", author="Author", year=2000 + number % 10)
+    library.close()
+
+    reloaded = Library(storage_file=storage_file, storage_format="sqlite")
+    statements = []
+    reloaded._storage._connection.set_trace_callback(statements.append)
+    assert len(reloaded.find_books(author="author")) == 200
+    assert len(statements) == 2
+    statements.clear()
+    assert [book.year for book in reloaded.find_books_by_year_range(2009)] == [2009] * 20
+    assert len(statements) == 1  # Книги уже загружены предыдущим поиском
+    reloaded.close()
+
+
+def test_sqlite_compact_keeps_deferred_changes(tmp_path):
+    """compact записывает в базу отложенные изменения количества и статуса."""
+    storage_file = str(tmp_path / "library.db")
+    library = Library(storage_file=storage_file, storage_format="sqlite", flush_every=10)
+    book = library.add_book(title="Book", author="Author", year=2000)
+    library.update_status(book.book_id, "выдана")
+    library.compact()
+    library.close()
+
+    reloaded = Library(storage_file=storage_file, storage_format="sqlite")
+    assert [(book.count, book.status) for book in reloaded.books] == [(0, "выдана")]
+    reloaded.close()
+
+
+def test_sqlite_catalogue_is_read_in_pages(tmp_path, monkeypatch):
+    """Таблица обходится страницами, а количество книг не подсчитывается запросом при каждой странице списка."""
+    monkeypatch.setattr("service.sqlite.FETCH_SIZE", 2)
+    library = Library(storage_file=str(tmp_path / "library.db"), storage_format="sqlite")
+    for number in range(5):
+        library.add_book(title=f"Book {number}", author="Author", year=2000)
+    library.remove_book(2)
+
+    statements = []
+    library._storage._connection.set_trace_callback(statements.append)
+    assert [record.book_id for record in library._books.records()] == [1, 3, 4, 5]
+    assert sum("LIMIT 2" in statement for statement in statements) == 3
+    statements.clear()
+    books, total = library.list_books(offset=1, limit=2)
+    assert ([book.book_id for book in books], total) == ([3, 4], 4)
+    assert not any("COUNT" in statement for statement in statements)
+    library.close()
+
+
+def test_sqlite_save_replaces_catalogue(tmp_path, monkeypatch):
+    """Полное сохранение заменяет содержимое таблицы переданными записями, как у остальных хранилищ."""
+    monkeypatch.setattr("service.sqlite.FETCH_SIZE", 2)
+    storage_file = str(tmp_path / "library.db")
+    storage = SqliteStorage(storage_file)
+    storage.save({"id": book_id, "title": f"Book {book_id}", "author": "Author", "year": 2000,
+                  "status": "в наличии", "count": 1} for book_id in range(1, 6))
+    storage.save(record for record in storage.load() if record["id"] % 2)
+    assert [record["id"] for record in storage.load()] == [1, 3, 5]
+    assert len(storage.catalogue()) == 3
+    storage.close()
+
+    reloaded = Library(storage_file=storage_file, storage_format="sqlite")
+    assert [book.book_id for book in reloaded.find_books(author="author")] == [1, 3, 5]
+    reloaded.close()
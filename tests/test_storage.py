@@ -0,0 +1,143 @@
+import io
+import json
+import os
+
+import pytest
+
+from service.library import Library
+from service.storage import Storage, iter_json_array
+
+
+def test_journal_appends_and_replays(tmp_path):
+    """В режиме журнала изменения дописываются в журнал и применяются при загрузке."""
+    storage_file = tmp_path / "library.json"
+    library = Library(storage_file=str(storage_file), journal=True)
+    first = library.add_book(title="Book 1", author="Author I", year=2000)
+    second = library.add_book(title="Book 2", author="Author II", year=2010)
+    library.update_status(first.book_id, "выдана")
+    library.remove_book(second.book_id)
+
+    assert not storage_file.exists()
+    journal = (tmp_path / "library.json.journal").read_text(encoding="utf-8").splitlines()
+    assert len(journal) == 4
+    assert json.loads(journal[-1]) == {"op": "del", "id": second.book_id}
+
+    reloaded = Library(storage_file=str(storage_file), journal=True)
+    assert [book.to_dict() for book in reloaded.books] == [first.to_dict()]
+
+
+def test_journal_compaction(tmp_path):
+    """После compact_every записей журнал сжимается в снимок."""
+    storage_file = tmp_path / "library.json"
+    library = Library(storage_file=str(storage_file), journal=True, compact_every=3)
+    for number in range(4):
+        library.add_book(title=f"Book {number}", author="Author", year=2000)
+
+    assert len(json.loads(storage_file.read_text(encoding="utf-8"))) == 3
+    assert len((tmp_path / "library.json.journal").read_text(encoding="utf-8").splitlines()) == 1
+    assert len(Library(storage_file=str(storage_file), journal=True).books) == 4
+
+    library.compact()
+    assert not (tmp_path / "library.json.journal").exists()
+
+
+def test_journal_torn_tail_is_discarded(tmp_path):
+    """Оборванная при сбое последняя строка журнала отбрасывается."""
+    storage_file = tmp_path / "library.json"
+    library = Library(storage_file=str(storage_file), journal=True)
+    library.add_book(title="Book 1", author="Author I", year=2000)
+    with open(tmp_path / "library.json.journal", "a", encoding="utf-8") as file:
+        file.write('{"op":"put","book":{"id":2,')
+
+    reloaded = Library(storage_file=str(storage_file), journal=True)
+    assert len(reloaded.books) == 1
+    reloaded.add_book(title="Book 2", author="Author II", year=2010)
+    assert len(Library(storage_file=str(storage_file), journal=True).books) == 2
+
+
+def test_shared_load_keeps_unfinished_journal_line(tmp_path):
+    """Библиотека, запущенная во время записи другого процесса, не обрезает его незавершённую строку журнала."""
+    storage_file = str(tmp_path / "library.json")
+    Library(storage_file=storage_file, journal=True, shared=True).add_book(title="Book 1", author="Author", year=2000)
+    entry = json.dumps({"op": "put", "book": {
+        "id": 2, "title": "Book 2", "author": "Author", "year": 2010, "status": "в наличии", "count": 1
+    }}) + "\n"
+    with open(tmp_path / "library.json.journal", "a", encoding="utf-8") as file:
+        file.write(entry[:10])
+        file.flush()
+        library = Library(storage_file=storage_file, journal=True, shared=True)
+        file.write(entry[10:])
+
+    assert len(library.books) == 1
+    library.refresh()
+    assert [book.title for book in library.books] == ["Book 1", "Book 2"]
+
+
+def test_snapshot_is_compact_and_backed_up(tmp_path):
+    """Снимок записывается компактно, предыдущая версия сохраняется в резервную копию."""
+    storage_file = tmp_path / "library.json"
+    library = Library(storage_file=str(storage_file), backups=2)
+    library.add_book(title="Book 1", author="Author I", year=2000)
+    library.add_book(title="Book 2", author="Author II", year=2010)
+    library.add_book(title="Book 3", author="Author III", year=2020)
+
+    assert "\n" not in storage_file.read_text(encoding="utf-8")
+    assert len(json.loads((tmp_path / "library.json.1").read_text(encoding="utf-8"))) == 2
+    assert len(json.loads((tmp_path / "library.json.2").read_text(encoding="utf-8"))) == 1
+    assert not (tmp_path / "library.json.3").exists()
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
+
+
+def test_load_fails_loudly(tmp_path):
+    """Повреждённый или пропавший при наличии резервной копии файл не превращается в пустую библиотеку."""
+    storage_file = tmp_path / "library.json"
+    storage_file.write_text('[{"id": 1, "title": "Bo', encoding="utf-8")
+    with pytest.raises(ValueError, match="повреждён"):
+        Library(storage_file=str(storage_file))
+
+    storage_file.rename(tmp_path / "library.json.1")
+    with pytest.raises(FileNotFoundError, match="резервной копии"):
+        Library(storage_file=str(storage_file))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_array(chunk_size):
+    """Потоковый разбор не зависит от того, где граница блока разрезает элементы."""
+    data = [{"id": 1, "title": "Книга, [1]"}, 12345, "строка", [1, 2], {}]
+    text = " \n" + json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == data
+    assert list(iter_json_array(io.StringIO("[]"), chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1, 2", "[1 2]", '[{"id": 1'])
+def test_iter_json_array_errors(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+def test_storage_requires_load_save_and_append():
+    """Хранилище, не реализующее загрузку или сохранение, нельзя создать."""
+    class SnapshotOnly(Storage):
+        def load(self):
+            return iter(())
+
+        def save(self, records):
+            pass
+
+    with pytest.raises(TypeError):
+        SnapshotOnly()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="права доступа POSIX")
+def test_snapshot_keeps_file_mode(tmp_path):
+    """Перезапись снимка сохраняет права доступа файла, новый файл создаётся с учётом umask."""
+    storage_file = tmp_path / "library.json"
+    library = Library(storage_file=str(storage_file))
+    library.add_book(title="Book 1", author="Author", year=2000)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert storage_file.stat().st_mode & 0o777 == 0o666 & ~umask
+
+    storage_file.chmod(0o640)
+    library.add_book(title="Book 2", author="Author", year=2010)
+    assert storage_file.stat().st_mode & 0o777 == 0o640
@@ -1,6 +1,9 @@
 import pytest
 
-from utils.validators import validate_title, validate_author, validate_year, validate_id
+from utils.validators import (
+    validate_title, validate_author, validate_year, validate_year_range, validate_id, validate_rows,
+    validate_rows_parallel,
+)
 
 
 # Тесты для validate_title
@@ -60,6 +63,25 @@ def test_validate_year_errors(year, expected_error):
         validate_year(year)
 
 
+# Тесты для validate_year_range
+def test_validate_year_range_success():
+    assert validate_year_range("1950-1970") == (1950, 1970)
+    assert validate_year_range(" 1960 - 1960 ") == (1960, 1960)
+
+
+@pytest.mark.parametrize(
+    "years, expected_error",
+    [
+        ("1970-1950", "Начало диапазона не может быть больше конца."),
+        ("1950", "Диапазон должен быть в формате начало-конец."),
+        ("abc-1970", "Год издания должен быть числом."),
+    ],
+)
+def test_validate_year_range_errors(years, expected_error):
+    with pytest.raises(ValueError, match=expected_error):
+        validate_year_range(years)
+
+
 # Тесты для validate_id
 @pytest.mark.parametrize("num_id", ["1", "42", "1000"])
 def test_validate_id_success(num_id):
@@ -75,4 +97,53 @@ def test_validate_id_success(num_id):
 )
 def test_validate_id_errors(num_id, expected_error):
     with pytest.raises(ValueError, match=expected_error):
-        validate_id(num_id)
\ No newline at end of file
+        validate_id(num_id)
+
+
+# Тесты для пакетной проверки
+ROWS = [
+    ("Book", "Author", "2000"),
+    ("", "Author1", "2000"),
+    ("Book", "Author", "год"),
+    ("A" * 101, "Автор", "1999"),
+]
+ROWS_ERRORS = [
+    [],
+    ["Название книги не может быть пустым.", "Имя автора должно содержать только буквы и пробелы."],
+    ["Год издания должен быть числом."],
+    ["Название книги не должно превышать 100 символов."],
+]
+
+
+def test_validate_rows():
+    assert validate_rows(*zip(*ROWS)) == ROWS_ERRORS
+
+
+def test_validate_rows_parallel_keeps_order():
+    titles, authors, years = (list(column) for column in zip(*ROWS * 50))
+    assert validate_rows_parallel(titles, authors, years, workers=2, chunk_size=7) == ROWS_ERRORS * 50
+
+
+def test_validate_rows_length_mismatch():
+    with pytest.raises(ValueError, match="одной длины"):
+        validate_rows(["Book"], [], ["2000"])
+
+
+@pytest.mark.parametrize(
+    "author",
+    ["Jean-Paul Sartre", "O'Brien", "Иван\tИванов", "   ", "Лев²", "Анна Каренина", "Agent 007", "Ёжик"],
+)
+def test_validate_author_matches_character_rule(author):
+    """Быстрая проверка символов совпадает с правилом "только буквы и пробелы"."""
+    expected = all(char.isalpha() or char.isspace() for char in author)
+    try:
+        validate_author(author)
+        valid = True
+    except ValueError:
+        valid = False
+    assert valid == expected
+
+
+@pytest.mark.parametrize("year, expected", [(" 1999 ", 1999), ("+2000", 2000), ("1_900", 1900), ("١٩٩٩", 1999)])
+def test_validate_year_accepts_int_forms(year, expected):
+    assert validate_year(year) == expected
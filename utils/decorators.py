@@ -1,4 +1,5 @@
 import json
+from time import perf_counter_ns
 
 
 def log_action(func):
@@ -8,6 +9,7 @@ def log_action(func):
         print(f"Вызов {func.__name__} c аргументами {args[:1]} {kwargs}")
         result = func(*args, **kwargs)
         print(f"Результат: {result}")
+        return result
 
     wrapper.__name__ = func.__name__
     wrapper.__doc__ = func.__doc__
@@ -59,12 +61,122 @@ def save_after_action(func):
 
     Особенности:
         - После успешного выполнения декорируемой функции вызывает метод self.save_books для сохранения данных.
+        - Если у объекта есть метод schedule_save, решение о моменте сохранения передаётся ему (отложенная запись).
     """
     def wrapper(self, *args, **kwargs):
         result = func(self, *args, **kwargs)
-        self.save_books()
+        schedule_save = getattr(self, "schedule_save", None)
+        if schedule_save is not None:
+            schedule_save()
+        else:
+            self.save_books()
         return result
 
     wrapper.__name__ = func.__name__
     wrapper.__doc__ = func.__doc__
     return wrapper
+
+
+def synchronized(func):
+    """
+    Декоратор для выполнения метода под блокировкой объекта (self._lock).
+
+    Аргументы:
+        func (callable): Функция, к которой применяется декоратор.
+
+    Возвращает:
+        callable: Обёрнутая функция, которая не выполняется одновременно с другими синхронизированными методами.
+    """
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def read_locked(func):
+    """
+    Декоратор для выполнения метода под блокировкой объекта на чтение (self._rwlock.read()).
+
+    Аргументы:
+        func (callable): Функция, к которой применяется декоратор.
+
+    Возвращает:
+        callable: Обёрнутая функция, которая выполняется параллельно с другими читателями, но не с писателями.
+    """
+    def wrapper(self, *args, **kwargs):
+        with self._rwlock.read():
+            return func(self, *args, **kwargs)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def write_locked(func):
+    """
+    Декоратор для выполнения метода под блокировкой объекта на запись (self._rwlock.write()).
+
+    Аргументы:
+        func (callable): Функция, к которой применяется декоратор.
+
+    Возвращает:
+        callable: Обёрнутая функция, которая не выполняется одновременно ни с читателями, ни с писателями.
+    """
+    def wrapper(self, *args, **kwargs):
+        with self._rwlock.write():
+            return func(self, *args, **kwargs)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def process_locked(func):
+    """
+    Декоратор для выполнения метода под блокировкой хранилища между процессами (self._process_lock()).
+
+    Аргументы:
+        func (callable): Функция, к которой применяется декоратор.
+
+    Возвращает:
+        callable: Обёрнутая функция, которая видит изменения других процессов и не выполняется одновременно с ними.
+    """
+    def wrapper(self, *args, **kwargs):
+        with self._process_lock():
+            return func(self, *args, **kwargs)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def instrumented(func):
+    """
+    Декоратор для сбора метрик вызовов метода в self._metrics: количество вызовов и гистограмма длительности.
+
+    Аргументы:
+        func (callable): Функция, к которой применяется декоратор.
+
+    Возвращает:
+        callable: Обёрнутая функция, длительность которой (включая ожидание блокировок и сохранение) учитывается
+        под именем функции. Если сбор метрик выключен (self._metrics is None), к вызову добавляется только
+        проверка атрибута.
+    """
+    name = func.__name__
+
+    def wrapper(self, *args, **kwargs):
+        metrics = self._metrics
+        if metrics is None:
+            return func(self, *args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            metrics.record(name, perf_counter_ns() - start)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
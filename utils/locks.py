@@ -0,0 +1,118 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator
+
+
+class ReadWriteLock:
+    """
+    Класс, представляющий блокировку "много читателей или один писатель".
+
+    Читатели выполняются параллельно друг с другом, писатель - в одиночку. Ожидающий писатель получает приоритет:
+    новые читатели ждут его, поэтому поток запросов на чтение не может бесконечно откладывать изменения.
+    Писатель может повторно захватывать блокировку как на запись, так и на чтение; читатель не должен
+    захватывать её повторно и не может повысить блокировку до записи.
+
+    Атрибуты:
+        _condition (threading.Condition): Условие, на котором ждут читатели и писатели.
+        _readers (int): Количество активных читателей.
+        _writer (int | None): Идентификатор потока-писателя.
+        _writer_depth (int): Глубина повторного захвата блокировки писателем.
+        _waiting_writers (int): Количество ожидающих писателей.
+
+    Методы:
+        read: Контекстный менеджер для захвата блокировки на чтение.
+        write: Контекстный менеджер для захвата блокировки на запись.
+    """
+
+    def __init__(self):
+        """Инициализирует свободную блокировку."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: int | None = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на чтение на время блока with.
+
+        Возвращает:
+            Iterator[None]: Контекстный менеджер.
+        """
+        if self._writer == threading.get_ident():
+            yield
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на запись на время блока with.
+
+        Возвращает:
+            Iterator[None]: Контекстный менеджер.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+            self._writer_depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class StripedLock:
+    """
+    Класс, представляющий набор блокировок, разделённых по ключам (lock striping).
+
+    Ключ отображается на одну из stripes блокировок по хешу, поэтому изменения разных книг почти никогда не ждут
+    друг друга, а память не зависит от количества книг.
+
+    Атрибуты:
+        _locks (list[threading.Lock]): Блокировки.
+
+    Методы:
+        for_key: Возвращает блокировку для ключа.
+    """
+
+    def __init__(self, stripes: int = 64):
+        """
+        Инициализирует набор блокировок.
+
+        Аргументы:
+            stripes (int): Количество блокировок (по умолчанию 64).
+        """
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def for_key(self, key: Hashable) -> threading.Lock:
+        """
+        Возвращает блокировку для ключа.
+
+        Аргументы:
+            key (Hashable): Ключ, например ID книги.
+
+        Возвращает:
+            threading.Lock: Блокировка, общая для всех ключей с тем же остатком хеша.
+        """
+        return self._locks[hash(key) % len(self._locks)]
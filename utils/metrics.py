@@ -0,0 +1,158 @@
+import threading
+
+# Количество старших битов длительности после ведущего, задающих корзину внутри степени двойки: 2 ** 3 = 8 корзин,
+# относительная погрешность процентилей не больше 1/8
+SUB_BUCKET_BITS = 3
+
+
+class LatencyHistogram:
+    """
+    Класс, представляющий гистограмму длительностей в наносекундах с логарифмическими корзинами.
+
+    Каждая степень двойки делится на 2 ** SUB_BUCKET_BITS равных корзин, поэтому запись выполняется за O(1) без
+    хранения отдельных измерений, а память не зависит от количества вызовов.
+
+    Атрибуты:
+        calls (int): Количество измерений.
+        total (int): Суммарная длительность в наносекундах.
+        max (int): Наибольшая длительность в наносекундах.
+        _buckets (dict[int, int]): Номер корзины -> количество измерений.
+
+    Методы:
+        record: Добавляет измерение.
+        percentile: Возвращает оценку процентиля.
+    """
+
+    __slots__ = ("calls", "total", "max", "_buckets")
+
+    def __init__(self):
+        """Инициализирует пустую гистограмму."""
+        self.calls = 0
+        self.total = 0
+        self.max = 0
+        self._buckets: dict[int, int] = {}
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        """
+        Возвращает номер корзины для длительности. Номера возрастают вместе с длительностью.
+
+        Аргументы:
+            value (int): Длительность в наносекундах.
+
+        Возвращает:
+            int: Номер корзины.
+        """
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value  # Малые значения хранятся точно
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def _upper_bound(bucket: int) -> int:
+        """
+        Возвращает наибольшую длительность, попадающую в корзину.
+
+        Аргументы:
+            bucket (int): Номер корзины.
+
+        Возвращает:
+            int: Длительность в наносекундах.
+        """
+        shift = (bucket >> SUB_BUCKET_BITS) - 1
+        if shift <= 0:
+            return bucket
+        return ((bucket - (shift << SUB_BUCKET_BITS) + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        """
+        Добавляет измерение.
+
+        Аргументы:
+            value (int): Длительность в наносекундах.
+        """
+        self.calls += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1  # То же, что _bucket, без вызова метода
+        bucket = (shift << SUB_BUCKET_BITS) + (value >> shift) if shift > 0 else value
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, share: float) -> int:
+        """
+        Возвращает оценку процентиля: верхнюю границу корзины, в которую он попадает (не больше максимума).
+
+        Аргументы:
+            share (float): Доля измерений от 0 до 1, например 0.95.
+
+        Возвращает:
+            int: Длительность в наносекундах (0 для пустой гистограммы).
+        """
+        rank = share * self.calls
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self._upper_bound(bucket), self.max)
+        return self.max
+
+
+class Metrics:
+    """
+    Класс, представляющий потокобезопасный сборщик метрик вызовов методов.
+
+    Атрибуты:
+        _methods (dict[str, LatencyHistogram]): Имя метода -> гистограмма длительностей его вызовов.
+        _lock (threading.Lock): Блокировка изменения гистограмм.
+
+    Методы:
+        record: Учитывает вызов метода.
+        snapshot: Возвращает сводку по всем методам.
+        reset: Очищает собранные метрики.
+    """
+
+    def __init__(self):
+        """Инициализирует пустой сборщик."""
+        self._methods: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed: int) -> None:
+        """
+        Учитывает вызов метода.
+
+        Аргументы:
+            name (str): Имя метода.
+            elapsed (int): Длительность вызова в наносекундах.
+        """
+        with self._lock:
+            histogram = self._methods.get(name)
+            if histogram is None:
+                histogram = self._methods[name] = LatencyHistogram()
+            histogram.record(elapsed)
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Возвращает сводку по всем методам: количество вызовов, суммарное время, процентили p50, p95, p99
+        и наибольшую длительность в миллисекундах.
+
+        Возвращает:
+            dict[str, dict]: Имя метода -> сводка, методы упорядочены по имени.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": histogram.calls,
+                    "total_ms": histogram.total / 1e6,
+                    "p50_ms": histogram.percentile(0.50) / 1e6,
+                    "p95_ms": histogram.percentile(0.95) / 1e6,
+                    "p99_ms": histogram.percentile(0.99) / 1e6,
+                    "max_ms": histogram.max / 1e6,
+                }
+                for name, histogram in sorted(self._methods.items())
+            }
+
+    def reset(self) -> None:
+        """Очищает собранные метрики."""
+        with self._lock:
+            self._methods.clear()
@@ -1,4 +1,11 @@
-from typing import Callable
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Sequence
+
+# Количество строк в одной порции параллельной проверки
+VALIDATION_CHUNK_SIZE = 50_000
 
 
 def validate_input(prompt: str, validation_func: Callable, error_message: str = None) -> str | int:
@@ -28,6 +35,85 @@ def validate_input(prompt: str, validation_func: Callable, error_message: str =
                 print(f"Ошибка: {e} Попробуйте снова.")
 
 
+TITLE_EMPTY = "Название книги не может быть пустым."
+TITLE_TOO_LONG = "Название книги не должно превышать 100 символов."
+AUTHOR_EMPTY = "Имя автора не может быть пустым."
+AUTHOR_TOO_LONG = "Имя автора не должно превышать 50 символов."
+AUTHOR_INVALID = "Имя автора должно содержать только буквы и пробелы."
+YEAR_EMPTY = "Год издания не может быть пустым."
+YEAR_NOT_NUMBER = "Год издания должен быть числом."
+YEAR_OUT_OF_RANGE = "Год издания должен быть в пределах от 0 до текущего года."
+# Формы целого числа, которые принимает int() помимо строки из одних цифр: пробелы по краям, знак, "_" между цифрами
+_INTEGER = re.compile(r"\s*[+-]?\d+(?:_\d+)*\s*")
+
+
+def _check_title(title: str) -> str | None:
+    """
+    Проверяет название книги без выбрасывания исключений.
+
+    Аргументы:
+        title (str): Название книги.
+
+    Возвращает:
+        str | None: Сообщение об ошибке или None, если название корректно.
+    """
+    if not title:
+        return TITLE_EMPTY
+    if len(title) > 100:
+        return TITLE_TOO_LONG
+    return None
+
+
+def _check_author(author: str) -> str | None:
+    """
+    Проверяет имя автора без выбрасывания исключений.
+
+    Проверка символов выполняется методами str на уровне C: типичное имя из букв и обычных пробелов проверяется
+    одним вызовом isalpha после удаления пробелов, остальные - после удаления любых пробельных символов (split
+    без аргументов использует то же определение пробела, что и isspace).
+
+    Аргументы:
+        author (str): Имя автора.
+
+    Возвращает:
+        str | None: Сообщение об ошибке или None, если имя корректно.
+    """
+    if not author:
+        return AUTHOR_EMPTY
+    if len(author) > 50:
+        return AUTHOR_TOO_LONG
+    if author.isalpha() or author.replace(" ", "").isalpha():
+        return None
+    letters = "".join(author.split())
+    if letters and not letters.isalpha():
+        return AUTHOR_INVALID
+    return None
+
+
+def _parse_year(year: str) -> int | str:
+    """
+    Разбирает и проверяет год издания без выбрасывания исключений.
+
+    Строка сначала проверяется методом isdecimal (ровно те цифры, которые принимает int), а остальные допустимые
+    для int формы (пробелы по краям, знак, "_" между цифрами) - заранее скомпилированным выражением _INTEGER,
+    поэтому int вызывается только для строк, которые он гарантированно разберёт.
+
+    Аргументы:
+        year (str): Год издания в виде строки.
+
+    Возвращает:
+        int | str: Год издания или сообщение об ошибке.
+    """
+    if not year:
+        return YEAR_EMPTY
+    if isinstance(year, str) and not (year.isdecimal() or _INTEGER.fullmatch(year)):
+        return YEAR_NOT_NUMBER
+    year = int(year)
+    if not 0 < year <= 2024:
+        return YEAR_OUT_OF_RANGE
+    return year
+
+
 def validate_title(title: str) -> str:
     """
     Валидирует название книги.
@@ -41,10 +127,9 @@ def validate_title(title: str) -> str:
     Исключения:
         ValueError: Возникает, если название пустое или превышает 100 символов.
     """
-    if not title:
-        raise ValueError("Название книги не может быть пустым.")
-    if len(title) > 100:
-        raise ValueError("Название книги не должно превышать 100 символов.")
+    error = _check_title(title)
+    if error is not None:
+        raise ValueError(error)
     return title
 
 
@@ -61,12 +146,9 @@ def validate_author(author: str) -> str:
     Исключения:
         ValueError: Возникает, если имя пустое, превышает 50 символов или содержит недопустимые символы.
     """
-    if not author:
-        raise ValueError("Имя автора не может быть пустым.")
-    if len(author) > 50:
-        raise ValueError("Имя автора не должно превышать 50 символов.")
-    if not all(char.isalpha() or char.isspace() for char in author):
-        raise ValueError("Имя автора должно содержать только буквы и пробелы.")
+    error = _check_author(author)
+    if error is not None:
+        raise ValueError(error)
     return author
 
 
@@ -83,17 +165,35 @@ def validate_year(year: str) -> int:
     Исключения:
         ValueError: Возникает, если год пустой, не является числом или выходит за пределы от 1 до текущего года.
     """
-    if not year:
-        raise ValueError("Год издания не может быть пустым.")
+    if year.__class__ is str and year.isdecimal() and 0 < (value := int(year)) <= 2024:
+        return value  # Быстрый путь для обычного года
+    year = _parse_year(year)
+    if isinstance(year, str):
+        raise ValueError(year)
+    return year
 
-    try:
-        year = int(year)
-    except ValueError:
-        raise ValueError("Год издания должен быть числом.")
 
-    if not 0 < year <= 2024:
-        raise ValueError("Год издания должен быть в пределах от 0 до текущего года.")
-    return year
+def validate_year_range(years: str) -> tuple[int, int]:
+    """
+    Валидирует диапазон годов издания в формате "начало-конец".
+
+    Аргументы:
+        years (str): Диапазон годов в виде строки, например "1950-1970".
+
+    Возвращает:
+        tuple[int, int]: Проверенные начало и конец диапазона.
+
+    Исключения:
+        ValueError: Возникает, если строка не в формате "начало-конец", один из годов некорректен или начало
+            диапазона больше конца.
+    """
+    year_from, separator, year_to = years.partition("-")
+    if not separator:
+        raise ValueError("Диапазон должен быть в формате начало-конец.")
+    year_from, year_to = validate_year(year_from.strip()), validate_year(year_to.strip())
+    if year_from > year_to:
+        raise ValueError("Начало диапазона не может быть больше конца.")
+    return year_from, year_to
 
 
 def validate_id(num_id: str) -> int:
@@ -115,3 +215,100 @@ def validate_id(num_id: str) -> int:
         raise ValueError("ID должен быть числом.")
 
     return num_id
+
+
+def validate_rows(titles: Sequence[str], authors: Sequence[str], years: Sequence[str]) -> list[list[str]]:
+    """
+    Проверяет столбцы названий, авторов и годов издания.
+
+    Правила те же, что у validate_title, validate_author и validate_year, но ошибки собираются без выбрасывания
+    и перехвата исключений.
+
+    Аргументы:
+        titles (Sequence[str]): Названия книг.
+        authors (Sequence[str]): Имена авторов.
+        years (Sequence[str]): Годы издания в виде строк.
+
+    Возвращает:
+        list[list[str]]: Для каждой строки - список сообщений об ошибках в порядке полей (пустой для корректной).
+
+    Исключения:
+        ValueError: Если столбцы разной длины.
+    """
+    if not len(titles) == len(authors) == len(years):
+        raise ValueError("Столбцы названий, авторов и годов должны быть одной длины.")
+    rows_errors = []
+    for title, author, year in zip(titles, authors, years):
+        errors = []
+        if (error := _check_title(title)) is not None:
+            errors.append(error)
+        if (error := _check_author(author)) is not None:
+            errors.append(error)
+        if isinstance(year := _parse_year(year), str):
+            errors.append(year)
+        rows_errors.append(errors)
+    return rows_errors
+
+
+def _validate_chunk(columns: tuple[Sequence[str], Sequence[str], Sequence[str]]) -> dict[int, list[str]]:
+    """
+    Проверяет порцию столбцов в процессе пула.
+
+    Аргументы:
+        columns (tuple[Sequence[str], Sequence[str], Sequence[str]]): Названия, авторы и годы порции.
+
+    Возвращает:
+        dict[int, list[str]]: Номер строки в порции -> ошибки, только для некорректных строк (чтобы не передавать
+            между процессами пустые списки корректных).
+    """
+    return {number: errors for number, errors in enumerate(validate_rows(*columns)) if errors}
+
+
+def validate_rows_parallel(
+        titles: Sequence[str],
+        authors: Sequence[str],
+        years: Sequence[str],
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        executor: Executor | None = None,
+) -> list[list[str]]:
+    """
+    Проверяет столбцы, распределяя порции по chunk_size строк между процессами ProcessPoolExecutor.
+
+    Валидаторы - чистые функции, поэтому порции проверяются независимо; результаты собираются в исходном порядке.
+    Если порция одна или workers = 1, проверка выполняется в текущем процессе без запуска пула.
+
+    Аргументы:
+        titles (Sequence[str]): Названия книг.
+        authors (Sequence[str]): Имена авторов.
+        years (Sequence[str]): Годы издания в виде строк.
+        workers (int | None): Количество процессов (по умолчанию - число ядер).
+        chunk_size (int | None): Количество строк в порции (по умолчанию VALIDATION_CHUNK_SIZE).
+        executor (Executor | None): Уже запущенный пул, который следует использовать (например, для нескольких
+            пакетов одного импорта).
+
+    Возвращает:
+        list[list[str]]: Для каждой строки - список сообщений об ошибках (пустой для корректной).
+
+    Исключения:
+        ValueError: Если столбцы разной длины.
+    """
+    if not len(titles) == len(authors) == len(years):
+        raise ValueError("Столбцы названий, авторов и годов должны быть одной длины.")
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or VALIDATION_CHUNK_SIZE
+    if len(titles) <= chunk_size or (workers == 1 and executor is None):
+        return validate_rows(titles, authors, years)
+
+    starts = range(0, len(titles), chunk_size)
+    chunks = (
+        (titles[start:start + chunk_size], authors[start:start + chunk_size], years[start:start + chunk_size])
+        for start in starts
+    )
+    rows_errors: list[list[str]] = [[] for _ in range(len(titles))]
+    # Чужой пул не закрывается: он может понадобиться для следующих пакетов
+    with nullcontext(executor) if executor is not None else ProcessPoolExecutor(max_workers=workers) as pool:
+        for start, errors in zip(starts, pool.map(_validate_chunk, chunks)):
+            for number, row_errors in errors.items():
+                rows_errors[start + number] = row_errors
+    return rows_errors